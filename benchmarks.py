@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Synthetic-data benchmarks for the desktop (budget_app) and API (web_backend) hot paths.
+
+    python benchmarks.py                                   # 1k, 10k and 100k rows, table on stdout
+    python benchmarks.py --sizes 1000000 --json bench_output.txt
+    python benchmarks.py --save-baseline bench_baseline.json
+    python benchmarks.py --baseline bench_baseline.json   # exits 1 when a timing regressed past --threshold
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+import budget_app
+from budget_core import Transaction, to_cents
+from budget_ledger import LedgerRows
+from web_backend import (
+    build_default_category_catalog,
+    create_password_record,
+    ensure_category_exists,
+    sanitize_entry,
+    verify_password,
+)
+
+BENCH_SIZES = (1_000, 10_000, 100_000)
+BENCH_SEED = 20260207
+BENCH_REPEAT = 5
+BENCH_REGRESSION_THRESHOLD = 0.25
+BENCH_CUSTOM_CATEGORIES = 200
+BENCH_PASSWORD = "correct horse battery staple"
+
+# (category, relative frequency, typical amount low/high); skewed the way a household ledger is.
+EXPENSE_PROFILE = [
+    ("Groceries", 22, 8, 180),
+    ("Dining", 18, 4, 90),
+    ("Gas", 9, 20, 80),
+    ("Transportation", 6, 2, 60),
+    ("Shopping", 8, 5, 300),
+    ("Entertainment", 5, 8, 120),
+    ("Cellphone", 2, 30, 90),
+    ("Internet", 2, 40, 90),
+    ("Electric", 2, 40, 220),
+    ("Water", 2, 20, 90),
+    ("Mortgage/Rent", 2, 900, 2600),
+    ("Healthcare", 3, 15, 400),
+    ("Personal Care", 3, 6, 80),
+    ("Travel", 2, 60, 1500),
+    ("Gifts", 2, 10, 200),
+    ("Other", 3, 1, 150),
+]
+INCOME_PROFILE = [
+    ("Salary", 10, 1800, 4200),
+    ("Freelance", 3, 80, 1500),
+    ("Interest", 2, 0.5, 40),
+    ("Refund", 2, 5, 200),
+    ("Gift", 1, 20, 300),
+]
+INCOME_SHARE = 0.08
+NOTE_MERCHANTS = [
+    "Trader Joe's", "Costco", "Shell", "Chevron", "Starbucks", "Chipotle", "Amazon", "Target", "Uber",
+    "Lyft", "Netflix", "Spotify", "CVS", "Walgreens", "Home Depot", "IKEA", "Delta", "Airbnb", "Venmo",
+]
+NOTE_WORDS = ["weekly", "groceries", "coffee", "with", "Sam", "refill", "lunch", "dinner", "kids", "monthly",
+              "bill", "refund", "birthday", "work", "trip", "school", "supplies", "team", "gift", "subscription"]
+SEARCH_TERMS = ["coffee", "co", "costco", "gas station", "weekly groceries", "zzz"]
+
+
+def _note(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.3:
+        return ""
+    if roll < 0.7:
+        return rng.choice(NOTE_MERCHANTS)
+    return " ".join(rng.choice(NOTE_WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def _pick(rng: random.Random, profile: list[tuple]) -> tuple[str, float]:
+    category, _weight, low, high = rng.choices(profile, weights=[row[1] for row in profile])[0]
+    # Log-uniform, so most amounts sit near the low end of the range like real receipts.
+    amount = low * (high / low) ** rng.random()
+    return category, round(amount, 2)
+
+
+def generate_entries(size: int, seed: int = BENCH_SEED) -> list[dict]:
+    """Raw entry dicts as the web client posts them, oldest first over about a year per 5k rows."""
+    rng = random.Random(seed)
+    start = date(2026, 1, 1) - timedelta(days=max(30, size // 14))
+    entries = []
+    for index in range(1, size + 1):
+        income = rng.random() < INCOME_SHARE
+        category, amount = _pick(rng, INCOME_PROFILE if income else EXPENSE_PROFILE)
+        created = start + timedelta(days=index * max(30, size // 14) // size)
+        entries.append(
+            {
+                "id": index,
+                "type": "income" if income else "expense",
+                "category": category,
+                "amount": amount,
+                "note": _note(rng),
+                "createdAt": f"{created.isoformat()}T{rng.randint(7, 22):02d}:{rng.randint(0, 59):02d}:00",
+            }
+        )
+    return entries
+
+
+def generate_ledger(size: int, seed: int = BENCH_SEED) -> dict:
+    data = budget_app.default_data()
+    data["monthly_budget"] = 3200.0
+    data["transactions"] = [
+        Transaction.from_cents(
+            entry["id"], entry["type"], entry["category"], to_cents(entry["amount"]), entry["note"], entry["createdAt"]
+        )
+        for entry in generate_entries(size, seed)
+    ]
+    data["next_id"] = size + 1
+    return data
+
+
+def time_call(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> dict:
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {"best": min(runs), "median": statistics.median(runs), "runs": len(runs)}
+
+
+def _desktop_benchmarks(size: int, seed: int, workdir: Path) -> list[tuple]:
+    data = generate_ledger(size, seed)
+    json_file = workdir / f"bench_{size}.json"
+    ledger_file = workdir / f"bench_{size}.ledger"
+    for path in (json_file, ledger_file):
+        budget_app.use_data_file(path)
+        budget_app.save_data(data)
+
+    loaded = {}
+
+    def load(path: Path) -> Callable[[], object]:
+        def run():
+            budget_app.use_data_file(path)
+            loaded[path] = budget_app.load_data()
+        return run
+
+    def release(path: Path) -> Callable[[], None]:
+        def setup():
+            # Each ledger load maps the file again; unmap the previous run's copy so repeats don't pile up.
+            rows = loaded.pop(path, {}).get("transactions")
+            if isinstance(rows, LedgerRows) and rows.ledger is not None:
+                rows.ledger.close()
+        return setup
+
+    def save():
+        budget_app.use_data_file(json_file)
+        budget_app.save_data(data)
+
+    index = budget_app.TransactionIndex(data["transactions"])
+    probe = Transaction(0, "expense", "Other", 1.0, "", "2026-01-01")
+
+    def invalidate():
+        # Any edit drops the cached query and sort results, as in the window after an add/delete.
+        index.add(probe)
+        index.remove(probe)
+
+    def visible():
+        # Mirrors BudgetAppGUI.visible_transactions while a user types, filters and clears the search box.
+        for term in SEARCH_TERMS:
+            index.search("expense", "all", term, "date", True)
+        index.search("all", "dining", "", "date", True)
+
+    def sort():
+        for column in ("date", "amount", "category", "note"):
+            index.search(sort_column=column, reverse=column in {"date", "amount"})
+
+    return [
+        ("load_data", load(json_file), None),
+        ("load_data[ledger]", load(ledger_file), release(ledger_file)),
+        ("save_data", save, None),
+        ("calculate_summary", lambda: budget_app.calculate_summary(data), None),
+        ("visible_transactions", visible, invalidate),
+        ("sorted_transactions", sort, invalidate),
+    ]
+
+
+def _web_benchmarks(size: int, seed: int) -> list[tuple]:
+    entries = generate_entries(size, seed)
+    rng = random.Random(seed)
+    custom = [f"Custom {index}" for index in range(BENCH_CUSTOM_CATEGORIES)]
+    names = [
+        (entry["type"], entry["category"] if rng.random() < 0.9 else rng.choice(custom).lower())
+        for entry in entries
+    ]
+
+    def ensure_all():
+        catalog = build_default_category_catalog()
+        for entry_type, name in names:
+            ensure_category_exists(catalog, entry_type, name)
+
+    return [
+        ("sanitize_entry", lambda: [sanitize_entry(entry) for entry in entries], None),
+        ("ensure_category_exists", ensure_all, None),
+    ]
+
+
+def run_benchmarks(
+    sizes=BENCH_SIZES, seed: int = BENCH_SEED, repeat: int = BENCH_REPEAT, only: Optional[set[str]] = None, log=None
+) -> dict:
+    results = []
+
+    def record(name: str, size: int, fn, setup=None) -> None:
+        if only and name not in only:
+            return
+        timing = time_call(fn, repeat, setup)
+        results.append({"name": name, "size": size, **timing})
+        if log is not None:
+            log(f"{name:<24} {size:>9,} rows  best {timing['best'] * 1000:10.2f} ms")
+
+    saved_files = (budget_app.DATA_FILE, budget_app.JOURNAL_FILE)
+    try:
+        with tempfile.TemporaryDirectory(prefix="budgetbeacon-bench-") as workdir:
+            for size in sizes:
+                for name, fn, setup in _desktop_benchmarks(size, seed, Path(workdir)):
+                    record(name, size, fn, setup)
+                for name, fn, setup in _web_benchmarks(size, seed):
+                    record(name, size, fn, setup)
+    finally:
+        budget_app.DATA_FILE, budget_app.JOURNAL_FILE = saved_files
+
+    # Cost is set by PBKDF2 rounds, not ledger size, so it runs once.
+    if not only or "verify_password" in only:
+        salt_b64, digest_b64 = create_password_record(BENCH_PASSWORD)
+        record("verify_password", 1, lambda: verify_password(BENCH_PASSWORD, salt_b64, digest_b64))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "sizes": list(sizes),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float = BENCH_REGRESSION_THRESHOLD) -> list[dict]:
+    """Ratio of best times against the baseline per (name, size); rows above 1 + threshold are regressions."""
+    previous = {(row["name"], row["size"]): row for row in baseline.get("results", [])}
+    rows = []
+    for row in report["results"]:
+        before = previous.get((row["name"], row["size"]))
+        if before is None or before["best"] <= 0:
+            continue
+        ratio = row["best"] / before["best"]
+        rows.append(
+            {
+                "name": row["name"],
+                "size": row["size"],
+                "baseline": before["best"],
+                "best": row["best"],
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BudgetBeacon synthetic-data benchmarks")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in BENCH_SIZES),
+        help="comma-separated ledger sizes (1000 to 1000000)",
+    )
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT)
+    parser.add_argument("--only", default="", help="comma-separated benchmark names to run")
+    parser.add_argument("--json", type=Path, default=None, help="write the machine-readable report here")
+    parser.add_argument("--baseline", type=Path, default=None, help="report to compare against")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="also write the report here as a baseline")
+    parser.add_argument("--threshold", type=float, default=BENCH_REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+    only = {name.strip() for name in args.only.split(",") if name.strip()} or None
+    report = run_benchmarks(sizes, args.seed, max(1, args.repeat), only, log=lambda line: print(line, file=sys.stderr))
+
+    for path in (args.json, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.baseline is None:
+        if args.json is None:
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        return 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        print(f"Could not read baseline {args.baseline}: {exc}", file=sys.stderr)
+        return 1
+    comparison = compare_to_baseline(report, baseline, args.threshold)
+    print(json.dumps({"threshold": args.threshold, "comparison": comparison}, indent=2))
+    return 1 if any(row["regressed"] for row in comparison) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,946 +1,1221 @@
-﻿import csv
+﻿import argparse
+import csv
+import hashlib
 import json
-from collections import defaultdict
-from datetime import datetime
-from math import isfinite
+import os
+import queue
+import sys
+import threading
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Sequence
 from pathlib import Path
-import tkinter as tk
-from typing import Optional
-from tkinter import filedialog, messagebox, ttk
+from typing import Callable, Iterable, Iterator, Optional
+
+from budget_core import (
+    EXPENSE_CATEGORIES,
+    INCOME_CATEGORIES,
+    Transaction,
+    from_cents,
+    normalize_category_name,
+    parse_amount,
+    safe_month_key,
+    sanitize_transaction,
+    to_cents,
+    transaction_cents,
+    transaction_json,
+    typical_categories_for,
+)
+from budget_ledger import LEDGER_SUFFIX, LEDGER_TYPES, LedgerError, LedgerRows, open_ledger, write_ledger
 
 DATA_FILE = Path("budget_data.json")
+JOURNAL_FILE = Path("budget_data.journal")
+# Compact once the journal outgrows the snapshot, so replay stays cheap and saves stay amortized O(1).
+JOURNAL_COMPACT_MIN_BYTES = 256 * 1024
+SAVE_COALESCE_MS = 300
+SAVE_POLL_MS = 50
+TABLE_ROW_HEIGHT = 28
+TABLE_DEFAULT_PAGE_ROWS = 30
+CHART_REDRAW_DEBOUNCE_MS = 80
+CSV_IMPORT_CHUNK_ROWS = 5000
+CSV_IMPORT_POLL_MS = 100
+CSV_FIELDS = ["id", "type", "category", "amount", "note", "createdAt"]
+# Snapshots written by this version carry a checksum; a match means the rows were sanitized on the way in.
+SNAPSHOT_SCHEMA_VERSION = 2
+SNAPSHOT_CHECKSUM_PLACEHOLDER = "0" * 32
 
 
 def default_data() -> dict:
-    return {"monthly_budget": 0.0, "transactions": []}
-
-
-EXPENSE_CATEGORIES = [
-    "Groceries",
-    "Mortgage/Rent",
-    "Water",
-    "Gas",
-    "Electric",
-    "Transportation",
-    "Dining",
-    "Entertainment",
-    "Healthcare",
-    "Car Insurance",
-    "Credit Cards",
-    "Loans",
-    "Student Loans",
-    "Childcare",
-    "Education",
-    "Internet",
-    "Cellphone",
-    "Shopping",
-    "Personal Care",
-    "Travel",
-    "Gifts",
-    "Taxes",
-    "Other",
-]
-INCOME_CATEGORIES = [
-    "Salary",
-    "Freelance",
-    "Business",
-    "Interest",
-    "Dividends",
-    "Rental Income",
-    "Refund",
-    "Gift Received",
-    "Other Income",
-]
-DEFAULT_CATEGORIES = sorted(set(EXPENSE_CATEGORIES + INCOME_CATEGORIES))
-LEGACY_EXPENSE_CATEGORY_RENAMES = {
-    "rent": "Mortgage/Rent",
-    "utilities": "Electric",
-    "insurance": "Car Insurance",
-    "debt payment": "Loans",
-    "phone/internet": "Internet",
-}
-CANONICAL_EXPENSE_CATEGORIES = {name.lower(): name for name in EXPENSE_CATEGORIES}
-CANONICAL_INCOME_CATEGORIES = {name.lower(): name for name in INCOME_CATEGORIES}
-
-
-def typical_categories_for(entry_type: str) -> list[str]:
-    if entry_type == "income":
-        return INCOME_CATEGORIES[:]
-    if entry_type == "expense":
-        return EXPENSE_CATEGORIES[:]
-    return DEFAULT_CATEGORIES[:]
-
-
-def normalize_category_name(entry_type: str, raw_category: object) -> str:
-    category = str(raw_category or "").strip()
-    if not category:
-        return ""
-
-    if entry_type == "expense":
-        mapped = LEGACY_EXPENSE_CATEGORY_RENAMES.get(category.lower(), category)
-        return CANONICAL_EXPENSE_CATEGORIES.get(mapped.lower(), mapped)
-    if entry_type == "income":
-        return CANONICAL_INCOME_CATEGORIES.get(category.lower(), category)
-    return category
-
-
-class Colors:
-    BG = "#eef4fb"
-    PANEL = "#ffffff"
-    ACCENT = "#0f3b66"
-    ACCENT_SOFT = "#e5eef9"
-    BEACON = "#f4a300"
-    TEXT = "#13263a"
-    MUTED = "#5a6f86"
-    INCOME = "#1f8f55"
-    EXPENSE = "#c63f30"
-    GRID = "#c8d7e8"
+    return {"monthly_budget": 0.0, "transactions": [], "journal_seq": 0, "next_id": 1}
+
+
+def use_data_file(path) -> None:
+    """Point storage at another snapshot; a .ledger path selects the binary format. The journal sits next to it."""
+    global DATA_FILE, JOURNAL_FILE
+    DATA_FILE = Path(path)
+    # budget_data.json keeps budget_data.journal; other formats append, so x.json and x.ledger never share one.
+    if DATA_FILE.suffix == ".json":
+        JOURNAL_FILE = DATA_FILE.with_suffix(".journal")
+    else:
+        JOURNAL_FILE = DATA_FILE.with_name(DATA_FILE.name + ".journal")
+
+
+def uses_ledger_format() -> bool:
+    return DATA_FILE.suffix == LEDGER_SUFFIX
 
 
 def load_data() -> dict:
+    data = _load_snapshot()
+    replay_journal(data)
+    return data
+
+
+def _load_snapshot() -> dict:
     if not DATA_FILE.exists():
         return default_data()
+    if uses_ledger_format():
+        try:
+            return open_ledger(DATA_FILE)
+        except (LedgerError, OSError):
+            return default_data()
     try:
-        with DATA_FILE.open("r", encoding="utf-8") as file:
+        with DATA_FILE.open("rb") as file:
             data = json.load(file)
-    except (json.JSONDecodeError, OSError):
+            trusted = (
+                isinstance(data, dict)
+                and data.get("schema_version") == SNAPSHOT_SCHEMA_VERSION
+                and _snapshot_checksum_matches(file, data.get("checksum"))
+            )
+    except (json.JSONDecodeError, UnicodeDecodeError, OSError):
         return default_data()
 
     if not isinstance(data, dict):
         return default_data()
 
+    data.pop("checksum", None)
+    data.pop("schema_version", None)
+    if trusted:
+        try:
+            return _trusted_snapshot(data)
+        except (KeyError, TypeError, ValueError):
+            pass  # intact file with rows we cannot read directly; validate it the slow way below
+
     data["monthly_budget"] = _amount_or_zero(data.get("monthly_budget", 0.0))
+    data["journal_seq"] = max(0, _safe_int(data.get("journal_seq"), 0))
+    data["next_id"] = max(1, _safe_int(data.get("next_id"), 1))
     raw_transactions = data.get("transactions")
     if not isinstance(raw_transactions, list):
         data["transactions"] = []
         return data
 
     transactions = []
-    for index, tx in enumerate(raw_transactions, start=1):
-        cleaned = _sanitize_transaction(tx, fallback_id=index)
-        if cleaned is not None:
-            transactions.append(cleaned)
+    seen_ids = set()
+    needs_id = []
+    for tx in raw_transactions:
+        cleaned = _sanitize_transaction(tx, fallback_id=0)
+        if cleaned is None:
+            continue
+        if cleaned["id"] in seen_ids or cleaned["id"] < 1:
+            needs_id.append(cleaned)
+        else:
+            seen_ids.add(cleaned["id"])
+        transactions.append(cleaned)
 
-    for index, tx in enumerate(transactions, start=1):
-        tx["id"] = index
+    # Ids are kept as stored; only rows without a usable one (older files, hand edits) get fresh ids.
+    data["next_id"] = max(data["next_id"], max(seen_ids, default=0) + 1)
+    for tx in needs_id:
+        assign_transaction_id(data, tx)
 
     data["transactions"] = transactions
     return data
 
 
-def save_data(data: dict) -> None:
-    with DATA_FILE.open("w", encoding="utf-8") as file:
-        json.dump(data, file, indent=2)
-
-
-def parse_amount(value: object) -> float:
-    amount = float(value)
-    if not isfinite(amount) or amount < 0:
-        raise ValueError("Amount must be a finite non-negative number.")
-    return amount
-
-
-def calculate_summary(data: dict) -> dict:
-    income = 0.0
-    expense = 0.0
-    for tx in data.get("transactions", []):
-        tx_type = str(tx.get("type", "")).strip().lower()
-        amount = _amount_or_zero(tx.get("amount"))
-        if tx_type == "income":
-            income += amount
-        elif tx_type == "expense":
-            expense += amount
-
-    budget = _amount_or_zero(data.get("monthly_budget", 0.0))
-    return {
-        "income": income,
-        "expense": expense,
-        "balance": income - expense,
-        "budget": budget,
-        "remaining": budget - expense,
-    }
+def _trusted_snapshot(data: dict) -> dict:
+    transactions = [
+        Transaction(tx["id"], tx["type"], tx["category"], tx["amount"], tx["note"], tx["createdAt"], tx.get("meta"))
+        for tx in data["transactions"]
+    ]
+    data["monthly_budget"] = float(data["monthly_budget"])
+    data["journal_seq"] = int(data["journal_seq"])
+    data["next_id"] = int(data["next_id"])
+    data["transactions"] = transactions
+    return data
 
 
-def safe_month_key(created_at: object) -> str:
-    if not created_at:
-        return "unknown"
-    text = str(created_at)
-    try:
-        return datetime.fromisoformat(text).strftime("%Y-%m")
-    except (ValueError, TypeError):
-        return text[:7] if len(text) >= 7 else "unknown"
+def _snapshot_digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
 
-def _amount_or_zero(value: object) -> float:
-    try:
-        return parse_amount(value)
-    except (TypeError, ValueError):
-        return 0.0
+def _snapshot_checksum_matches(file, checksum: object) -> bool:
+    if not isinstance(checksum, str) or len(checksum) != len(SNAPSHOT_CHECKSUM_PLACEHOLDER):
+        return False
+    if checksum.strip("0123456789abcdef"):
+        return False
+    file.seek(0)
+    # The checksum is the document's first field, so the first occurrence is the one save_data filled in.
+    raw = file.read().replace(checksum.encode("ascii"), SNAPSHOT_CHECKSUM_PLACEHOLDER.encode("ascii"), 1)
+    return _snapshot_digest(raw) == checksum
 
 
-def _safe_int(value: object, default: int = 0) -> int:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
+def snapshot_bytes(data: dict) -> bytes:
+    document = {"checksum": SNAPSHOT_CHECKSUM_PLACEHOLDER, "schema_version": SNAPSHOT_SCHEMA_VERSION}
+    document.update((key, value) for key, value in data.items() if key not in document)
+    if isinstance(document.get("transactions"), LedgerRows):
+        document["transactions"] = list(document["transactions"])
+    # Compact separators: json's C encoder skips indented output, which made large saves about four times slower.
+    raw = json.dumps(document, separators=(",", ":"), default=transaction_json).encode("utf-8")
+    placeholder = SNAPSHOT_CHECKSUM_PLACEHOLDER.encode("ascii")
+    return raw.replace(placeholder, _snapshot_digest(raw).encode("ascii"), 1)
 
 
-def _sanitize_transaction(tx: object, fallback_id: int) -> Optional[dict]:
-    if not isinstance(tx, dict):
-        return None
+def assign_transaction_id(data: dict, tx: dict) -> int:
+    tx["id"] = data.get("next_id", 1)
+    data["next_id"] = tx["id"] + 1
+    return tx["id"]
 
-    tx_type = str(tx.get("type", "")).strip().lower()
-    if tx_type not in {"income", "expense"}:
-        return None
 
-    category = normalize_category_name(tx_type, tx.get("category", ""))
-    if not category:
-        return None
+def transaction_positions(transactions: list[dict]) -> dict[int, int]:
+    if isinstance(transactions, LedgerRows):
+        return {tx_id: position for position, tx_id in enumerate(transactions.ids())}
+    return {tx["id"]: position for position, tx in enumerate(transactions)}
 
-    amount = _amount_or_zero(tx.get("amount"))
-    note = str(tx.get("note", "")).strip()
 
-    # Support both createdAt (web) and created_at (legacy) for backwards compatibility
-    created_raw = tx.get("createdAt") or tx.get("created_at")
-    created_at = str(created_raw).strip() if created_raw is not None else ""
-    if not created_at:
-        created_at = datetime.now().isoformat(timespec="seconds")
+def append_transaction(data: dict, positions: dict[int, int], tx: dict) -> None:
+    if tx.get("id", 0) < 1 or tx["id"] in positions:
+        assign_transaction_id(data, tx)
+    else:
+        data["next_id"] = max(data.get("next_id", 1), tx["id"] + 1)
+    positions[tx["id"]] = len(data["transactions"])
+    data["transactions"].append(tx)
 
-    tx_id = _safe_int(tx.get("id"), fallback_id)
-    if tx_id < 1:
-        tx_id = fallback_id
 
-    return {
-        "id": tx_id,
-        "type": tx_type,
-        "category": category,
-        "amount": amount,
-        "note": note,
-        "createdAt": created_at,
-    }
+def remove_transactions(data: dict, positions: dict[int, int], ids: Iterable[int]) -> list[dict]:
+    """Swap-remove by id in O(1) each; list order is not meaningful, ids carry insertion order."""
+    transactions = data["transactions"]
+    removed = []
+    for tx_id in ids:
+        position = positions.pop(tx_id, None)
+        if position is None:
+            continue
+        tx = transactions[position]
+        last = transactions.pop()
+        if last is not tx:
+            transactions[position] = last
+            positions[last["id"]] = position
+        removed.append(tx)
+    return removed
 
 
-def format_currency(amount: float) -> str:
-    return f"${amount:,.2f}"
+def save_data(data: dict) -> None:
+    if uses_ledger_format():
+        if isinstance(data["transactions"], LedgerRows):
+            data["transactions"] = data["transactions"].materialize()
+        write_ledger(DATA_FILE, data)
+        return
+    # Write-then-rename so a crash leaves either the old snapshot or the new one, never a truncated file.
+    temp_path = DATA_FILE.with_name(DATA_FILE.name + ".tmp")
+    payload = snapshot_bytes(data)
+    with temp_path.open("wb") as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, DATA_FILE)
+
+
+def apply_journal_record(data: dict, record: dict, positions: Optional[dict[int, int]] = None) -> bool:
+    op = record.get("op")
+    if positions is None:
+        positions = transaction_positions(data["transactions"])
+    if op == "add":
+        tx = _sanitize_transaction(record.get("tx"), fallback_id=0)
+        if tx is None:
+            return False
+        append_transaction(data, positions, tx)
+    elif op == "import":
+        for raw in record.get("transactions") or []:
+            tx = _sanitize_transaction(raw, fallback_id=0)
+            if tx is not None:
+                append_transaction(data, positions, tx)
+    elif op == "delete":
+        remove_transactions(data, positions, {_safe_int(tx_id, 0) for tx_id in record.get("ids") or []})
+    elif op == "budget":
+        data["monthly_budget"] = _amount_or_zero(record.get("value"))
+    else:
+        return False
+    return True
+
+
+def replay_journal(data: dict) -> int:
+    """Apply journal records newer than the snapshot; a torn trailing line from a crash is cut off."""
+    try:
+        with JOURNAL_FILE.open("rb") as file:
+            raw = file.read()
+    except OSError:
+        return 0
+
+    applied = 0
+    good_bytes = 0
+    positions = transaction_positions(data["transactions"])
+    for line in raw.splitlines(keepends=True):
+        try:
+            record = json.loads(line) if line.endswith(b"\n") else None
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            record = None
+        if not isinstance(record, dict):
+            break
+        good_bytes += len(line)
+        seq = _safe_int(record.get("seq"), 0)
+        if seq <= data["journal_seq"]:
+            continue
+        apply_journal_record(data, record, positions)
+        data["journal_seq"] = seq
+        applied += 1
 
+    if good_bytes < len(raw):
+        with JOURNAL_FILE.open("r+b") as file:
+            file.truncate(good_bytes)
+    return applied
 
-class BudgetAppGUI:
-    def __init__(self, root: tk.Tk) -> None:
-        self.root = root
-        self.root.title("BudgetBeacon")
-        self.root.geometry("1180x760")
-        self.root.minsize(1024, 680)
-        self.root.configure(bg=Colors.BG)
-
-        self.data = load_data()
-        self.sort_column = "date"
-        self.sort_reverse = True
-        self._filter_after_id = None
-
-        self.status_var = tk.StringVar(value="Ready")
-        self.type_var = tk.StringVar(value="expense")
-        self.category_var = tk.StringVar()
-        self.amount_var = tk.StringVar()
-        self.note_var = tk.StringVar()
-        self.budget_var = tk.StringVar(value=f"{self.data.get('monthly_budget', 0.0):.2f}")
-
-        self.search_var = tk.StringVar()
-        self.filter_type_var = tk.StringVar(value="all")
-        self.filter_category_var = tk.StringVar(value="all")
-
-        self.income_var = tk.StringVar(value="$0.00")
-        self.expense_var = tk.StringVar(value="$0.00")
-        self.balance_var = tk.StringVar(value="$0.00")
-        self.budget_total_var = tk.StringVar(value="$0.00")
-        self.remaining_var = tk.StringVar(value="$0.00")
-
-        self._build_style()
-        self._build_ui()
-        self._bind_live_filters()
-        self.refresh_ui("Loaded budget data.")
-        self._show_welcome_if_needed()
-
-    def _build_style(self) -> None:
-        style = ttk.Style()
-        try:
-            style.theme_use("clam")
-        except tk.TclError:
-            pass
-
-        style.configure("TFrame", background=Colors.BG)
-        style.configure("TLabelframe", background=Colors.BG)
-        style.configure("TLabelframe.Label", background=Colors.BG, foreground=Colors.TEXT, font=("Segoe UI", 10, "bold"))
-        style.configure("TLabel", background=Colors.BG, foreground=Colors.TEXT, font=("Segoe UI", 10))
-        style.configure("Title.TLabel", background=Colors.BG, foreground=Colors.TEXT, font=("Segoe UI", 26, "bold"))
-        style.configure("Hint.TLabel", background=Colors.BG, foreground=Colors.MUTED, font=("Segoe UI", 9))
-        style.configure("Accent.TButton", font=("Segoe UI", 10, "bold"))
-        style.map("Accent.TButton", background=[("!disabled", Colors.ACCENT)])
-
-        style.configure(
-            "Treeview",
-            background=Colors.PANEL,
-            fieldbackground=Colors.PANEL,
-            foreground=Colors.TEXT,
-            rowheight=28,
-            borderwidth=0,
-            font=("Segoe UI", 10),
-        )
-        style.configure("Treeview.Heading", font=("Segoe UI", 10, "bold"), foreground=Colors.TEXT)
-
-    def _build_ui(self) -> None:
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(1, weight=1)
-
-        header = tk.Frame(self.root, bg=Colors.ACCENT, padx=18, pady=12)
-        header.grid(row=0, column=0, sticky="ew")
-        brand_wrap = tk.Frame(header, bg=Colors.ACCENT)
-        brand_wrap.pack(side="left")
-        tk.Label(
-            brand_wrap,
-            text="BudgetBeacon",
-            bg=Colors.ACCENT,
-            fg="white",
-            font=("Segoe UI", 24, "bold"),
-        ).pack(anchor="w")
-        tk.Label(
-            brand_wrap,
-            text="Guiding your budget with clarity",
-            bg=Colors.ACCENT,
-            fg=Colors.BEACON,
-            font=("Segoe UI", 10, "bold"),
-        ).pack(anchor="w")
-        tk.Button(
-            header,
-            text="How To Use",
-            command=self.show_help,
-            bg=Colors.BEACON,
-            fg=Colors.TEXT,
-            activebackground="#e69800",
-            activeforeground=Colors.TEXT,
-            font=("Segoe UI", 10, "bold"),
-            relief="flat",
-            padx=12,
-            pady=8,
-            cursor="hand2",
-        ).pack(side="right", pady=6)
-
-        content = ttk.Frame(self.root, padding=(18, 8, 18, 12))
-        content.grid(row=1, column=0, sticky="nsew")
-        content.columnconfigure(0, weight=0)
-        content.columnconfigure(1, weight=1)
-        content.rowconfigure(0, weight=0)
-        content.rowconfigure(1, weight=1)
-
-        left = ttk.Frame(content, style="TFrame")
-        left.grid(row=0, column=0, rowspan=2, sticky="nsw", padx=(0, 14))
-
-        self._build_entry_panel(left)
-        self._build_actions_panel(left)
-
-        self._build_stats_row(content)
-        self._build_table_panel(content)
-        self._build_charts_panel(content)
-
-        footer = ttk.Frame(self.root, padding=(18, 0, 18, 12))
-        footer.grid(row=2, column=0, sticky="ew")
-        footer.columnconfigure(0, weight=1)
-        ttk.Label(footer, textvariable=self.status_var, foreground=Colors.MUTED).grid(row=0, column=0, sticky="w")
-
-    def _build_entry_panel(self, parent: ttk.Frame) -> None:
-        form = ttk.LabelFrame(parent, text="Add New Entry", padding=12)
-        form.grid(row=0, column=0, sticky="new")
-
-        ttk.Label(form, text="Money Type").grid(row=0, column=0, sticky="w", pady=(0, 4))
-        ttk.Combobox(form, textvariable=self.type_var, values=["income", "expense"], state="readonly", width=24).grid(
-            row=1, column=0, sticky="ew", pady=(0, 8)
-        )
 
-        ttk.Label(form, text="Category").grid(row=2, column=0, sticky="w", pady=(0, 4))
-        self.category_entry = ttk.Combobox(
-            form,
-            textvariable=self.category_var,
-            values=typical_categories_for("expense"),
-            state="readonly",
-            width=24,
-        )
-        self.category_entry.grid(row=3, column=0, sticky="ew", pady=(0, 8))
-        if self.category_entry["values"]:
-            self.category_var.set(self.category_entry["values"][0])
+def journal_line(data: dict, record: dict) -> str:
+    seq = data.get("journal_seq", 0) + 1
+    data["journal_seq"] = seq
+    return json.dumps({**record, "seq": seq}, separators=(",", ":"), default=transaction_json) + "\n"
 
-        ttk.Label(form, text="Amount (example: 24.99)").grid(row=4, column=0, sticky="w", pady=(0, 4))
-        amount_entry = ttk.Entry(form, textvariable=self.amount_var, width=24)
-        amount_entry.grid(row=5, column=0, sticky="ew", pady=(0, 8))
 
-        ttk.Label(form, text="Note (optional)").grid(row=6, column=0, sticky="w", pady=(0, 4))
-        note_entry = ttk.Entry(form, textvariable=self.note_var, width=24)
-        note_entry.grid(row=7, column=0, sticky="ew", pady=(0, 10))
+def write_journal_lines(lines: list[str]) -> None:
+    with JOURNAL_FILE.open("a", encoding="utf-8") as file:
+        file.writelines(lines)
+        file.flush()
+        os.fsync(file.fileno())
 
-        amount_entry.bind("<Return>", lambda _e: self.add_transaction())
-        note_entry.bind("<Return>", lambda _e: self.add_transaction())
 
-        ttk.Button(form, text="Save Entry", command=self.add_transaction, style="Accent.TButton").grid(
-            row=8, column=0, sticky="ew"
-        )
-        ttk.Button(form, text="Clear Form", command=self.clear_form).grid(row=9, column=0, sticky="ew", pady=(6, 0))
-
-        ttk.Separator(form).grid(row=10, column=0, sticky="ew", pady=10)
-
-        ttk.Label(form, text="Monthly Budget Goal").grid(row=11, column=0, sticky="w", pady=(0, 4))
-        ttk.Entry(form, textvariable=self.budget_var, width=24).grid(row=12, column=0, sticky="ew", pady=(0, 8))
-        ttk.Button(form, text="Save Budget Goal", command=self.set_budget).grid(row=13, column=0, sticky="ew")
-        ttk.Label(form, text="Tip: Set this once per month.", style="Hint.TLabel").grid(row=14, column=0, sticky="w", pady=(6, 0))
-
-    def _build_actions_panel(self, parent: ttk.Frame) -> None:
-        panel = ttk.LabelFrame(parent, text="File & Safety", padding=12)
-        panel.grid(row=1, column=0, sticky="new", pady=(10, 0))
-
-        ttk.Button(panel, text="Delete Selected Entry", command=self.delete_selected).grid(row=0, column=0, sticky="ew")
-        ttk.Button(panel, text="Export to CSV", command=self.export_csv).grid(row=1, column=0, sticky="ew", pady=(8, 0))
-        ttk.Button(panel, text="Import from CSV", command=self.import_csv).grid(row=2, column=0, sticky="ew", pady=(8, 0))
-
-    def _build_stats_row(self, parent: ttk.Frame) -> None:
-        stats = ttk.Frame(parent)
-        stats.grid(row=0, column=1, sticky="ew", pady=(0, 10))
-        for idx in range(5):
-            stats.columnconfigure(idx, weight=1)
-
-        self._build_stat_card(stats, 0, "Income", self.income_var)
-        self._build_stat_card(stats, 1, "Expenses", self.expense_var)
-        self._build_stat_card(stats, 2, "Balance", self.balance_var)
-        self._build_stat_card(stats, 3, "Budget Goal", self.budget_total_var)
-        self._build_stat_card(stats, 4, "Budget Left", self.remaining_var)
-
-    def _build_stat_card(self, parent: ttk.Frame, col: int, label: str, value_var: tk.StringVar) -> None:
-        value_color = Colors.TEXT
-        card_bg = Colors.PANEL
-        border_color = Colors.GRID
-        if label == "Income":
-            value_color = Colors.INCOME
-            card_bg = "#edf8f2"
-            border_color = "#b9e2c8"
-        elif label == "Expenses":
-            value_color = Colors.EXPENSE
-            card_bg = "#fff0ee"
-            border_color = "#f0c5bf"
-        elif label == "Budget Left":
-            value_color = Colors.BEACON
-            card_bg = "#fff8ea"
-            border_color = "#f0dcac"
-        elif label == "Budget Goal":
-            card_bg = "#eef4ff"
-            border_color = "#c9d7f0"
-        elif label == "Balance":
-            card_bg = "#f1f5fa"
-
-        card = tk.Frame(parent, bg=card_bg, bd=0, highlightthickness=1, highlightbackground=border_color)
-        card.grid(row=0, column=col, sticky="nsew", padx=(0 if col == 0 else 8, 0), pady=0)
-        tk.Label(card, text=label, bg=card_bg, fg=Colors.MUTED, font=("Segoe UI", 9, "bold")).pack(
-            anchor="w", padx=10, pady=(8, 2)
-        )
-        tk.Label(card, textvariable=value_var, bg=card_bg, fg=value_color, font=("Segoe UI", 16, "bold")).pack(
-            anchor="w", padx=10, pady=(0, 8)
-        )
+def append_journal(data: dict, record: dict) -> None:
+    write_journal_lines([journal_line(data, record)])
 
-    def _build_table_panel(self, parent: ttk.Frame) -> None:
-        table_wrap = ttk.LabelFrame(parent, text="Entries", padding=10)
-        table_wrap.grid(row=1, column=1, sticky="nsew")
-        table_wrap.columnconfigure(0, weight=1)
-        table_wrap.rowconfigure(1, weight=1)
-
-        filters = ttk.Frame(table_wrap)
-        filters.grid(row=0, column=0, sticky="ew", pady=(0, 8))
-
-        ttk.Label(filters, text="Type").grid(row=0, column=0, sticky="w")
-        self.type_filter_combo = ttk.Combobox(
-            filters,
-            textvariable=self.filter_type_var,
-            values=["all", "income", "expense"],
-            state="readonly",
-            width=10,
-        )
-        self.type_filter_combo.grid(row=0, column=1, padx=(6, 10), sticky="w")
-
-        ttk.Label(filters, text="Category").grid(row=0, column=2, sticky="w")
-        self.category_filter_combo = ttk.Combobox(
-            filters,
-            textvariable=self.filter_category_var,
-            values=["all"],
-            state="readonly",
-            width=18,
-        )
-        self.category_filter_combo.grid(row=0, column=3, padx=(6, 10), sticky="w")
-
-        ttk.Label(filters, text="Search notes/categories").grid(row=0, column=4, sticky="w")
-        ttk.Entry(filters, textvariable=self.search_var, width=28).grid(row=0, column=5, padx=(6, 10), sticky="w")
-
-        ttk.Button(filters, text="Reset Filters", command=self.reset_filters).grid(row=0, column=6, padx=(6, 0), sticky="w")
-
-        columns = ("id", "date", "type", "category", "amount", "note")
-        self.tree = ttk.Treeview(table_wrap, columns=columns, show="headings", selectmode="extended")
-        self.tree.grid(row=1, column=0, sticky="nsew")
-        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
-        self.tree.bind("<Delete>", lambda _e: self.delete_selected())
-
-        headings = {
-            "id": "ID",
-            "date": "Date",
-            "type": "Type",
-            "category": "Category",
-            "amount": "Amount",
-            "note": "Note",
-        }
-        for col, label in headings.items():
-            self.tree.heading(col, text=label, command=lambda c=col: self.sort_by(c))
-
-        self.tree.column("id", width=55, anchor="center")
-        self.tree.column("date", width=150, anchor="w")
-        self.tree.column("type", width=85, anchor="center")
-        self.tree.column("category", width=150, anchor="w")
-        self.tree.column("amount", width=120, anchor="e")
-        self.tree.column("note", width=240, anchor="w")
-
-        scrollbar = ttk.Scrollbar(table_wrap, orient="vertical", command=self.tree.yview)
-        scrollbar.grid(row=1, column=1, sticky="ns")
-        self.tree.configure(yscrollcommand=scrollbar.set)
-
-        self.empty_state_label = ttk.Label(
-            table_wrap,
-            text="No entries yet. Start by adding your first income or expense on the left.",
-            style="Hint.TLabel",
-        )
 
-    def _build_charts_panel(self, parent: ttk.Frame) -> None:
-        charts = ttk.LabelFrame(parent, text="Insights", padding=10)
-        charts.grid(row=2, column=1, sticky="ew", pady=(10, 0))
-        charts.columnconfigure(0, weight=1)
-        charts.columnconfigure(1, weight=1)
+def journal_needs_compaction() -> bool:
+    try:
+        journal_size = JOURNAL_FILE.stat().st_size
+    except OSError:
+        return False
+    try:
+        snapshot_size = DATA_FILE.stat().st_size
+    except OSError:
+        snapshot_size = 0
+    return journal_size > max(JOURNAL_COMPACT_MIN_BYTES, snapshot_size)
 
-        self.month_canvas = tk.Canvas(charts, bg=Colors.PANEL, height=190, highlightthickness=1, highlightbackground=Colors.GRID)
-        self.month_canvas.grid(row=0, column=0, sticky="ew", padx=(0, 8))
 
-        self.category_canvas = tk.Canvas(charts, bg=Colors.PANEL, height=190, highlightthickness=1, highlightbackground=Colors.GRID)
-        self.category_canvas.grid(row=0, column=1, sticky="ew", padx=(8, 0))
+def compact_journal(data: dict) -> None:
+    # The snapshot carries journal_seq, so a crash between the rename and the truncate only leaves
+    # records that replay will skip.
+    save_data(data)
+    with JOURNAL_FILE.open("w", encoding="utf-8"):
+        pass
 
-        self.month_canvas.bind("<Configure>", lambda _e: self.draw_month_chart())
-        self.category_canvas.bind("<Configure>", lambda _e: self.draw_category_chart())
 
-    def _bind_live_filters(self) -> None:
-        self.search_var.trace_add("write", self._schedule_filter_refresh)
-        self.filter_type_var.trace_add("write", self._schedule_filter_refresh)
-        self.filter_category_var.trace_add("write", self._schedule_filter_refresh)
-        self.type_var.trace_add("write", self._on_entry_type_changed)
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
 
-    def _on_entry_type_changed(self, *_args) -> None:
-        self._refresh_category_options()
 
-    def _schedule_filter_refresh(self, *_args) -> None:
-        if self._filter_after_id is not None:
-            self.root.after_cancel(self._filter_after_id)
-        self._filter_after_id = self.root.after(200, lambda: self.refresh_ui("Filters updated."))
+def record_change(data: dict, record: dict) -> None:
+    append_journal(data, record)
+    if journal_needs_compaction():
+        compact_journal(data)
 
-    def _on_tree_select(self, _event=None) -> None:
-        count = len(self.tree.selection())
-        if count == 0:
-            return
-        entry_word = "entry" if count == 1 else "entries"
-        self.status_var.set(f"{count} {entry_word} selected.")
 
-    def _show_welcome_if_needed(self) -> None:
-        if self.data.get("transactions"):
-            return
-        messagebox.showinfo(
-            "Welcome to BudgetBeacon",
-            "Start with 2 steps:\n\n1) Set your monthly budget goal\n2) Add each expense or income as it happens\n\nUse 'How To Use' any time for a quick guide.",
-        )
+def calculate_summary(data: dict) -> dict:
+    # Summed in integer cents, so the totals are exact however many entries there are.
+    transactions = data.get("transactions", [])
+    if isinstance(transactions, LedgerRows):
+        totals = transactions.type_cents()
+        return summary_from_cents(totals["income"], totals["expense"], data)
+    totals = {"income": 0, "expense": 0}
+    for tx in transactions:
+        tx_type = str(tx.get("type", "")).strip().lower()
+        if tx_type in totals:
+            totals[tx_type] += transaction_cents(tx)
+    return summary_from_cents(totals["income"], totals["expense"], data)
 
-    def show_help(self) -> None:
-        messagebox.showinfo(
-            "How To Use (Simple Steps)",
-            "Take your time. Follow these steps:\n\n"
-            "1) Set your monthly budget first.\n"
-            "   On the left side, type your budget in 'Monthly Budget Goal'\n"
-            "   then click 'Save Budget Goal'.\n\n"
-            "2) Add money you receive (income).\n"
-            "   Choose 'income', pick a category, type the amount,\n"
-            "   then click 'Save Entry'.\n\n"
-            "3) Add money you spend (expense).\n"
-            "   Choose 'expense', pick a category, type the amount,\n"
-            "   then click 'Save Entry'.\n\n"
-            "4) Check your totals at the top.\n"
-            "   - Income: money in\n"
-            "   - Expenses: money out\n"
-            "   - Budget Left: what you still have this month\n\n"
-            "5) To remove a mistake:\n"
-            "   Click the entry once in the table, then click\n"
-            "   'Delete Selected Entry'.\n\n"
-            "6) To find old entries:\n"
-            "   Use the search box or the filter boxes above the table.\n\n"
-            "7) To save a backup copy:\n"
-            "   Click 'Export to CSV'.\n\n"
-            "If something looks wrong, do not worry.\n"
-            "You can always add, edit by deleting/re-adding, or import/export again.",
-        )
 
-    def visible_transactions(self) -> list[dict]:
-        term = self.search_var.get().strip().lower()
-        type_filter = self.filter_type_var.get().strip().lower()
-        category_filter = self.filter_category_var.get().strip().lower()
+def summary_from_cents(income: int, expense: int, data: dict) -> dict:
+    budget = to_cents(_amount_or_zero(data.get("monthly_budget", 0.0)))
+    return {
+        "income": from_cents(income),
+        "expense": from_cents(expense),
+        "balance": from_cents(income - expense),
+        "budget": from_cents(budget),
+        "remaining": from_cents(budget - expense),
+    }
 
-        rows = []
-        for tx in self.data.get("transactions", []):
-            if type_filter != "all" and tx.get("type", "") != type_filter:
-                continue
-            if category_filter != "all" and tx.get("category", "").lower() != category_filter:
-                continue
 
-            haystack = f"{tx.get('category', '')} {tx.get('note', '')}".lower()
-            if term and term not in haystack:
-                continue
-            rows.append(tx)
+def _amount_or_zero(value: object) -> float:
+    try:
+        return parse_amount(value)
+    except (TypeError, ValueError):
+        return 0.0
 
-        return self.sorted_transactions(rows)
 
-    def sorted_transactions(self, rows: list[dict]) -> list[dict]:
-        key = self.sort_column
+def _safe_int(value: object, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
 
-        def key_fn(tx: dict):
-            if key == "id":
-                return _safe_int(tx.get("id"), 0)
-            if key == "amount":
-                return _amount_or_zero(tx.get("amount"))
-            lookup = "createdAt" if key == "date" else key
-            return str(tx.get(lookup, "")).lower()
 
-        return sorted(rows, key=key_fn, reverse=self.sort_reverse)
+def _sanitize_transaction(tx: object, fallback_id: int) -> Optional[Transaction]:
+    if not isinstance(tx, (dict, Transaction)):
+        return None
+    tx_id = _safe_int(tx.get("id"), fallback_id)
+    return sanitize_transaction(tx, tx_id if tx_id >= 1 else fallback_id)
 
-    def sort_by(self, column: str) -> None:
-        if self.sort_column == column:
-            self.sort_reverse = not self.sort_reverse
-        else:
-            self.sort_column = column
-            self.sort_reverse = column in {"id", "amount", "date"}
-        self.refresh_ui(f"Sorted by {column}.")
-
-    def refresh_ui(self, status_text: str = "Ready") -> None:
-        self._refresh_category_options()
-
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        visible = self.visible_transactions()
-        for tx in visible:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    tx.get("id", ""),
-                    tx.get("createdAt", ""),
-                    tx.get("type", ""),
-                    tx.get("category", ""),
-                    format_currency(_amount_or_zero(tx.get("amount"))),
-                    tx.get("note", ""),
-                ),
-            )
 
-        if visible:
-            self.empty_state_label.grid_forget()
-        else:
-            if self.data.get("transactions"):
-                self.empty_state_label.configure(text="No results match your current filters.")
-            else:
-                self.empty_state_label.configure(text="No entries yet. Start by adding your first income or expense on the left.")
-            self.empty_state_label.grid(row=2, column=0, sticky="w", pady=(8, 0))
-
-        summary = calculate_summary(self.data)
-        self.income_var.set(format_currency(summary["income"]))
-        self.expense_var.set(format_currency(summary["expense"]))
-        self.balance_var.set(format_currency(summary["balance"]))
-        self.budget_total_var.set(format_currency(summary["budget"]))
-        self.remaining_var.set(format_currency(summary["remaining"]))
-        self.budget_var.set(f"{summary['budget']:.2f}")
-
-        self.status_var.set(status_text)
-        self.draw_month_chart()
-        self.draw_category_chart()
-
-    def _refresh_category_options(self) -> None:
-        categories = sorted({tx.get("category", "").strip() for tx in self.data.get("transactions", []) if tx.get("category")})
-
-        selected_type = self.type_var.get().strip().lower()
-        typed_categories = sorted({tx.get("category", "").strip() for tx in self.data.get("transactions", []) if tx.get("type") == selected_type and tx.get("category")})
-        category_choices = sorted(set(typical_categories_for(selected_type) + typed_categories + categories))
-        self.category_entry["values"] = category_choices
-        if category_choices and self.category_var.get() not in category_choices:
-            self.category_var.set(category_choices[0])
-
-        filter_values = ["all", *categories]
-        self.category_filter_combo["values"] = filter_values
-        if self.filter_category_var.get() not in filter_values:
-            self.filter_category_var.set("all")
-
-    def add_transaction(self) -> None:
-        kind = self.type_var.get().strip().lower()
-        category = normalize_category_name(kind, self.category_var.get())
-        amount_raw = self.amount_var.get().strip().replace("$", "")
-        note = self.note_var.get().strip()
-
-        if kind not in {"income", "expense"}:
-            messagebox.showerror("Invalid Type", "Choose either income or expense.")
-            return
+def format_currency(amount: float) -> str:
+    return f"${amount:,.2f}"
 
-        if not category:
-            messagebox.showerror("Missing Category", "Please choose or type a category.")
-            return
 
-        try:
-            amount = parse_amount(amount_raw)
-        except ValueError:
-            messagebox.showerror("Invalid Amount", "Please enter a valid amount, like 24.99")
-            return
+def parse_csv_row(row: dict) -> Optional[Transaction]:
+    # Our own export writes createdAt; older files used created_at. Bank exports often prefix amounts with "$".
+    amount = str(row.get("amount") or "").strip().replace("$", "")
+    return sanitize_transaction({**row, "amount": amount}, 0)
 
-        tx = {
-            "id": len(self.data["transactions"]) + 1,
-            "type": kind,
-            "category": category,
-            "amount": amount,
-            "note": note,
-            "createdAt": datetime.now().isoformat(timespec="seconds"),
-        }
-        self.data["transactions"].append(tx)
-        save_data(self.data)
-
-        self.clear_form()
-        self.refresh_ui("Entry saved.")
-
-    def clear_form(self) -> None:
-        categories = typical_categories_for(self.type_var.get().strip().lower())
-        self.category_var.set(categories[0] if categories else "")
-        self.amount_var.set("")
-        self.note_var.set("")
-        self.status_var.set("Form cleared.")
-
-    def delete_selected(self) -> None:
-        selected = self.tree.selection()
-        if not selected:
-            focused = self.tree.focus()
-            if focused:
-                selected = (focused,)
-        if not selected:
-            messagebox.showwarning("No Selection", "Select an entry first, then click Delete.")
-            return
 
-        ids_to_delete = set()
-        for row_id in selected:
-            row_values = self.tree.item(row_id, "values")
-            if row_values:
-                tx_id = _safe_int(row_values[0], 0)
-                if tx_id > 0:
-                    ids_to_delete.add(tx_id)
+def export_transactions_csv(path, transactions: list[dict]) -> int:
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for tx in sorted(transactions, key=lambda item: item["id"]):
+            writer.writerow(tx)
+    return len(transactions)
 
-        if not ids_to_delete:
-            messagebox.showwarning("No Selection", "Select a valid entry to delete.")
-            return
 
-        entry_word = "entry" if len(ids_to_delete) == 1 else "entries"
-        if not messagebox.askyesno(
-            "Confirm Delete",
-            f"Delete {len(ids_to_delete)} {entry_word}? This cannot be undone.",
-        ):
-            return
+def transaction_content_key(tx: dict) -> bytes:
+    text = "\x1f".join(
+        (
+            str(tx.get("createdAt", "")),
+            str(tx.get("type", "")),
+            str(tx.get("category", "")),
+            str(transaction_cents(tx)),
+            str(tx.get("note", "")),
+        )
+    )
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
 
-        self.data["transactions"] = [
-            tx for tx in self.data["transactions"] if _safe_int(tx.get("id"), 0) not in ids_to_delete
-        ]
-        self._reindex_transactions()
-        save_data(self.data)
-        self.refresh_ui(f"Deleted {len(ids_to_delete)} {entry_word}.")
 
-    def _reindex_transactions(self) -> None:
-        for index, tx in enumerate(self.data["transactions"], start=1):
-            tx["id"] = index
+class CsvImport:
+    """Parses a CSV file in chunks (normally on a worker thread), dropping rows the ledger already holds."""
 
-    def set_budget(self) -> None:
-        raw = self.budget_var.get().strip().replace("$", "")
-        try:
-            self.data["monthly_budget"] = parse_amount(raw)
-        except ValueError:
-            messagebox.showerror("Invalid Budget", "Please enter a valid number for budget goal.")
-            return
+    def __init__(self, path, existing: list[dict], chunk_rows: int = CSV_IMPORT_CHUNK_ROWS) -> None:
+        self.path = Path(path)
+        self.existing = existing
+        self.chunk_rows = max(1, chunk_rows)
+        self.total_bytes = 0
+        self.bytes_read = 0
+        self.rows: list[dict] = []
+        self.invalid = 0
+        self.duplicates = 0
+        self.error: Optional[Exception] = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
 
-        save_data(self.data)
-        self.refresh_ui("Budget goal saved.")
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
 
-    def reset_filters(self) -> None:
-        self.search_var.set("")
-        self.filter_type_var.set("all")
-        self.filter_category_var.set("all")
-        self.refresh_ui("Filters reset.")
+    def cancel(self) -> None:
+        self._cancel.set()
 
-    def export_csv(self) -> None:
-        if not self.data.get("transactions"):
-            messagebox.showinfo("Nothing to Export", "There are no entries to export yet.")
-            return
+    def progress(self) -> float:
+        return min(1.0, self.bytes_read / self.total_bytes) if self.total_bytes else 0.0
 
-        path = filedialog.asksaveasfilename(
-            title="Export Entries",
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            initialfile="budgetbeacon_entries.csv",
-        )
-        if not path:
-            return
+    def start(self) -> None:
+        threading.Thread(target=self.run, name="csv-import", daemon=True).start()
 
+    def run(self) -> None:
         try:
-            with open(path, "w", newline="", encoding="utf-8") as file:
-                writer = csv.DictWriter(file, fieldnames=["id", "type", "category", "amount", "note", "createdAt"])
-                writer.writeheader()
-                for tx in self.data["transactions"]:
-                    writer.writerow(tx)
-        except OSError as exc:
-            messagebox.showerror("Export Failed", f"Could not export CSV.\n{exc}")
+            # Only the keys are kept; letting go of the rows also unmaps a LedgerRows.snapshot() passed in.
+            existing, self.existing = self.existing, []
+            # A multiset, so re-importing a file with two identical coffees skips both but a third still lands.
+            seen = Counter(transaction_content_key(tx) for tx in existing)
+            del existing
+            self.total_bytes = self.path.stat().st_size
+            with self.path.open("rb") as file:
+                chunk = []
+                for row in csv.DictReader(self._lines(file)):
+                    chunk.append(row)
+                    if len(chunk) >= self.chunk_rows:
+                        self._accept(chunk, seen)
+                        chunk = []
+                        if self.cancelled:
+                            return
+                self._accept(chunk, seen)
+        except (OSError, UnicodeDecodeError, csv.Error) as exc:
+            self.error = exc
+        finally:
+            self.finished.set()
+
+    def _lines(self, file) -> Iterator[str]:
+        encoding = "utf-8-sig"
+        for raw in file:
+            self.bytes_read += len(raw)
+            yield raw.decode(encoding)
+            encoding = "utf-8"
+
+    def _accept(self, chunk: list[dict], seen: Counter) -> None:
+        for row in chunk:
+            tx = parse_csv_row(row)
+            if tx is None:
+                self.invalid += 1
+                continue
+            key = transaction_content_key(tx)
+            if seen[key] > 0:
+                seen[key] -= 1
+                self.duplicates += 1
+                continue
+            self.rows.append(tx)
+
+
+def transaction_row_values(tx: dict) -> tuple:
+    return (
+        tx.get("id", ""),
+        tx.get("createdAt", ""),
+        tx.get("type", ""),
+        tx.get("category", ""),
+        format_currency(_amount_or_zero(tx.get("amount"))),
+        tx.get("note", ""),
+    )
+
+
+class RunningSummary:
+    """Income/expense totals plus per-month and per-category buckets, updated per transaction instead of rescanned."""
+
+    def __init__(self, data: dict, verify: bool = False) -> None:
+        self.data = data
+        self.verify = verify
+        self.version = 0
+        # Totals and buckets are integer cents; buckets hold [cents, count] so zero-amount entries still keep theirs.
+        self.totals = {"income": 0, "expense": 0}
+        self.counts = {"income": 0, "expense": 0}
+        self.by_month: dict[str, dict[str, list]] = {"income": {}, "expense": {}}
+        self.by_category: dict[str, dict[str, list]] = {"income": {}, "expense": {}}
+        transactions = data.get("transactions", [])
+        if isinstance(transactions, LedgerRows):
+            # Buckets come straight from the mapped columns; only rows already in memory are visited one by one.
+            for (tx_type, category, month), (cents, count) in transactions.column_groups().items():
+                self._add_group(tx_type, month, category, cents, count)
+            transactions = transactions.overlay_rows()
+        for tx in transactions:
+            self.add(tx)
+
+    def add(self, tx: dict) -> None:
+        self._apply(tx, 1)
+
+    def remove(self, tx: dict) -> None:
+        self._apply(tx, -1)
+
+    def _apply(self, tx: dict, sign: int) -> None:
+        tx_type = str(tx.get("type", "")).strip().lower()
+        if tx_type not in self.totals:
             return
-
-        messagebox.showinfo("Export Complete", f"Entries exported to:\n{path}")
-        self.refresh_ui(f"Exported CSV: {Path(path).name}")
-
-    def import_csv(self) -> None:
-        path = filedialog.askopenfilename(
-            title="Import Entries",
-            filetypes=[("CSV files", "*.csv")],
+        month = safe_month_key(tx.get("createdAt", ""))
+        self._add_group(tx_type, month, tx.get("category", "Uncategorized"), sign * transaction_cents(tx), sign)
+
+    def _add_group(self, tx_type: str, month: str, category: str, cents: int, count: int) -> None:
+        self.version += 1
+        self.counts[tx_type] += count
+        self.totals[tx_type] += cents
+        self._bump(self.by_month[tx_type], month, cents, count)
+        self._bump(self.by_category[tx_type], category, cents, count)
+
+    @staticmethod
+    def _bump(buckets: dict[str, list], key: str, cents: int, count: int) -> None:
+        bucket = buckets.setdefault(key, [0, 0])
+        bucket[1] += count
+        if bucket[1] <= 0:
+            del buckets[key]
+        else:
+            bucket[0] += cents
+
+    def month_totals(self, tx_type: str = "expense") -> dict[str, float]:
+        return {month: from_cents(bucket[0]) for month, bucket in self.by_month[tx_type].items()}
+
+    def category_totals(self, tx_type: str = "expense") -> dict[str, float]:
+        return {category: from_cents(bucket[0]) for category, bucket in self.by_category[tx_type].items()}
+
+    def categories(self, tx_type: Optional[str] = None) -> set[str]:
+        types = [tx_type] if tx_type in self.by_category else list(self.by_category)
+        return {str(category).strip() for entry_type in types for category in self.by_category[entry_type] if category}
+
+    def summary(self) -> dict:
+        if self.verify:
+            self.check()
+        return summary_from_cents(self.totals["income"], self.totals["expense"], self.data)
+
+    def check(self) -> None:
+        """Compare against a full recompute; raises ValueError naming the first bucket that drifted."""
+        fresh = RunningSummary(self.data)
+        for tx_type in self.totals:
+            expected = [
+                ("total", {"": [fresh.totals[tx_type]]}, {"": [self.totals[tx_type]]}),
+                ("month", fresh.by_month[tx_type], self.by_month[tx_type]),
+                ("category", fresh.by_category[tx_type], self.by_category[tx_type]),
+            ]
+            for label, want, have in expected:
+                if want.keys() != have.keys():
+                    raise ValueError(f"{tx_type} {label} buckets differ: {sorted(want)} != {sorted(have)}")
+                for key, bucket in want.items():
+                    if bucket[0] != have[key][0]:
+                        raise ValueError(
+                            f"{tx_type} {label} {key!r} is {format_currency(from_cents(have[key][0]))}, "
+                            f"recompute gives {format_currency(from_cents(bucket[0]))}"
+                        )
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+class SearchResults(Sequence):
+    """Index keys in result order; a row is looked up only when read, so a table shows a page without decoding all."""
+
+    def __init__(self, index: "TransactionIndex", keys: list[int]) -> None:
+        self._index = index
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._index._row(key) for key in self._keys[position]]
+        return self._index._row(self._keys[position])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (SearchResults, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+class TransactionIndex:
+    """Columnar copy of the ledger with precomputed sort keys, plus postings by type, category and search trigram.
+
+    Built from LedgerRows it reads the mapped columns directly; rows still in the file are fetched with
+    lookup(tx_id) when a result is read. Pass a lookup that follows the live list if rows are added or removed.
+    """
+
+    def __init__(self, transactions: Iterable[dict] = (), lookup: Optional[Callable[[int], dict]] = None) -> None:
+        self._reset()
+        if isinstance(transactions, LedgerRows):
+            if lookup is None:
+                rows, positions = transactions, transaction_positions(transactions)
+
+                def lookup(tx_id: int) -> dict:
+                    return rows[positions[tx_id]]
+
+            self._add_mapped(transactions)
+            transactions = transactions.overlay_rows()
+        self._lookup = lookup
+        for tx in transactions:
+            self.add(tx)
+
+    def _reset(self) -> None:
+        self.version = 0
+        self._keys: dict[int, int] = {}
+        # Rows by key; None for rows not read from the ledger file yet, and for removed rows.
+        self._rows: list[Optional[dict]] = []
+        # Columns are indexed by key; slots of removed rows stay behind until _compact() rebuilds them.
+        # Amounts are integer cents, so the column is 8 bytes per row and amount sorts compare exact values.
+        self._ids = array("q")
+        self._amounts = array("q")
+        self._dates: list[str] = []
+        self._types: list[str] = []
+        self._categories: list[str] = []
+        self._notes: list[str] = []
+        self._haystacks: list[str] = []
+        self._by_type: dict[str, set[int]] = defaultdict(set)
+        self._by_category: dict[str, set[int]] = defaultdict(set)
+        # Search text repeats a lot (same merchants, empty notes), so trigrams point at distinct texts, not rows.
+        self._by_haystack: dict[str, set[int]] = defaultdict(set)
+        self._by_trigram: dict[str, set[str]] = defaultdict(set)
+        self._last_search: Optional[tuple[int, str, set[str], set[int]]] = None
+        self._orders: dict[tuple[str, bool], list[int]] = {}
+
+    def add(self, tx: dict) -> None:
+        category = str(tx.get("category", "")).lower()
+        note = str(tx.get("note", "")).lower()
+        self._insert(
+            tx["id"],
+            transaction_cents(tx),
+            str(tx.get("createdAt", "")).lower(),
+            str(tx.get("type", "")).lower(),
+            category,
+            note,
+            f"{category} {note}",
+            tx,
         )
-        if not path:
+        self._changed()
+
+    def _insert(
+        self,
+        tx_id: int,
+        cents: int,
+        created_at: str,
+        tx_type: str,
+        category: str,
+        note: str,
+        haystack: str,
+        tx: Optional[dict],
+    ) -> None:
+        key = len(self._amounts)
+        self._keys[tx_id] = key
+        self._rows.append(tx)
+        self._ids.append(tx_id)
+        self._amounts.append(cents)
+        self._dates.append(created_at)
+        self._types.append(tx_type)
+        self._categories.append(category)
+        self._notes.append(note)
+        self._haystacks.append(haystack)
+        self._by_type[tx_type].add(key)
+        self._by_category[category].add(key)
+        if haystack not in self._by_haystack:
+            for gram in _trigrams(haystack):
+                self._by_trigram[gram].add(haystack)
+        self._by_haystack[haystack].add(key)
+
+    def _add_mapped(self, rows: LedgerRows) -> None:
+        # Filled a column at a time: each distinct string is decoded once and shared, and no row is decoded here.
+        ledger = rows.ledger
+        positions = list(rows.untouched_positions())
+        keys = range(len(self._amounts), len(self._amounts) + len(positions))
+        ids = [ledger.ids[position] for position in positions]
+        types = [LEDGER_TYPES[ledger.types[position]] for position in positions]
+        categories = [ledger.categories[position] for position in positions]
+        notes = [ledger.notes[position] for position in positions]
+        dates = [ledger.dates[position] for position in positions]
+        texts = {index: ledger.string(index, cache=False).lower() for index in {*categories, *notes, *dates}}
+        pairs = list(zip(categories, notes))
+        haystacks = {pair: f"{texts[pair[0]]} {texts[pair[1]]}" for pair in set(pairs)}
+
+        self._keys.update(zip(ids, keys))
+        self._rows += [None] * len(positions)
+        self._ids.extend(ids)
+        self._amounts.extend(ledger.cents[position] for position in positions)
+        self._dates += [texts[index] for index in dates]
+        self._types += types
+        self._categories += [texts[index] for index in categories]
+        self._notes += [texts[index] for index in notes]
+        self._haystacks += [haystacks[pair] for pair in pairs]
+        by_category: dict[int, list[int]] = defaultdict(list)
+        by_haystack: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for key, tx_type, pair in zip(keys, types, pairs):
+            self._by_type[tx_type].add(key)
+            by_category[pair[0]].append(key)
+            by_haystack[pair].append(key)
+        for index, category_keys in by_category.items():
+            self._by_category[texts[index]].update(category_keys)
+        for pair, haystack_keys in by_haystack.items():
+            haystack = haystacks[pair]
+            if haystack not in self._by_haystack:
+                for gram in _trigrams(haystack):
+                    self._by_trigram[gram].add(haystack)
+            self._by_haystack[haystack].update(haystack_keys)
+        self._changed()
+
+    def remove(self, tx: dict) -> None:
+        key = self._keys.pop(tx["id"], None)
+        if key is None:
             return
-
-        if not messagebox.askyesno(
-            "Confirm Import",
-            "Import entries from this CSV file?\n\nExisting entries will stay and imported entries will be added.",
-        ):
+        self._rows[key] = None
+        haystack = self._haystacks[key]
+        self._discard(self._by_type, self._types[key], key)
+        self._discard(self._by_category, self._categories[key], key)
+        self._discard(self._by_haystack, haystack, key)
+        if haystack not in self._by_haystack:
+            for gram in _trigrams(haystack):
+                self._discard(self._by_trigram, gram, haystack)
+        self._changed()
+        if len(self._amounts) > 2 * len(self._keys) + 1024:
+            self._compact()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(
+        self,
+        type_filter: str = "all",
+        category_filter: str = "all",
+        term: str = "",
+        sort_column: str = "id",
+        reverse: bool = False,
+    ) -> SearchResults:
+        postings = []
+        if type_filter != "all":
+            postings.append(self._by_type.get(type_filter, set()))
+        if category_filter != "all":
+            postings.append(self._by_category.get(category_filter, set()))
+        if term:
+            postings.append(self._match(term))
+        if not postings:
+            return SearchResults(self, self._full_order(sort_column, reverse))
+        postings.sort(key=len)
+        keys = postings[0].intersection(*postings[1:])
+        return SearchResults(self, self._ordered(keys, sort_column, reverse))
+
+    def _row(self, key: int) -> dict:
+        row = self._rows[key]
+        if row is None:
+            row = self._rows[key] = self._lookup(self._ids[key])
+        return row
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._orders.clear()
+
+    def _compact(self) -> None:
+        live = [
+            (
+                self._ids[key],
+                self._amounts[key],
+                self._dates[key],
+                self._types[key],
+                self._categories[key],
+                self._notes[key],
+                self._haystacks[key],
+                self._rows[key],
+            )
+            for key in self._by_id()
+        ]
+        self._reset()
+        for values in live:
+            self._insert(*values)
+        self._changed()
+
+    def _by_id(self, keys: Iterable[int] = None) -> list[int]:
+        # Ids are handed out in insertion order, so this is the ledger order ties fall back on.
+        return sorted(self._keys.values() if keys is None else keys, key=self._ids.__getitem__)
+
+    def _sort_values(self, column: str):
+        return {
+            "date": self._dates,
+            "type": self._types,
+            "category": self._categories,
+            "amount": self._amounts,
+            "note": self._notes,
+        }.get(column)
+
+    def _full_order(self, column: str, reverse: bool) -> list[int]:
+        order = self._orders.get((column, reverse))
+        if order is None:
+            live = self._by_id()
+            values = self._sort_values(column)
+            if values is None:
+                order = live[::-1] if reverse else live
+            else:
+                # Stable sort over ledger order, so ties keep insertion order.
+                order = sorted(live, key=values.__getitem__, reverse=reverse)
+            self._orders[(column, reverse)] = order
+        return order
+
+    def _ordered(self, keys: set[int], column: str, reverse: bool) -> list[int]:
+        if (column, reverse) in self._orders or len(keys) * 8 >= len(self._keys):
+            return [key for key in self._full_order(column, reverse) if key in keys]
+        values = self._sort_values(column)
+        base = self._by_id(keys)
+        if values is None:
+            return base[::-1] if reverse else base
+        return sorted(base, key=values.__getitem__, reverse=reverse)
+
+    def _match(self, term: str) -> set[int]:
+        last = self._last_search
+        if last is not None and last[0] == self.version and last[1] in term:
+            if last[1] == term:
+                return last[3]
+            # A longer query can only match a subset of what the shorter one matched.
+            pool = last[2]
+        elif len(term) >= 3:
+            grams = sorted((self._by_trigram.get(gram, set()) for gram in _trigrams(term)), key=len)
+            pool = grams[0].intersection(*grams[1:])
+        else:
+            pool = self._by_haystack.keys()
+        matched = {haystack for haystack in pool if term in haystack}
+        keys = set().union(*(self._by_haystack[haystack] for haystack in matched))
+        self._last_search = (self.version, term, matched, keys)
+        return keys
+
+    @staticmethod
+    def _discard(postings: dict, value: str, key) -> None:
+        keys = postings.get(value)
+        if keys is None:
             return
-
-        imported = 0
-        try:
-            with open(path, "r", newline="", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    tx_type = (row.get("type") or "").strip().lower()
-                    category = normalize_category_name(tx_type, row.get("category"))
-                    note = (row.get("note") or "").strip()
-                    created_at = (row.get("created_at") or "").strip() or datetime.now().isoformat(timespec="seconds")
-
-                    if tx_type not in {"income", "expense"} or not category:
-                        continue
-
-                    try:
-                        amount = parse_amount(str(row.get("amount", "")).strip().replace("$", ""))
-                    except ValueError:
-                        continue
-
-                    self.data["transactions"].append(
-                        {
-                            "id": 0,
-                            "type": tx_type,
-                            "category": category,
-                            "amount": amount,
-                            "note": note,
-                            "created_at": created_at,
-                        }
-                    )
-                    imported += 1
-        except OSError as exc:
-            messagebox.showerror("Import Failed", f"Could not import CSV.\n{exc}")
+        keys.discard(key)
+        if not keys:
+            del postings[value]
+
+
+class TransactionTable:
+    """Keeps a Treeview in step with a row list, touching only changed rows and materializing only the page in view."""
+
+    def __init__(self, tree, scrollbar, row_height: int = TABLE_ROW_HEIGHT) -> None:
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.rows: Sequence[dict] = []
+        self.offset = 0
+        self._order: list[str] = []
+        self._values: dict[str, tuple] = {}
+
+    def page_size(self) -> int:
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return TABLE_DEFAULT_PAGE_ROWS
+        # The heading takes about one row's height, which the partially visible bottom row makes up for.
+        return max(1, height // self.row_height)
+
+    def set_rows(self, rows: Sequence[dict]) -> None:
+        self.rows = rows
+        self.render()
+
+    def reset_scroll(self) -> None:
+        self.offset = 0
+
+    def scroll_to(self, offset: int) -> None:
+        self.offset = offset
+        self.render()
+
+    def yview(self, *args) -> None:
+        if not args:
             return
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= max(1, self.page_size() - 1)
+            self.scroll_to(self.offset + step)
+
+    def on_mousewheel(self, event) -> str:
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def render(self) -> None:
+        page = self.page_size()
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - page))
+        desired = [(str(tx.get("id", "")), transaction_row_values(tx)) for tx in self.rows[self.offset : self.offset + page]]
+
+        keep = {iid for iid, _values in desired}
+        stale = [iid for iid in self._order if iid not in keep]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._values[iid]
+        order = [iid for iid in self._order if iid in keep]
+
+        for index, (iid, values) in enumerate(desired):
+            if iid not in self._values:
+                self.tree.insert("", index, iid=iid, values=values)
+                order.insert(index, iid)
+            else:
+                if self._values[iid] != values:
+                    self.tree.item(iid, values=values)
+                if order[index] != iid:
+                    self.tree.move(iid, "", index)
+                    order.remove(iid)
+                    order.insert(index, iid)
+            self._values[iid] = values
+        self._order = order
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(desired)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
-        if imported == 0:
-            messagebox.showwarning("No Rows Imported", "No valid rows were found in this CSV file.")
-            return
 
-        self._reindex_transactions()
-        save_data(self.data)
-        messagebox.showinfo("Import Complete", f"Imported {imported} entries.")
-        self.refresh_ui(f"Imported {imported} entries.")
-
-    def draw_month_chart(self) -> None:
-        canvas = self.month_canvas
-        canvas.delete("all")
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
-        if width < 220 or height < 140:
-            return
+class CanvasItemPool:
+    """Keyed canvas items that are moved and reconfigured across redraws instead of deleted and recreated."""
 
-        expense_by_month = defaultdict(float)
-        for tx in self.data.get("transactions", []):
-            if tx.get("type") == "expense":
-                expense_by_month[safe_month_key(tx.get("createdAt", ""))] += float(tx.get("amount", 0.0))
+    def __init__(self, canvas) -> None:
+        self.canvas = canvas
+        self._items: dict[object, tuple[int, tuple, dict]] = {}
+        self._used: set = set()
 
-        months = sorted(expense_by_month.keys())[-6:]
-        canvas.create_text(12, 14, text="Monthly Expense Trend", anchor="w", fill=Colors.TEXT, font=("Segoe UI", 10, "bold"))
+    def begin(self) -> None:
+        self._used = set()
 
-        if not months:
-            canvas.create_text(width / 2, height / 2, text="No expense data yet", fill=Colors.MUTED, font=("Segoe UI", 11))
-            return
+    def draw(self, key: object, kind: str, coords: tuple, **options) -> int:
+        self._used.add(key)
+        current = self._items.get(key)
+        if current is None:
+            item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+        else:
+            item, old_coords, old_options = current
+            if coords != old_coords:
+                self.canvas.coords(item, *coords)
+            if options != old_options:
+                self.canvas.itemconfigure(item, **options)
+        self._items[key] = (item, coords, options)
+        return item
 
-        max_value = max(expense_by_month[m] for m in months) or 1.0
-        left, top, right, bottom = 36, 30, width - 14, height - 28
-        usable_width = right - left
-        bar_space = usable_width / len(months)
-        bar_w = max(12, min(42, int(bar_space * 0.58)))
-
-        canvas.create_line(left, top, left, bottom, fill=Colors.GRID)
-        canvas.create_line(left, bottom, right, bottom, fill=Colors.GRID)
-
-        for idx, month in enumerate(months):
-            value = expense_by_month[month]
-            x_center = left + (idx + 0.5) * bar_space
-            bar_height = ((bottom - top) * value) / max_value
-            x1 = x_center - bar_w / 2
-            y1 = bottom - bar_height
-            x2 = x_center + bar_w / 2
-            y2 = bottom
-            canvas.create_rectangle(x1, y1, x2, y2, fill=Colors.ACCENT, outline="")
-            canvas.create_text(x_center, bottom + 12, text=month[2:], fill=Colors.MUTED, font=("Segoe UI", 8))
-
-    def draw_category_chart(self) -> None:
-        canvas = self.category_canvas
-        canvas.delete("all")
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
-        if width < 240 or height < 140:
-            return
+    def finish(self) -> None:
+        for key in [key for key in self._items if key not in self._used]:
+            self.canvas.delete(self._items.pop(key)[0])
 
-        expense_by_category = defaultdict(float)
-        for tx in self.data.get("transactions", []):
-            if tx.get("type") == "expense":
-                category = tx.get("category", "Uncategorized")
-                expense_by_category[category] += float(tx.get("amount", 0.0))
 
-        top_categories = sorted(expense_by_category.items(), key=lambda item: item[1], reverse=True)[:5]
-        canvas.create_text(12, 14, text="Top Expense Categories", anchor="w", fill=Colors.TEXT, font=("Segoe UI", 10, "bold"))
+class SaveScheduler:
+    """Collects journal records from the Tk thread and writes them in batches on a background thread."""
 
-        if not top_categories:
-            canvas.create_text(width / 2, height / 2, text="No category data yet", fill=Colors.MUTED, font=("Segoe UI", 11))
+    def __init__(self, root, data: dict, on_status, delay_ms: int = SAVE_COALESCE_MS) -> None:
+        self.root = root
+        self.data = data
+        self.on_status = on_status
+        self.delay_ms = delay_ms
+        self._pending: list[str] = []
+        self._flush_after_id = None
+        self._poll_after_id = None
+        self._in_flight = 0
+        self._error: Optional[OSError] = None
+        self._force_snapshot = False
+        self._journal_bytes = _file_size(JOURNAL_FILE)
+        self._snapshot_bytes = _file_size(DATA_FILE)
+        self._jobs: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="budget-save", daemon=True)
+        self._thread.start()
+
+    def record(self, record: dict) -> None:
+        self._pending.append(journal_line(self.data, record))
+        if self._flush_after_id is None:
+            self._flush_after_id = self.root.after(self.delay_ms, self.flush)
+
+    def flush(self) -> None:
+        if self._flush_after_id is not None:
+            self.root.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+        if self._pending:
+            lines, self._pending = self._pending, []
+            self._journal_bytes += sum(len(line) for line in lines)
+            self._submit(("append", lines))
+        if self._force_snapshot or self._journal_bytes > max(JOURNAL_COMPACT_MIN_BYTES, self._snapshot_bytes):
+            if isinstance(self.data["transactions"], LedgerRows):
+                # The worker is about to replace the ledger file, which Windows refuses while it is mapped.
+                self.data["transactions"] = self.data["transactions"].materialize()
+            # Copy rows so later edits on the Tk thread cannot race with serialization.
+            snapshot = {**self.data, "transactions": [dict(tx) for tx in self.data["transactions"]]}
+            self._force_snapshot = False
+            self._journal_bytes = 0
+            self._submit(("snapshot", snapshot))
+
+    def close(self) -> None:
+        self.flush()
+        self._jobs.put(None)
+        self._thread.join()
+        self._drain_results()
+        if self._error is not None:
+            # The worker has exited, so a failed final write would otherwise lose the last edits.
+            if isinstance(self.data["transactions"], LedgerRows):
+                self.data["transactions"] = self.data["transactions"].materialize()
+            compact_journal(self.data)
+            self._error = None
+            self.on_status("All changes saved.")
+
+    def _submit(self, job: tuple) -> None:
+        self._in_flight += 1
+        self._jobs.put(job)
+        self.on_status("Saving...")
+        if self._poll_after_id is None:
+            self._poll_after_id = self.root.after(SAVE_POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        self._poll_after_id = None
+        self._drain_results()
+        if self._in_flight:
+            self._poll_after_id = self.root.after(SAVE_POLL_MS, self._poll)
+
+    def _drain_results(self) -> None:
+        while True:
+            try:
+                kind, error, size = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight -= 1
+            if error is not None:
+                self._error = error
+                # The journal on disk may now be missing records; the next flush rewrites the full snapshot.
+                self._force_snapshot = True
+            elif kind == "snapshot":
+                self._snapshot_bytes = size
+                self._error = None
+        if self._in_flight:
             return
+        if self._error is not None:
+            self.on_status(f"Save failed: {self._error}. Will retry on the next change.")
+        else:
+            self.on_status("All changes saved.")
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            kind, payload = job
+            try:
+                if kind == "append":
+                    write_journal_lines(payload)
+                    self._results.put((kind, None, 0))
+                else:
+                    compact_journal(payload)
+                    self._results.put((kind, None, _file_size(DATA_FILE)))
+            except OSError as exc:
+                self._results.put((kind, exc, 0))
+
+
+def month_transactions(data: dict, month: str) -> dict:
+    return {
+        "monthly_budget": data.get("monthly_budget", 0.0),
+        "transactions": [tx for tx in data.get("transactions", []) if safe_month_key(tx.get("createdAt")) == month],
+    }
 
-        max_value = max(value for _, value in top_categories) or 1.0
-        y = 36
-        for category, value in top_categories:
-            label = category if len(category) <= 18 else f"{category[:16]}.."
-            bar_left = 110
-            bar_right = width - 16
-            bar_width = bar_right - bar_left
-            fill_width = (value / max_value) * bar_width
 
-            canvas.create_text(12, y + 8, text=label, anchor="w", fill=Colors.TEXT, font=("Segoe UI", 9))
-            canvas.create_rectangle(bar_left, y, bar_right, y + 16, fill=Colors.ACCENT_SOFT, outline="")
-            canvas.create_rectangle(bar_left, y, bar_left + fill_width, y + 16, fill=Colors.BEACON, outline="")
-            canvas.create_text(bar_right, y + 8, text=format_currency(value), anchor="e", fill=Colors.MUTED, font=("Segoe UI", 8, "bold"))
-            y += 28
+def monthly_report(data: dict) -> list[dict]:
+    summary = RunningSummary(data)
+    months = sorted(set(summary.by_month["income"]) | set(summary.by_month["expense"]))
+    report = []
+    for month in months:
+        income, income_count = summary.by_month["income"].get(month, (0, 0))
+        expense, expense_count = summary.by_month["expense"].get(month, (0, 0))
+        row = summary_from_cents(income, expense, data)
+        del row["budget"]
+        report.append({"month": month, **row, "count": income_count + expense_count})
+    return report
+
+
+def _print_json(payload: object) -> None:
+    json.dump(payload, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def _cli_summary(args: argparse.Namespace, data: dict) -> int:
+    if args.month:
+        data = month_transactions(data, args.month)
+    summary = calculate_summary(data)
+    summary["count"] = len(data["transactions"])
+    if args.json:
+        _print_json(summary)
+        return 0
+    print(f"Entries:   {summary['count']:,}")
+    for label in ("income", "expense", "balance", "budget", "remaining"):
+        print(f"{label.title() + ':':<10} {format_currency(summary[label])}")
+    return 0
+
+
+def _cli_export(args: argparse.Namespace, data: dict) -> int:
+    transactions = data["transactions"]
+    if args.month:
+        transactions = month_transactions(data, args.month)["transactions"]
+    try:
+        rows = export_transactions_csv(args.path, transactions)
+    except OSError as exc:
+        print(f"Could not export CSV: {exc}", file=sys.stderr)
+        return 1
+    if args.json:
+        _print_json({"path": str(args.path), "rows": rows})
+    else:
+        print(f"Exported {rows:,} entries to {args.path}")
+    return 0
+
+
+def _cli_import(args: argparse.Namespace, data: dict) -> int:
+    job = CsvImport(args.path, data["transactions"])
+    job.run()
+    if job.error is not None:
+        print(f"Could not import CSV: {job.error}", file=sys.stderr)
+        return 1
+    if job.rows:
+        positions = transaction_positions(data["transactions"])
+        for tx in job.rows:
+            append_transaction(data, positions, tx)
+        record_change(data, {"op": "import", "transactions": job.rows})
+    result = {"imported": len(job.rows), "duplicates": job.duplicates, "invalid": job.invalid}
+    if args.json:
+        _print_json(result)
+    else:
+        print(f"Imported {result['imported']:,} entries ({job.duplicates:,} duplicates, {job.invalid:,} invalid rows skipped)")
+    return 0
+
+
+def _cli_monthly_report(args: argparse.Namespace, data: dict) -> int:
+    report = monthly_report(data)
+    if args.json:
+        _print_json(report)
+        return 0
+    print(f"{'Month':<8} {'Income':>14} {'Expense':>14} {'Balance':>14} {'Entries':>8}")
+    for row in report:
+        print(
+            f"{row['month']:<8} {format_currency(row['income']):>14} {format_currency(row['expense']):>14}"
+            f" {format_currency(row['balance']):>14} {row['count']:>8,}"
+        )
+    return 0
 
 
-def main() -> None:
-    root = tk.Tk()
-    BudgetAppGUI(root)
-    root.mainloop()
+def _cli_convert(args: argparse.Namespace, data: dict) -> int:
+    if args.path.resolve() == DATA_FILE.resolve():
+        print("Choose a different file to convert to.", file=sys.stderr)
+        return 1
+    use_data_file(args.path)
+    try:
+        compact_journal(data)
+    except (OSError, LedgerError) as exc:
+        print(f"Could not write {args.path}: {exc}", file=sys.stderr)
+        return 1
+    if args.json:
+        _print_json({"path": str(args.path), "rows": len(data["transactions"])})
+    else:
+        print(f"Wrote {len(data['transactions']):,} entries to {args.path}")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BudgetBeacon desktop ledger; runs the GUI when no command is given")
+    parser.add_argument("--data", type=Path, default=None, help=f"ledger snapshot to use (default {DATA_FILE})")
+    commands = parser.add_subparsers(dest="command")
+    summary = commands.add_parser("summary", help="print income, expense and budget totals")
+    summary.add_argument("--month", help="only count entries from this YYYY-MM month")
+    summary.set_defaults(handler=_cli_summary)
+    export = commands.add_parser("export", help="write entries to a CSV file")
+    export.add_argument("path", type=Path)
+    export.add_argument("--month", help="only export entries from this YYYY-MM month")
+    export.set_defaults(handler=_cli_export)
+    import_ = commands.add_parser("import", help="add entries from a CSV file, skipping ones already in the ledger")
+    import_.add_argument("path", type=Path)
+    import_.set_defaults(handler=_cli_import)
+    report = commands.add_parser("monthly-report", help="print per-month income, expense and balance")
+    report.set_defaults(handler=_cli_monthly_report)
+    convert = commands.add_parser("convert", help=f"copy the ledger to a JSON snapshot or a binary {LEDGER_SUFFIX} file")
+    convert.add_argument("path", type=Path)
+    convert.set_defaults(handler=_cli_convert)
+    for command in (summary, export, import_, report, convert):
+        command.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        # Imported here so the headless commands never pull in Tk.
+        from budget_gui import main as run_gui
+
+        run_gui(args.data)
+        return 0
+    if args.data is not None:
+        use_data_file(args.data)
+    return args.handler(args, load_data())
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""Ledger rules shared by the desktop app (budget_app.py) and the API server (web_backend.py)."""
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from math import isfinite
+from typing import Callable, Iterator, Optional
+
+ENTRY_TYPES = ("income", "expense")
+EXPENSE_CATEGORIES = [
+    "Groceries",
+    "Mortgage/Rent",
+    "Water",
+    "Gas",
+    "Electric",
+    "Transportation",
+    "Dining",
+    "Entertainment",
+    "Healthcare",
+    "Car Insurance",
+    "Credit Cards",
+    "Loans",
+    "Student Loans",
+    "Childcare",
+    "Education",
+    "Internet",
+    "Cellphone",
+    "Shopping",
+    "Personal Care",
+    "Travel",
+    "Gifts",
+    "Taxes",
+    "Other",
+]
+INCOME_CATEGORIES = [
+    "Salary",
+    "Freelance",
+    "Business",
+    "Interest",
+    "Dividends",
+    "Rental Income",
+    "Refund",
+    "Gift",
+    "Other Income",
+]
+DEFAULT_CATEGORIES = sorted(set(EXPENSE_CATEGORIES + INCOME_CATEGORIES))
+LEGACY_EXPENSE_CATEGORY_RENAMES = {
+    "rent": "Mortgage/Rent",
+    "utilities": "Electric",
+    "insurance": "Car Insurance",
+    "debt payment": "Loans",
+    "phone/internet": "Internet",
+}
+# The desktop app called it "Gift Received" before the category lists were shared with the web app.
+LEGACY_INCOME_CATEGORY_RENAMES = {
+    "gift received": "Gift",
+}
+# Largest amount in cents: a double still holds it exactly, and it fits SQLite INTEGER and array("q") columns.
+MAX_AMOUNT_CENTS = 2**53 - 1
+CANONICAL_EXPENSE_CATEGORIES = {name.lower(): name for name in EXPENSE_CATEGORIES}
+CANONICAL_INCOME_CATEGORIES = {name.lower(): name for name in INCOME_CATEGORIES}
+
+
+def typical_categories_for(entry_type: str) -> list[str]:
+    if entry_type == "income":
+        return INCOME_CATEGORIES[:]
+    if entry_type == "expense":
+        return EXPENSE_CATEGORIES[:]
+    return DEFAULT_CATEGORIES[:]
+
+
+def normalize_entry_type(value: object) -> str:
+    entry_type = str(value or "").strip().lower()
+    return entry_type if entry_type in ENTRY_TYPES else ""
+
+
+def normalize_category_name(entry_type: str, raw_category: object) -> str:
+    category = str(raw_category or "").strip()
+    if not category:
+        return ""
+
+    if entry_type == "expense":
+        mapped = LEGACY_EXPENSE_CATEGORY_RENAMES.get(category.lower(), category)
+        return CANONICAL_EXPENSE_CATEGORIES.get(mapped.lower(), mapped)
+    if entry_type == "income":
+        mapped = LEGACY_INCOME_CATEGORY_RENAMES.get(category.lower(), category)
+        return CANONICAL_INCOME_CATEGORIES.get(mapped.lower(), mapped)
+    return category
+
+
+def parse_amount(value: object) -> float:
+    amount = float(value)
+    if not isfinite(amount) or amount < 0:
+        raise ValueError("Amount must be a finite non-negative number.")
+    if to_cents(amount) > MAX_AMOUNT_CENTS:
+        raise ValueError("Amount is too large.")
+    return amount
+
+
+def to_cents(amount: float) -> int:
+    return round(amount * 100)
+
+
+def parse_cents(value: object) -> int:
+    amount = parse_amount(value)
+    if isinstance(value, str):
+        # Typed or CSV text is rounded in decimal, so "1.005" does not inherit float's 1.00499...
+        cents = int((Decimal(value.strip()) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+        if cents > MAX_AMOUNT_CENTS:
+            raise ValueError("Amount is too large.")
+        return cents
+    return to_cents(amount)
+
+
+def from_cents(cents: int) -> float:
+    return cents / 100
+
+
+def transaction_cents(tx) -> int:
+    """Amount in integer cents; entries without a valid amount count as 0."""
+    if isinstance(tx, Transaction):
+        return tx.cents
+    try:
+        return parse_cents(tx.get("amount"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def local_now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def safe_month_key(created_at: object) -> str:
+    if not created_at:
+        return "unknown"
+    text = str(created_at)
+    try:
+        return datetime.fromisoformat(text).strftime("%Y-%m")
+    except (ValueError, TypeError):
+        return text[:7] if len(text) >= 7 else "unknown"
+
+
+class Transaction:
+    """One ledger entry in fixed slots; reads like the JSON dict it is stored as, at about a third of the memory.
+
+    Measured on CPython 3.11: 88 bytes per record against 272 for the dict, not counting the field values.
+    The amount is held as integer cents so sums are exact; it still reads and serializes as a float of dollars.
+    """
+
+    __slots__ = ("id", "type", "category", "cents", "note", "created_at", "meta")
+    # Mapping keys are the stored JSON names; created_at is the legacy desktop spelling of createdAt.
+    _FIELDS = {
+        "id": "id",
+        "type": "type",
+        "category": "category",
+        "amount": "amount",
+        "note": "note",
+        "createdAt": "created_at",
+        "created_at": "created_at",
+        "meta": "meta",
+    }
+    _KEYS = ("id", "type", "category", "amount", "note", "createdAt")
+
+    def __init__(
+        self,
+        id: object,
+        type: str,
+        category: str,
+        amount: float,
+        note: str = "",
+        created_at: str = "",
+        meta: Optional[dict] = None,
+    ) -> None:
+        self.id = id
+        self.type = type
+        self.category = category
+        self.cents = to_cents(amount)
+        self.note = note
+        self.created_at = created_at
+        self.meta = meta
+
+    @classmethod
+    def from_cents(
+        cls,
+        id: object,
+        type: str,
+        category: str,
+        cents: int,
+        note: str = "",
+        created_at: str = "",
+        meta: Optional[dict] = None,
+    ) -> "Transaction":
+        """Build a row from an amount already in cents, skipping the float round trip."""
+        tx = cls.__new__(cls)
+        tx.id = id
+        tx.type = type
+        tx.category = category
+        tx.cents = cents
+        tx.note = note
+        tx.created_at = created_at
+        tx.meta = meta
+        return tx
+
+    @property
+    def amount(self) -> float:
+        return from_cents(self.cents)
+
+    @amount.setter
+    def amount(self, value: float) -> None:
+        self.cents = to_cents(value)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, self._FIELDS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value) -> None:
+        try:
+            setattr(self, self._FIELDS[key], value)
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        field = self._FIELDS.get(key)
+        if field is None:
+            return default
+        value = getattr(self, field)
+        return default if value is None and field == "meta" else value
+
+    def keys(self) -> tuple[str, ...]:
+        return self._KEYS if self.meta is None else self._KEYS + ("meta",)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def to_dict(self) -> dict:
+        # Spelled out rather than built from keys(): snapshots call this once per row.
+        row = {
+            "id": self.id,
+            "type": self.type,
+            "category": self.category,
+            "amount": self.cents / 100,
+            "note": self.note,
+            "createdAt": self.created_at,
+        }
+        if self.meta is not None:
+            row["meta"] = self.meta
+        return row
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Transaction):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Transaction({self.to_dict()!r})"
+
+
+def sanitize_transaction(raw: object, tx_id: object, now: Callable[[], str] = local_now_iso) -> Optional[Transaction]:
+    """Validate and normalize one entry; None for anything that is not an income/expense with a category and a valid amount."""
+    if not isinstance(raw, (dict, Transaction)):
+        return None
+
+    tx_type = normalize_entry_type(raw.get("type"))
+    if not tx_type:
+        return None
+
+    category = normalize_category_name(tx_type, raw.get("category", ""))
+    if not category:
+        return None
+
+    try:
+        cents = parse_cents(raw.get("amount"))
+    except (TypeError, ValueError):
+        return None
+
+    # Support both createdAt (web) and created_at (legacy) for backwards compatibility
+    created_raw = raw.get("createdAt") or raw.get("created_at")
+    created_at = str(created_raw).strip() if created_raw is not None else ""
+    meta = raw.get("meta")
+    return Transaction.from_cents(
+        tx_id,
+        tx_type,
+        category,
+        cents,
+        str(raw.get("note") or "").strip(),
+        created_at or now(),
+        meta if isinstance(meta, dict) else None,
+    )
+
+
+def transaction_json(value: object) -> dict:
+    """json.dump default= hook, so snapshots and journal records serialize Transaction rows as plain objects."""
+    if isinstance(value, Transaction):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
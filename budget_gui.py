@@ -0,0 +1,826 @@
+import os
+from collections.abc import Sequence
+from pathlib import Path
+import tkinter as tk
+from typing import Optional
+from tkinter import filedialog, messagebox, ttk
+
+import budget_app
+from budget_app import (
+    CHART_REDRAW_DEBOUNCE_MS,
+    CSV_IMPORT_CHUNK_ROWS,
+    CSV_IMPORT_POLL_MS,
+    CanvasItemPool,
+    CsvImport,
+    RunningSummary,
+    SaveScheduler,
+    TransactionIndex,
+    TransactionTable,
+    _safe_int,
+    append_transaction,
+    export_transactions_csv,
+    format_currency,
+    load_data,
+    normalize_category_name,
+    parse_amount,
+    remove_transactions,
+    transaction_positions,
+    typical_categories_for,
+)
+from budget_core import Transaction, local_now_iso
+from budget_ledger import LedgerRows
+
+
+class Colors:
+    BG = "#eef4fb"
+    PANEL = "#ffffff"
+    ACCENT = "#0f3b66"
+    ACCENT_SOFT = "#e5eef9"
+    BEACON = "#f4a300"
+    TEXT = "#13263a"
+    MUTED = "#5a6f86"
+    INCOME = "#1f8f55"
+    EXPENSE = "#c63f30"
+    GRID = "#c8d7e8"
+
+
+class BudgetAppGUI:
+    def __init__(self, root: tk.Tk) -> None:
+        self.root = root
+        self.root.title("BudgetBeacon")
+        self.root.geometry("1180x760")
+        self.root.minsize(1024, 680)
+        self.root.configure(bg=Colors.BG)
+
+        self.data = load_data()
+        self.positions = transaction_positions(self.data["transactions"])
+        # Rows of a .ledger file stay in the mapping; the index fetches one through the live list only when shown.
+        self.index = TransactionIndex(self.data["transactions"], lookup=self._transaction_by_id)
+        self.summary = RunningSummary(self.data, verify=os.environ.get("BUDGETBEACON_VERIFY_SUMMARY") == "1")
+        self.saver = SaveScheduler(root, self.data, self._set_save_status)
+        self.sort_column = "date"
+        self.sort_reverse = True
+        self._filter_after_id = None
+        self._chart_after_id = None
+        self._chart_cache: tuple = (-1, [], [])
+        self._import: Optional[CsvImport] = None
+        self._import_dialog = None
+
+        self.status_var = tk.StringVar(value="Ready")
+        self.save_status_var = tk.StringVar(value="All changes saved.")
+        self.type_var = tk.StringVar(value="expense")
+        self.category_var = tk.StringVar()
+        self.amount_var = tk.StringVar()
+        self.note_var = tk.StringVar()
+        self.budget_var = tk.StringVar(value=f"{self.data.get('monthly_budget', 0.0):.2f}")
+
+        self.search_var = tk.StringVar()
+        self.filter_type_var = tk.StringVar(value="all")
+        self.filter_category_var = tk.StringVar(value="all")
+
+        self.income_var = tk.StringVar(value="$0.00")
+        self.expense_var = tk.StringVar(value="$0.00")
+        self.balance_var = tk.StringVar(value="$0.00")
+        self.budget_total_var = tk.StringVar(value="$0.00")
+        self.remaining_var = tk.StringVar(value="$0.00")
+
+        self._build_style()
+        self._build_ui()
+        self._bind_live_filters()
+        self.refresh_ui("Loaded budget data.")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._show_welcome_if_needed()
+
+    def _build_style(self) -> None:
+        style = ttk.Style()
+        try:
+            style.theme_use("clam")
+        except tk.TclError:
+            pass
+
+        style.configure("TFrame", background=Colors.BG)
+        style.configure("TLabelframe", background=Colors.BG)
+        style.configure("TLabelframe.Label", background=Colors.BG, foreground=Colors.TEXT, font=("Segoe UI", 10, "bold"))
+        style.configure("TLabel", background=Colors.BG, foreground=Colors.TEXT, font=("Segoe UI", 10))
+        style.configure("Title.TLabel", background=Colors.BG, foreground=Colors.TEXT, font=("Segoe UI", 26, "bold"))
+        style.configure("Hint.TLabel", background=Colors.BG, foreground=Colors.MUTED, font=("Segoe UI", 9))
+        style.configure("Accent.TButton", font=("Segoe UI", 10, "bold"))
+        style.map("Accent.TButton", background=[("!disabled", Colors.ACCENT)])
+
+        style.configure(
+            "Treeview",
+            background=Colors.PANEL,
+            fieldbackground=Colors.PANEL,
+            foreground=Colors.TEXT,
+            rowheight=28,
+            borderwidth=0,
+            font=("Segoe UI", 10),
+        )
+        style.configure("Treeview.Heading", font=("Segoe UI", 10, "bold"), foreground=Colors.TEXT)
+
+    def _build_ui(self) -> None:
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(1, weight=1)
+
+        header = tk.Frame(self.root, bg=Colors.ACCENT, padx=18, pady=12)
+        header.grid(row=0, column=0, sticky="ew")
+        brand_wrap = tk.Frame(header, bg=Colors.ACCENT)
+        brand_wrap.pack(side="left")
+        tk.Label(
+            brand_wrap,
+            text="BudgetBeacon",
+            bg=Colors.ACCENT,
+            fg="white",
+            font=("Segoe UI", 24, "bold"),
+        ).pack(anchor="w")
+        tk.Label(
+            brand_wrap,
+            text="Guiding your budget with clarity",
+            bg=Colors.ACCENT,
+            fg=Colors.BEACON,
+            font=("Segoe UI", 10, "bold"),
+        ).pack(anchor="w")
+        tk.Button(
+            header,
+            text="How To Use",
+            command=self.show_help,
+            bg=Colors.BEACON,
+            fg=Colors.TEXT,
+            activebackground="#e69800",
+            activeforeground=Colors.TEXT,
+            font=("Segoe UI", 10, "bold"),
+            relief="flat",
+            padx=12,
+            pady=8,
+            cursor="hand2",
+        ).pack(side="right", pady=6)
+
+        content = ttk.Frame(self.root, padding=(18, 8, 18, 12))
+        content.grid(row=1, column=0, sticky="nsew")
+        content.columnconfigure(0, weight=0)
+        content.columnconfigure(1, weight=1)
+        content.rowconfigure(0, weight=0)
+        content.rowconfigure(1, weight=1)
+
+        left = ttk.Frame(content, style="TFrame")
+        left.grid(row=0, column=0, rowspan=2, sticky="nsw", padx=(0, 14))
+
+        self._build_entry_panel(left)
+        self._build_actions_panel(left)
+
+        self._build_stats_row(content)
+        self._build_table_panel(content)
+        self._build_charts_panel(content)
+
+        footer = ttk.Frame(self.root, padding=(18, 0, 18, 12))
+        footer.grid(row=2, column=0, sticky="ew")
+        footer.columnconfigure(0, weight=1)
+        ttk.Label(footer, textvariable=self.status_var, foreground=Colors.MUTED).grid(row=0, column=0, sticky="w")
+        ttk.Label(footer, textvariable=self.save_status_var, foreground=Colors.MUTED).grid(row=0, column=1, sticky="e")
+
+    def _build_entry_panel(self, parent: ttk.Frame) -> None:
+        form = ttk.LabelFrame(parent, text="Add New Entry", padding=12)
+        form.grid(row=0, column=0, sticky="new")
+
+        ttk.Label(form, text="Money Type").grid(row=0, column=0, sticky="w", pady=(0, 4))
+        ttk.Combobox(form, textvariable=self.type_var, values=["income", "expense"], state="readonly", width=24).grid(
+            row=1, column=0, sticky="ew", pady=(0, 8)
+        )
+
+        ttk.Label(form, text="Category").grid(row=2, column=0, sticky="w", pady=(0, 4))
+        self.category_entry = ttk.Combobox(
+            form,
+            textvariable=self.category_var,
+            values=typical_categories_for("expense"),
+            state="readonly",
+            width=24,
+        )
+        self.category_entry.grid(row=3, column=0, sticky="ew", pady=(0, 8))
+        if self.category_entry["values"]:
+            self.category_var.set(self.category_entry["values"][0])
+
+        ttk.Label(form, text="Amount (example: 24.99)").grid(row=4, column=0, sticky="w", pady=(0, 4))
+        amount_entry = ttk.Entry(form, textvariable=self.amount_var, width=24)
+        amount_entry.grid(row=5, column=0, sticky="ew", pady=(0, 8))
+
+        ttk.Label(form, text="Note (optional)").grid(row=6, column=0, sticky="w", pady=(0, 4))
+        note_entry = ttk.Entry(form, textvariable=self.note_var, width=24)
+        note_entry.grid(row=7, column=0, sticky="ew", pady=(0, 10))
+
+        amount_entry.bind("<Return>", lambda _e: self.add_transaction())
+        note_entry.bind("<Return>", lambda _e: self.add_transaction())
+
+        ttk.Button(form, text="Save Entry", command=self.add_transaction, style="Accent.TButton").grid(
+            row=8, column=0, sticky="ew"
+        )
+        ttk.Button(form, text="Clear Form", command=self.clear_form).grid(row=9, column=0, sticky="ew", pady=(6, 0))
+
+        ttk.Separator(form).grid(row=10, column=0, sticky="ew", pady=10)
+
+        ttk.Label(form, text="Monthly Budget Goal").grid(row=11, column=0, sticky="w", pady=(0, 4))
+        ttk.Entry(form, textvariable=self.budget_var, width=24).grid(row=12, column=0, sticky="ew", pady=(0, 8))
+        ttk.Button(form, text="Save Budget Goal", command=self.set_budget).grid(row=13, column=0, sticky="ew")
+        ttk.Label(form, text="Tip: Set this once per month.", style="Hint.TLabel").grid(row=14, column=0, sticky="w", pady=(6, 0))
+
+    def _build_actions_panel(self, parent: ttk.Frame) -> None:
+        panel = ttk.LabelFrame(parent, text="File & Safety", padding=12)
+        panel.grid(row=1, column=0, sticky="new", pady=(10, 0))
+
+        ttk.Button(panel, text="Delete Selected Entry", command=self.delete_selected).grid(row=0, column=0, sticky="ew")
+        ttk.Button(panel, text="Export to CSV", command=self.export_csv).grid(row=1, column=0, sticky="ew", pady=(8, 0))
+        ttk.Button(panel, text="Import from CSV", command=self.import_csv).grid(row=2, column=0, sticky="ew", pady=(8, 0))
+
+    def _build_stats_row(self, parent: ttk.Frame) -> None:
+        stats = ttk.Frame(parent)
+        stats.grid(row=0, column=1, sticky="ew", pady=(0, 10))
+        for idx in range(5):
+            stats.columnconfigure(idx, weight=1)
+
+        self._build_stat_card(stats, 0, "Income", self.income_var)
+        self._build_stat_card(stats, 1, "Expenses", self.expense_var)
+        self._build_stat_card(stats, 2, "Balance", self.balance_var)
+        self._build_stat_card(stats, 3, "Budget Goal", self.budget_total_var)
+        self._build_stat_card(stats, 4, "Budget Left", self.remaining_var)
+
+    def _build_stat_card(self, parent: ttk.Frame, col: int, label: str, value_var: tk.StringVar) -> None:
+        value_color = Colors.TEXT
+        card_bg = Colors.PANEL
+        border_color = Colors.GRID
+        if label == "Income":
+            value_color = Colors.INCOME
+            card_bg = "#edf8f2"
+            border_color = "#b9e2c8"
+        elif label == "Expenses":
+            value_color = Colors.EXPENSE
+            card_bg = "#fff0ee"
+            border_color = "#f0c5bf"
+        elif label == "Budget Left":
+            value_color = Colors.BEACON
+            card_bg = "#fff8ea"
+            border_color = "#f0dcac"
+        elif label == "Budget Goal":
+            card_bg = "#eef4ff"
+            border_color = "#c9d7f0"
+        elif label == "Balance":
+            card_bg = "#f1f5fa"
+
+        card = tk.Frame(parent, bg=card_bg, bd=0, highlightthickness=1, highlightbackground=border_color)
+        card.grid(row=0, column=col, sticky="nsew", padx=(0 if col == 0 else 8, 0), pady=0)
+        tk.Label(card, text=label, bg=card_bg, fg=Colors.MUTED, font=("Segoe UI", 9, "bold")).pack(
+            anchor="w", padx=10, pady=(8, 2)
+        )
+        tk.Label(card, textvariable=value_var, bg=card_bg, fg=value_color, font=("Segoe UI", 16, "bold")).pack(
+            anchor="w", padx=10, pady=(0, 8)
+        )
+
+    def _build_table_panel(self, parent: ttk.Frame) -> None:
+        table_wrap = ttk.LabelFrame(parent, text="Entries", padding=10)
+        table_wrap.grid(row=1, column=1, sticky="nsew")
+        table_wrap.columnconfigure(0, weight=1)
+        table_wrap.rowconfigure(1, weight=1)
+
+        filters = ttk.Frame(table_wrap)
+        filters.grid(row=0, column=0, sticky="ew", pady=(0, 8))
+
+        ttk.Label(filters, text="Type").grid(row=0, column=0, sticky="w")
+        self.type_filter_combo = ttk.Combobox(
+            filters,
+            textvariable=self.filter_type_var,
+            values=["all", "income", "expense"],
+            state="readonly",
+            width=10,
+        )
+        self.type_filter_combo.grid(row=0, column=1, padx=(6, 10), sticky="w")
+
+        ttk.Label(filters, text="Category").grid(row=0, column=2, sticky="w")
+        self.category_filter_combo = ttk.Combobox(
+            filters,
+            textvariable=self.filter_category_var,
+            values=["all"],
+            state="readonly",
+            width=18,
+        )
+        self.category_filter_combo.grid(row=0, column=3, padx=(6, 10), sticky="w")
+
+        ttk.Label(filters, text="Search notes/categories").grid(row=0, column=4, sticky="w")
+        ttk.Entry(filters, textvariable=self.search_var, width=28).grid(row=0, column=5, padx=(6, 10), sticky="w")
+
+        ttk.Button(filters, text="Reset Filters", command=self.reset_filters).grid(row=0, column=6, padx=(6, 0), sticky="w")
+
+        columns = ("id", "date", "type", "category", "amount", "note")
+        self.tree = ttk.Treeview(table_wrap, columns=columns, show="headings", selectmode="extended")
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Delete>", lambda _e: self.delete_selected())
+
+        headings = {
+            "id": "ID",
+            "date": "Date",
+            "type": "Type",
+            "category": "Category",
+            "amount": "Amount",
+            "note": "Note",
+        }
+        for col, label in headings.items():
+            self.tree.heading(col, text=label, command=lambda c=col: self.sort_by(c))
+
+        self.tree.column("id", width=55, anchor="center")
+        self.tree.column("date", width=150, anchor="w")
+        self.tree.column("type", width=85, anchor="center")
+        self.tree.column("category", width=150, anchor="w")
+        self.tree.column("amount", width=120, anchor="e")
+        self.tree.column("note", width=240, anchor="w")
+
+        # The table only materializes the rows in view, so the scrollbar drives TransactionTable, not the Treeview.
+        scrollbar = ttk.Scrollbar(table_wrap, orient="vertical")
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.table = TransactionTable(self.tree, scrollbar)
+        scrollbar.configure(command=self.table.yview)
+        self.tree.bind("<Configure>", lambda _e: self.table.render())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.table.on_mousewheel)
+        self.tree.bind("<Next>", lambda _e: self.table.yview("scroll", 1, "pages"))
+        self.tree.bind("<Prior>", lambda _e: self.table.yview("scroll", -1, "pages"))
+
+        self.empty_state_label = ttk.Label(
+            table_wrap,
+            text="No entries yet. Start by adding your first income or expense on the left.",
+            style="Hint.TLabel",
+        )
+
+    def _build_charts_panel(self, parent: ttk.Frame) -> None:
+        charts = ttk.LabelFrame(parent, text="Insights", padding=10)
+        charts.grid(row=2, column=1, sticky="ew", pady=(10, 0))
+        charts.columnconfigure(0, weight=1)
+        charts.columnconfigure(1, weight=1)
+
+        self.month_canvas = tk.Canvas(charts, bg=Colors.PANEL, height=190, highlightthickness=1, highlightbackground=Colors.GRID)
+        self.month_canvas.grid(row=0, column=0, sticky="ew", padx=(0, 8))
+
+        self.category_canvas = tk.Canvas(charts, bg=Colors.PANEL, height=190, highlightthickness=1, highlightbackground=Colors.GRID)
+        self.category_canvas.grid(row=0, column=1, sticky="ew", padx=(8, 0))
+
+        self.month_items = CanvasItemPool(self.month_canvas)
+        self.category_items = CanvasItemPool(self.category_canvas)
+        self.month_canvas.bind("<Configure>", self._schedule_chart_redraw)
+        self.category_canvas.bind("<Configure>", self._schedule_chart_redraw)
+
+    def _schedule_chart_redraw(self, _event=None) -> None:
+        # A window drag fires <Configure> per pixel; draw once the size settles.
+        if self._chart_after_id is not None:
+            self.root.after_cancel(self._chart_after_id)
+        self._chart_after_id = self.root.after(CHART_REDRAW_DEBOUNCE_MS, self._redraw_charts)
+
+    def _redraw_charts(self) -> None:
+        self._chart_after_id = None
+        self.draw_month_chart()
+        self.draw_category_chart()
+
+    def _chart_aggregates(self) -> tuple:
+        if self._chart_cache[0] != self.summary.version:
+            by_month = self.summary.month_totals("expense")
+            months = [(month, by_month[month]) for month in sorted(by_month)[-6:]]
+            by_category = self.summary.category_totals("expense")
+            top_categories = sorted(by_category.items(), key=lambda item: item[1], reverse=True)[:5]
+            self._chart_cache = (self.summary.version, months, top_categories)
+        return self._chart_cache
+
+    def _bind_live_filters(self) -> None:
+        self.search_var.trace_add("write", self._schedule_filter_refresh)
+        self.filter_type_var.trace_add("write", self._schedule_filter_refresh)
+        self.filter_category_var.trace_add("write", self._schedule_filter_refresh)
+        self.type_var.trace_add("write", self._on_entry_type_changed)
+
+    def _set_save_status(self, text: str) -> None:
+        self.save_status_var.set(text)
+
+    def _on_close(self) -> None:
+        try:
+            self.saver.close()
+        except OSError as exc:
+            if not messagebox.askyesno("Save Failed", f"Could not save your latest changes: {exc}\n\nClose anyway?"):
+                return
+        self.root.destroy()
+
+    def _on_entry_type_changed(self, *_args) -> None:
+        self._refresh_category_options()
+
+    def _schedule_filter_refresh(self, *_args) -> None:
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(200, self._apply_filters)
+
+    def _apply_filters(self) -> None:
+        self._filter_after_id = None
+        self.table.reset_scroll()
+        self.refresh_ui("Filters updated.")
+
+    def _on_tree_select(self, _event=None) -> None:
+        count = len(self.tree.selection())
+        if count == 0:
+            return
+        entry_word = "entry" if count == 1 else "entries"
+        self.status_var.set(f"{count} {entry_word} selected.")
+
+    def _show_welcome_if_needed(self) -> None:
+        if self.data.get("transactions"):
+            return
+        messagebox.showinfo(
+            "Welcome to BudgetBeacon",
+            "Start with 2 steps:\n\n1) Set your monthly budget goal\n2) Add each expense or income as it happens\n\nUse 'How To Use' any time for a quick guide.",
+        )
+
+    def show_help(self) -> None:
+        messagebox.showinfo(
+            "How To Use (Simple Steps)",
+            "Take your time. Follow these steps:\n\n"
+            "1) Set your monthly budget first.\n"
+            "   On the left side, type your budget in 'Monthly Budget Goal'\n"
+            "   then click 'Save Budget Goal'.\n\n"
+            "2) Add money you receive (income).\n"
+            "   Choose 'income', pick a category, type the amount,\n"
+            "   then click 'Save Entry'.\n\n"
+            "3) Add money you spend (expense).\n"
+            "   Choose 'expense', pick a category, type the amount,\n"
+            "   then click 'Save Entry'.\n\n"
+            "4) Check your totals at the top.\n"
+            "   - Income: money in\n"
+            "   - Expenses: money out\n"
+            "   - Budget Left: what you still have this month\n\n"
+            "5) To remove a mistake:\n"
+            "   Click the entry once in the table, then click\n"
+            "   'Delete Selected Entry'.\n\n"
+            "6) To find old entries:\n"
+            "   Use the search box or the filter boxes above the table.\n\n"
+            "7) To save a backup copy:\n"
+            "   Click 'Export to CSV'.\n\n"
+            "If something looks wrong, do not worry.\n"
+            "You can always add, edit by deleting/re-adding, or import/export again.",
+        )
+
+    def _transaction_by_id(self, tx_id: int) -> dict:
+        return self.data["transactions"][self.positions[tx_id]]
+
+    def visible_transactions(self) -> Sequence[dict]:
+        term = self.search_var.get().strip().lower()
+        type_filter = self.filter_type_var.get().strip().lower()
+        category_filter = self.filter_category_var.get().strip().lower()
+
+        return self.index.search(type_filter, category_filter, term, self.sort_column, self.sort_reverse)
+
+    def sort_by(self, column: str) -> None:
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = column in {"id", "amount", "date"}
+        self.table.reset_scroll()
+        self.refresh_ui(f"Sorted by {column}.")
+
+    def refresh_ui(self, status_text: str = "Ready") -> None:
+        self._refresh_category_options()
+
+        visible = self.visible_transactions()
+        self.table.set_rows(visible)
+
+        if visible:
+            self.empty_state_label.grid_forget()
+        else:
+            if self.data.get("transactions"):
+                self.empty_state_label.configure(text="No results match your current filters.")
+            else:
+                self.empty_state_label.configure(text="No entries yet. Start by adding your first income or expense on the left.")
+            self.empty_state_label.grid(row=2, column=0, sticky="w", pady=(8, 0))
+
+        summary = self.summary.summary()
+        self.income_var.set(format_currency(summary["income"]))
+        self.expense_var.set(format_currency(summary["expense"]))
+        self.balance_var.set(format_currency(summary["balance"]))
+        self.budget_total_var.set(format_currency(summary["budget"]))
+        self.remaining_var.set(format_currency(summary["remaining"]))
+        self.budget_var.set(f"{summary['budget']:.2f}")
+
+        self.status_var.set(status_text)
+        self.draw_month_chart()
+        self.draw_category_chart()
+
+    def _refresh_category_options(self) -> None:
+        categories = sorted(self.summary.categories())
+
+        selected_type = self.type_var.get().strip().lower()
+        typed_categories = sorted(self.summary.categories(selected_type)) if selected_type in {"income", "expense"} else []
+        category_choices = sorted(set(typical_categories_for(selected_type) + typed_categories + categories))
+        self.category_entry["values"] = category_choices
+        if category_choices and self.category_var.get() not in category_choices:
+            self.category_var.set(category_choices[0])
+
+        filter_values = ["all", *categories]
+        self.category_filter_combo["values"] = filter_values
+        if self.filter_category_var.get() not in filter_values:
+            self.filter_category_var.set("all")
+
+    def add_transaction(self) -> None:
+        kind = self.type_var.get().strip().lower()
+        category = normalize_category_name(kind, self.category_var.get())
+        amount_raw = self.amount_var.get().strip().replace("$", "")
+        note = self.note_var.get().strip()
+
+        if kind not in {"income", "expense"}:
+            messagebox.showerror("Invalid Type", "Choose either income or expense.")
+            return
+
+        if not category:
+            messagebox.showerror("Missing Category", "Please choose or type a category.")
+            return
+
+        try:
+            amount = parse_amount(amount_raw)
+        except ValueError:
+            messagebox.showerror("Invalid Amount", "Please enter a valid amount, like 24.99")
+            return
+
+        tx = Transaction(0, kind, category, amount, note, local_now_iso())
+        append_transaction(self.data, self.positions, tx)
+        self.index.add(tx)
+        self.summary.add(tx)
+        self.saver.record({"op": "add", "tx": tx})
+
+        self.clear_form()
+        self.refresh_ui("Entry saved.")
+
+    def clear_form(self) -> None:
+        categories = typical_categories_for(self.type_var.get().strip().lower())
+        self.category_var.set(categories[0] if categories else "")
+        self.amount_var.set("")
+        self.note_var.set("")
+        self.status_var.set("Form cleared.")
+
+    def delete_selected(self) -> None:
+        selected = self.tree.selection()
+        if not selected:
+            focused = self.tree.focus()
+            if focused:
+                selected = (focused,)
+        if not selected:
+            messagebox.showwarning("No Selection", "Select an entry first, then click Delete.")
+            return
+
+        ids_to_delete = set()
+        for row_id in selected:
+            row_values = self.tree.item(row_id, "values")
+            if row_values:
+                tx_id = _safe_int(row_values[0], 0)
+                if tx_id > 0:
+                    ids_to_delete.add(tx_id)
+
+        if not ids_to_delete:
+            messagebox.showwarning("No Selection", "Select a valid entry to delete.")
+            return
+
+        entry_word = "entry" if len(ids_to_delete) == 1 else "entries"
+        if not messagebox.askyesno(
+            "Confirm Delete",
+            f"Delete {len(ids_to_delete)} {entry_word}? This cannot be undone.",
+        ):
+            return
+
+        for tx in remove_transactions(self.data, self.positions, ids_to_delete):
+            self.index.remove(tx)
+            self.summary.remove(tx)
+        self.saver.record({"op": "delete", "ids": sorted(ids_to_delete)})
+        self.refresh_ui(f"Deleted {len(ids_to_delete)} {entry_word}.")
+
+    def set_budget(self) -> None:
+        raw = self.budget_var.get().strip().replace("$", "")
+        try:
+            self.data["monthly_budget"] = parse_amount(raw)
+        except ValueError:
+            messagebox.showerror("Invalid Budget", "Please enter a valid number for budget goal.")
+            return
+
+        self.saver.record({"op": "budget", "value": self.data["monthly_budget"]})
+        self.refresh_ui("Budget goal saved.")
+
+    def reset_filters(self) -> None:
+        self.search_var.set("")
+        self.filter_type_var.set("all")
+        self.filter_category_var.set("all")
+        self.table.reset_scroll()
+        self.refresh_ui("Filters reset.")
+
+    def export_csv(self) -> None:
+        if not self.data.get("transactions"):
+            messagebox.showinfo("Nothing to Export", "There are no entries to export yet.")
+            return
+
+        path = filedialog.asksaveasfilename(
+            title="Export Entries",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            initialfile="budgetbeacon_entries.csv",
+        )
+        if not path:
+            return
+
+        try:
+            export_transactions_csv(path, self.data["transactions"])
+        except OSError as exc:
+            messagebox.showerror("Export Failed", f"Could not export CSV.\n{exc}")
+            return
+
+        messagebox.showinfo("Export Complete", f"Entries exported to:\n{path}")
+        self.refresh_ui(f"Exported CSV: {Path(path).name}")
+
+    def import_csv(self) -> None:
+        if self._import is not None:
+            messagebox.showinfo("Import Running", "An import is already in progress.")
+            return
+
+        path = filedialog.askopenfilename(
+            title="Import Entries",
+            filetypes=[("CSV files", "*.csv")],
+        )
+        if not path:
+            return
+
+        if not messagebox.askyesno(
+            "Confirm Import",
+            "Import entries from this CSV file?\n\nExisting entries will stay and imported entries will be added.",
+        ):
+            return
+
+        existing = self.data["transactions"]
+        # Copying a .ledger's rows here would decode every one on the Tk thread; the worker reads its own mapping.
+        existing = existing.snapshot() if isinstance(existing, LedgerRows) else list(existing)
+        job = CsvImport(path, existing)
+        self._import = job
+        self._show_import_dialog(job)
+        job.start()
+        self.root.after(CSV_IMPORT_POLL_MS, self._poll_import)
+
+    def _show_import_dialog(self, job: CsvImport) -> None:
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importing CSV")
+        dialog.configure(bg=Colors.BG)
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+        frame = ttk.Frame(dialog, padding=16)
+        frame.pack(fill="both", expand=True)
+        self.import_label_var = tk.StringVar(value=f"Reading {job.path.name}...")
+        ttk.Label(frame, textvariable=self.import_label_var).pack(anchor="w")
+        self.import_progress = ttk.Progressbar(frame, maximum=100, length=320, mode="determinate")
+        self.import_progress.pack(fill="x", pady=(8, 10))
+        self.import_cancel_button = ttk.Button(frame, text="Cancel Import", command=job.cancel)
+        self.import_cancel_button.pack(anchor="e")
+        dialog.protocol("WM_DELETE_WINDOW", job.cancel)
+        try:
+            dialog.grab_set()
+        except tk.TclError:  # some window managers refuse a grab before the dialog is mapped
+            pass
+        self._import_dialog = dialog
+
+    def _close_import_dialog(self) -> None:
+        if self._import_dialog is not None:
+            self._import_dialog.grab_release()
+            self._import_dialog.destroy()
+            self._import_dialog = None
+        self._import = None
+
+    def _poll_import(self) -> None:
+        job = self._import
+        if job is None:
+            return
+        if not job.finished.is_set():
+            percent = job.progress() * 100
+            self.import_progress["value"] = percent
+            self.import_label_var.set(f"Reading {job.path.name}... {percent:.0f}%")
+            self.root.after(CSV_IMPORT_POLL_MS, self._poll_import)
+            return
+
+        if job.error is not None:
+            self._close_import_dialog()
+            messagebox.showerror("Import Failed", f"Could not import CSV.\n{job.error}")
+            self.status_var.set("Import failed. No entries were added.")
+            return
+        if job.cancelled:
+            self._close_import_dialog()
+            self.status_var.set("Import cancelled. No entries were added.")
+            return
+        if not job.rows:
+            self._close_import_dialog()
+            messagebox.showwarning(
+                "No Rows Imported",
+                f"No new rows were found in this CSV file.\n\n"
+                f"Duplicates skipped: {job.duplicates}\nInvalid rows skipped: {job.invalid}",
+            )
+            self.status_var.set("No new entries imported.")
+            return
+
+        self.import_cancel_button.state(["disabled"])
+        self._apply_import(job, 0)
+
+    def _apply_import(self, job: CsvImport, start: int) -> None:
+        # Index and summary updates run on the Tk thread, so feed them in slices to keep the window painting.
+        end = min(start + CSV_IMPORT_CHUNK_ROWS, len(job.rows))
+        for tx in job.rows[start:end]:
+            append_transaction(self.data, self.positions, tx)
+            self.index.add(tx)
+            self.summary.add(tx)
+        if end < len(job.rows):
+            self.import_progress["value"] = end * 100 / len(job.rows)
+            self.import_label_var.set(f"Adding entries... {end:,} of {len(job.rows):,}")
+            self.root.after(1, lambda: self._apply_import(job, end))
+            return
+
+        imported = len(job.rows)
+        self.saver.record({"op": "import", "transactions": job.rows})
+        self._close_import_dialog()
+        messagebox.showinfo(
+            "Import Complete",
+            f"Imported {imported} entries.\n\nDuplicates skipped: {job.duplicates}\nInvalid rows skipped: {job.invalid}",
+        )
+        self.refresh_ui(f"Imported {imported} entries.")
+
+    def draw_month_chart(self) -> None:
+        canvas = self.month_canvas
+        items = self.month_items
+        items.begin()
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width < 220 or height < 140:
+            items.finish()
+            return
+
+        _version, months, _top_categories = self._chart_aggregates()
+        items.draw("title", "text", (12, 14), text="Monthly Expense Trend", anchor="w", fill=Colors.TEXT, font=("Segoe UI", 10, "bold"))
+
+        if not months:
+            items.draw("empty", "text", (width / 2, height / 2), text="No expense data yet", fill=Colors.MUTED, font=("Segoe UI", 11))
+            items.finish()
+            return
+
+        max_value = max(value for _, value in months) or 1.0
+        left, top, right, bottom = 36, 30, width - 14, height - 28
+        usable_width = right - left
+        bar_space = usable_width / len(months)
+        bar_w = max(12, min(42, int(bar_space * 0.58)))
+
+        items.draw("y-axis", "line", (left, top, left, bottom), fill=Colors.GRID)
+        items.draw("x-axis", "line", (left, bottom, right, bottom), fill=Colors.GRID)
+
+        for idx, (month, value) in enumerate(months):
+            x_center = left + (idx + 0.5) * bar_space
+            bar_height = ((bottom - top) * value) / max_value
+            x1 = x_center - bar_w / 2
+            y1 = bottom - bar_height
+            x2 = x_center + bar_w / 2
+            y2 = bottom
+            items.draw(("bar", idx), "rectangle", (x1, y1, x2, y2), fill=Colors.ACCENT, outline="")
+            items.draw(("label", idx), "text", (x_center, bottom + 12), text=month[2:], fill=Colors.MUTED, font=("Segoe UI", 8))
+        items.finish()
+
+    def draw_category_chart(self) -> None:
+        canvas = self.category_canvas
+        items = self.category_items
+        items.begin()
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width < 240 or height < 140:
+            items.finish()
+            return
+
+        _version, _months, top_categories = self._chart_aggregates()
+        items.draw("title", "text", (12, 14), text="Top Expense Categories", anchor="w", fill=Colors.TEXT, font=("Segoe UI", 10, "bold"))
+
+        if not top_categories:
+            items.draw("empty", "text", (width / 2, height / 2), text="No category data yet", fill=Colors.MUTED, font=("Segoe UI", 11))
+            items.finish()
+            return
+
+        max_value = max(value for _, value in top_categories) or 1.0
+        y = 36
+        for idx, (category, value) in enumerate(top_categories):
+            label = category if len(category) <= 18 else f"{category[:16]}.."
+            bar_left = 110
+            bar_right = width - 16
+            bar_width = bar_right - bar_left
+            fill_width = (value / max_value) * bar_width
+
+            items.draw(("label", idx), "text", (12, y + 8), text=label, anchor="w", fill=Colors.TEXT, font=("Segoe UI", 9))
+            items.draw(("track", idx), "rectangle", (bar_left, y, bar_right, y + 16), fill=Colors.ACCENT_SOFT, outline="")
+            items.draw(("fill", idx), "rectangle", (bar_left, y, bar_left + fill_width, y + 16), fill=Colors.BEACON, outline="")
+            items.draw(("value", idx), "text", (bar_right, y + 8), text=format_currency(value), anchor="e", fill=Colors.MUTED, font=("Segoe UI", 8, "bold"))
+            y += 28
+        items.finish()
+
+
+def main(data_file: Optional[Path] = None) -> None:
+    if data_file is not None:
+        budget_app.use_data_file(data_file)
+    root = tk.Tk()
+    BudgetAppGUI(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Binary desktop ledger: fixed-width columns plus an interned string table, memory-mapped and decoded per row.
+
+Layout (little-endian): a header, then one column per field with 8-byte alignment, then the string table as
+`strings + 1` uint64 offsets into a UTF-8 blob. String 0 is always "", which also marks "no meta" in the meta column.
+The months column holds each row's safe_month_key, so monthly buckets group on a few distinct strings, not every date.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableSequence
+from itertools import compress
+from pathlib import Path
+from typing import Iterator, Optional
+
+from budget_core import Transaction, normalize_entry_type, safe_month_key, to_cents, transaction_cents
+
+LEDGER_SUFFIX = ".ledger"
+LEDGER_MAGIC = b"BBLEDGER"
+LEDGER_VERSION = 2
+# magic, version, reserved, rows, next_id, journal_seq, budget cents, strings
+LEDGER_HEADER = struct.Struct("<8sIIqqqqq")
+# Type codes double as compress() selectors: summing cents where the code is 1 gives the expense total.
+LEDGER_TYPES = ("income", "expense")
+LEDGER_COLUMNS = (
+    ("ids", "q"),
+    ("cents", "q"),
+    ("types", "B"),
+    ("categories", "I"),
+    ("notes", "I"),
+    ("dates", "I"),
+    ("months", "I"),
+    ("metas", "I"),
+)
+
+
+class LedgerError(ValueError):
+    pass
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def write_ledger(path, data: dict) -> None:
+    if sys.byteorder != "little":
+        raise LedgerError("The binary ledger format is little-endian only.")
+    strings = {"": 0}
+    columns = {name: array(code) for name, code in LEDGER_COLUMNS}
+    for tx in data.get("transactions", []):
+        tx_type = normalize_entry_type(tx.get("type"))
+        if not tx_type:
+            raise LedgerError(f"Transaction {tx.get('id')} has an unknown type: {tx.get('type')!r}.")
+        meta = tx.get("meta")
+        columns["ids"].append(int(tx["id"]))
+        columns["cents"].append(transaction_cents(tx))
+        columns["types"].append(LEDGER_TYPES.index(tx_type))
+        columns["categories"].append(strings.setdefault(str(tx.get("category", "")), len(strings)))
+        columns["notes"].append(strings.setdefault(str(tx.get("note", "")), len(strings)))
+        columns["dates"].append(strings.setdefault(str(tx.get("createdAt", "")), len(strings)))
+        columns["months"].append(strings.setdefault(safe_month_key(tx.get("createdAt", "")), len(strings)))
+        columns["metas"].append(strings.setdefault(json.dumps(meta), len(strings)) if meta else 0)
+
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for text in strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+
+    header = LEDGER_HEADER.pack(
+        LEDGER_MAGIC,
+        LEDGER_VERSION,
+        0,
+        len(columns["ids"]),
+        int(data.get("next_id", 1)),
+        int(data.get("journal_seq", 0)),
+        to_cents(float(data.get("monthly_budget", 0.0))),
+        len(strings),
+    )
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with temp_path.open("wb") as file:
+        file.write(header)
+        for column in (*columns.values(), offsets):
+            raw = column.tobytes()
+            file.write(raw)
+            file.write(bytes(_padded(len(raw)) - len(raw)))
+        file.write(blob)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class Ledger:
+    """A read-only mapping of one ledger file; columns are memoryviews, strings decode on first use."""
+
+    def __init__(self, path) -> None:
+        if sys.byteorder != "little":
+            raise LedgerError("The binary ledger format is little-endian only.")
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._views: list[memoryview] = []
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise LedgerError(f"{self.path} is empty.") from None
+        try:
+            self._open()
+        except (LedgerError, struct.error, TypeError):
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        if len(self._map) < LEDGER_HEADER.size:
+            raise LedgerError(f"{self.path} is truncated.")
+        magic, version, _reserved, rows, next_id, journal_seq, budget_cents, strings = LEDGER_HEADER.unpack_from(self._map)
+        if magic != LEDGER_MAGIC or version != LEDGER_VERSION:
+            raise LedgerError(f"{self.path} is not a version {LEDGER_VERSION} ledger.")
+        self.rows = rows
+        self.next_id = next_id
+        self.journal_seq = journal_seq
+        self.budget_cents = budget_cents
+        self.strings = strings
+        offset = LEDGER_HEADER.size
+        for name, code in (*LEDGER_COLUMNS, ("offsets", "Q")):
+            size = array(code).itemsize * (strings + 1 if name == "offsets" else rows)
+            if offset + size > len(self._map):
+                raise LedgerError(f"{self.path} is truncated.")
+            setattr(self, name, self._column(offset, size, code))
+            offset += _padded(size)
+        self._blob = offset
+        if self._blob + self.offsets[-1] > len(self._map):
+            raise LedgerError(f"{self.path} is truncated.")
+        self._decoded: dict[int, str] = {}
+
+    def _column(self, offset: int, size: int, code: str) -> memoryview:
+        # Every view is kept so close() can release them; mmap refuses to close while any is alive.
+        raw = memoryview(self._map)[offset : offset + size]
+        column = raw.cast(code)
+        self._views += [column, raw]
+        return column
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def string(self, index: int, cache: bool = True) -> str:
+        text = self._decoded.get(index)
+        if text is None:
+            start = self._blob + self.offsets[index]
+            text = str(self._map[start : self._blob + self.offsets[index + 1]], "utf-8")
+            if cache:
+                self._decoded[index] = text
+        return text
+
+    def row(self, position: int) -> Transaction:
+        meta = self.metas[position]
+        return Transaction.from_cents(
+            self.ids[position],
+            LEDGER_TYPES[self.types[position]],
+            self.string(self.categories[position]),
+            self.cents[position],
+            self.string(self.notes[position]),
+            self.string(self.dates[position]),
+            json.loads(self.string(meta)) if meta else None,
+        )
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._decoded = {}
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+
+class LedgerRows(MutableSequence):
+    """The ledger's rows as a list: rows decode on first access, edits stay in memory until the next save."""
+
+    def __init__(self, ledger: Ledger) -> None:
+        self.ledger: Optional[Ledger] = ledger
+        self._length = len(ledger)
+        # Rows held in memory, keyed by slot. Slots below len(ledger) are file positions; higher ones are new rows.
+        self._rows: dict[int, Transaction] = {}
+        # File positions whose row was deleted, so their column values no longer count.
+        self._removed: set[int] = set()
+        # Slot per list position, built on the first delete or insert away from the end; None means slot == position.
+        self._order: Optional[array] = None
+        self._next_slot = len(ledger)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _slot(self, position: int) -> int:
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("ledger row index out of range")
+        return self._order[position] if self._order is not None else position
+
+    def _ordered(self) -> array:
+        if self._order is None:
+            self._order = array("q", range(self._length))
+            self._next_slot = max(self._next_slot, self._length)
+        return self._order
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(self._length))]
+        slot = self._slot(position)
+        row = self._rows.get(slot)
+        if row is None:
+            row = self._rows[slot] = self.ledger.row(slot)
+        return row
+
+    def __setitem__(self, position, tx) -> None:
+        if isinstance(position, slice):
+            raise TypeError("ledger rows do not support slice assignment")
+        self._rows[self._slot(position)] = tx
+
+    def __delitem__(self, position) -> None:
+        if isinstance(position, slice):
+            raise TypeError("ledger rows do not support slice deletion")
+        slot = self._slot(position)
+        if self._order is not None or slot != self._length - 1:
+            # Only the slot map shifts; no row after the deleted one is decoded.
+            del self._ordered()[position]
+        self._rows.pop(slot, None)
+        if self.ledger is not None and slot < len(self.ledger):
+            self._removed.add(slot)
+        self._length -= 1
+
+    def insert(self, position: int, tx) -> None:
+        position = max(0, min(self._length + position if position < 0 else position, self._length))
+        if self._order is None and position == self._length:
+            # Appending keeps slot == position, reusing a file position freed by deleting the last row.
+            slot = position
+            self._removed.discard(slot)
+        else:
+            slot = self._next_slot
+            self._next_slot += 1
+            self._ordered().insert(position, slot)
+        self._rows[slot] = tx
+        self._length += 1
+
+    def _mapped(self) -> int:
+        return len(self.ledger) if self.ledger is not None else 0
+
+    def _replaced(self) -> Iterator[int]:
+        # File positions whose column values are stale: overwritten in memory or deleted.
+        mapped = self._mapped()
+        yield from (slot for slot in self._rows if slot < mapped)
+        yield from self._removed
+
+    def untouched_positions(self) -> Iterator[int]:
+        """File positions whose row is still only in the file; everything else is in overlay_rows()."""
+        return (
+            position
+            for position in range(self._mapped())
+            if position not in self._rows and position not in self._removed
+        )
+
+    def ids(self) -> Iterator[int]:
+        for position in range(self._length):
+            slot = self._order[position] if self._order is not None else position
+            row = self._rows.get(slot)
+            yield row["id"] if row is not None else self.ledger.ids[slot]
+
+    def type_cents(self) -> dict[str, int]:
+        """Income and expense totals in cents, summed over the columns without decoding rows."""
+        mapped = self._mapped()
+        totals = {"income": 0, "expense": 0}
+        if mapped:
+            cents = self.ledger.cents[:mapped]
+            types = self.ledger.types[:mapped]
+            totals["expense"] = sum(compress(cents, types))
+            totals["income"] = sum(cents) - totals["expense"]
+        for position in self._replaced():
+            totals[LEDGER_TYPES[self.ledger.types[position]]] -= self.ledger.cents[position]
+        for tx in self._rows.values():
+            tx_type = normalize_entry_type(tx.get("type"))
+            if tx_type:
+                totals[tx_type] += transaction_cents(tx)
+        return totals
+
+    def column_groups(self) -> dict[tuple[str, str, str], list[int]]:
+        """[cents, count] per (type, category, month) for rows still read from the file; see overlay_rows()."""
+        mapped = self._mapped()
+        groups: dict[tuple[int, int, int], list[int]] = {}
+        if mapped:
+            ledger = self.ledger
+            keys = zip(ledger.types[:mapped], ledger.categories[:mapped], ledger.months[:mapped])
+            for key, cents in zip(keys, ledger.cents[:mapped]):
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [cents, 1]
+                else:
+                    group[0] += cents
+                    group[1] += 1
+            for position in self._replaced():
+                group = groups[(ledger.types[position], ledger.categories[position], ledger.months[position])]
+                group[0] -= ledger.cents[position]
+                group[1] -= 1
+        return {
+            (LEDGER_TYPES[tx_type], self.ledger.string(category), self.ledger.string(month)): group
+            for (tx_type, category, month), group in groups.items()
+            if group[1]
+        }
+
+    def overlay_rows(self) -> list[Transaction]:
+        """Rows held in memory: decoded, replaced or appended since the file was opened."""
+        return list(self._rows.values())
+
+    def snapshot(self) -> "LedgerRows":
+        """A copy over its own mapping of the same file, so another thread can read it while this one changes."""
+        copy = LedgerRows(Ledger(self.ledger.path))
+        copy._length = self._length
+        copy._rows = dict(self._rows)
+        copy._removed = set(self._removed)
+        copy._order = array("q", self._order) if self._order is not None else None
+        copy._next_slot = self._next_slot
+        return copy
+
+    def materialize(self) -> list[Transaction]:
+        """Decode every row into a plain list and unmap the file, which may then be replaced (Windows needs this)."""
+        rows = [self[position] for position in range(self._length)]
+        if self.ledger is not None:
+            self.ledger.close()
+            self.ledger = None
+        return rows
+
+
+def open_ledger(path) -> dict:
+    ledger = Ledger(path)
+    return {
+        "monthly_budget": ledger.budget_cents / 100,
+        "transactions": LedgerRows(ledger),
+        "journal_seq": ledger.journal_seq,
+        "next_id": ledger.next_id,
+    }
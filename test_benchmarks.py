@@ -0,0 +1,70 @@
+"""
+Unit tests for benchmarks.py
+Tests for the seeded data generators and the baseline comparison
+"""
+import json
+import pytest
+from unittest.mock import patch
+import budget_app
+import benchmarks
+from budget_core import sanitize_transaction
+
+
+class TestGenerators:
+    """Tests for the synthetic ledger generators"""
+    
+    def test_same_seed_gives_same_ledger(self):
+        assert benchmarks.generate_entries(300, seed=5) == benchmarks.generate_entries(300, seed=5)
+        assert benchmarks.generate_entries(300, seed=5) != benchmarks.generate_entries(300, seed=6)
+    
+    def test_entries_are_valid_and_realistic(self):
+        entries = benchmarks.generate_entries(2000)
+        assert all(sanitize_transaction(entry, entry["id"]) == entry for entry in entries)
+        expenses = [entry for entry in entries if entry["type"] == "expense"]
+        assert len(expenses) > len(entries) * 0.8
+        assert sum(entry["category"] == "Groceries" for entry in expenses) > len(expenses) * 0.15
+        assert len({entry["createdAt"][:7] for entry in entries}) > 3
+    
+    def test_ledger_summary_matches_entries(self):
+        data = benchmarks.generate_ledger(500)
+        income = sum(entry["amount"] for entry in benchmarks.generate_entries(500) if entry["type"] == "income")
+        assert data["next_id"] == 501
+        assert budget_app.calculate_summary(data)["income"] == pytest.approx(income)
+
+
+class TestRunBenchmarks:
+    """Tests for the report and its comparison against a baseline"""
+    
+    def test_report_covers_every_hot_path(self):
+        data_file = budget_app.DATA_FILE
+        report = benchmarks.run_benchmarks(sizes=[50], repeat=1, only={"load_data", "sorted_transactions"})
+        assert budget_app.DATA_FILE == data_file
+        assert [(row["name"], row["size"]) for row in report["results"]] == [("load_data", 50), ("sorted_transactions", 50)]
+        assert json.loads(json.dumps(report))["meta"]["sizes"] == [50]
+    
+    def test_regressions_past_threshold_are_flagged(self):
+        baseline = {"results": [{"name": "save_data", "size": 10, "best": 1.0},
+                                {"name": "load_data", "size": 10, "best": 1.0}]}
+        report = {"results": [{"name": "save_data", "size": 10, "best": 1.5},
+                              {"name": "load_data", "size": 10, "best": 1.1},
+                              {"name": "sanitize_entry", "size": 10, "best": 9.0}]}
+        rows = benchmarks.compare_to_baseline(report, baseline, threshold=0.25)
+        assert [(row["name"], row["regressed"]) for row in rows] == [("save_data", True), ("load_data", False)]
+    
+    def test_cli_writes_report_and_exits_on_regression(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        args = ["--sizes", "20", "--repeat", "1", "--only", "calculate_summary"]
+        assert benchmarks.main([*args, "--save-baseline", str(baseline)]) == 0
+        report = json.loads(baseline.read_text(encoding="utf-8"))
+        report["results"][0]["best"] /= 1000
+        baseline.write_text(json.dumps(report), encoding="utf-8")
+        assert benchmarks.main([*args, "--baseline", str(baseline)]) == 1
+    
+    def test_only_skips_password_hashing(self):
+        with patch("benchmarks.create_password_record", side_effect=AssertionError("hashed")):
+            report = benchmarks.run_benchmarks(sizes=[20], repeat=1, only={"calculate_summary"})
+        assert [row["name"] for row in report["results"]] == ["calculate_summary"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,7 +3,11 @@ Unit tests for budget_app.py
 Tests for data loading, parsing, validation, and calculations
 """
 import json
+import subprocess
+import sys
+import time
 import pytest
+import budget_app
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from budget_app import (
@@ -16,6 +20,21 @@ from budget_app import (
     format_currency,
     _amount_or_zero,
     _sanitize_transaction,
+    append_journal,
+    apply_journal_record,
+    compact_journal,
+    record_change,
+    remove_transactions,
+    transaction_positions,
+    append_transaction,
+    save_data,
+    SaveScheduler,
+    TransactionTable,
+    TransactionIndex,
+    RunningSummary,
+    CanvasItemPool,
+    CsvImport,
+    parse_csv_row,
     EXPENSE_CATEGORIES,
     INCOME_CATEGORIES,
 )
@@ -61,6 +80,11 @@ class TestParseAmount:
     def test_invalid_non_numeric(self):
         with pytest.raises(ValueError):
             parse_amount("abc")
+    
+    def test_invalid_oversized_amount(self):
+        assert parse_amount(90071992547409.91) == 90071992547409.91
+        with pytest.raises(ValueError):
+            parse_amount(1e20)
 
 
 class TestAmountOrZero:
@@ -291,5 +315,703 @@ class TestLoadData:
             assert len(data["transactions"]) == 1
 
 
+
+@pytest.fixture
+def data_files(tmp_path, monkeypatch):
+    data_file = tmp_path / "budget_data.json"
+    journal_file = tmp_path / "budget_data.journal"
+    monkeypatch.setattr("budget_app.DATA_FILE", data_file)
+    monkeypatch.setattr("budget_app.JOURNAL_FILE", journal_file)
+    return data_file, journal_file
+
+
+def journal_tx(tx_id, amount):
+    return {"id": tx_id, "type": "expense", "category": "Dining", "amount": amount,
+            "note": "", "createdAt": "2026-02-01T12:00:00"}
+
+
+def change(data, record):
+    apply_journal_record(data, record)
+    record_change(data, record)
+
+
+class TestJournal:
+    """Tests for the append-only journal behind load_data"""
+    
+    def test_replay_add_delete_and_budget(self, data_files):
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(1, 10.0)})
+        change(data, {"op": "add", "tx": journal_tx(2, 20.0)})
+        change(data, {"op": "delete", "ids": [1]})
+        change(data, {"op": "budget", "value": 500})
+        loaded = load_data()
+        assert loaded["monthly_budget"] == 500.0
+        assert [(tx["id"], tx["amount"]) for tx in loaded["transactions"]] == [(2, 20.0)]
+        assert loaded["journal_seq"] == 4
+    
+    def test_import_record_assigns_ids_to_new_rows(self, data_files):
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(1, 10.0)})
+        change(data, {"op": "import", "transactions": [journal_tx(0, 5.0), journal_tx(0, 6.0)]})
+        assert [tx["id"] for tx in load_data()["transactions"]] == [1, 2, 3]
+    
+    def test_deleted_ids_are_not_reused(self, data_files):
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(0, 10.0)})
+        change(data, {"op": "add", "tx": journal_tx(0, 20.0)})
+        change(data, {"op": "delete", "ids": [2]})
+        compact_journal(data)
+        data = load_data()
+        assert data["next_id"] == 3
+        change(data, {"op": "add", "tx": journal_tx(0, 30.0)})
+        assert sorted(tx["id"] for tx in load_data()["transactions"]) == [1, 3]
+    
+    def test_load_reassigns_missing_and_duplicate_ids(self, data_files):
+        data_file, _journal_file = data_files
+        data_file.write_text(json.dumps({"monthly_budget": 0, "transactions": [
+            journal_tx(4, 1.0), journal_tx(4, 2.0), journal_tx(0, 3.0), journal_tx(2, 4.0)
+        ]}), encoding="utf-8")
+        ids = [tx["id"] for tx in load_data()["transactions"]]
+        assert ids[0] == 4 and ids[3] == 2
+        assert sorted(ids) == [2, 4, 5, 6]
+    
+    def test_torn_trailing_line_is_discarded(self, data_files):
+        _data_file, journal_file = data_files
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(1, 10.0)})
+        with journal_file.open("a", encoding="utf-8") as file:
+            file.write('{"op":"add","tx":{"type":"exp')
+        assert len(load_data()["transactions"]) == 1
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(2, 20.0)})
+        assert len(load_data()["transactions"]) == 2
+    
+    def test_compaction_writes_snapshot_and_empties_journal(self, data_files):
+        data_file, journal_file = data_files
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(1, 10.0)})
+        compact_journal(data)
+        assert journal_file.read_text(encoding="utf-8") == ""
+        assert json.loads(data_file.read_text(encoding="utf-8"))["journal_seq"] == 1
+        assert len(load_data()["transactions"]) == 1
+    
+    def test_crash_between_snapshot_and_truncate_does_not_duplicate(self, data_files):
+        data_file, journal_file = data_files
+        data = load_data()
+        record = {"op": "add", "tx": journal_tx(1, 10.0)}
+        apply_journal_record(data, record)
+        append_journal(data, record)
+        leftover = journal_file.read_bytes()
+        compact_journal(data)
+        journal_file.write_bytes(leftover)
+        assert len(load_data()["transactions"]) == 1
+    
+    def test_journal_compacts_when_it_outgrows_snapshot(self, data_files, monkeypatch):
+        data_file, journal_file = data_files
+        monkeypatch.setattr("budget_app.JOURNAL_COMPACT_MIN_BYTES", 512)
+        data = load_data()
+        for index in range(1, 20):
+            change(data, {"op": "add", "tx": journal_tx(index, float(index))})
+        assert data_file.exists()
+        assert journal_file.stat().st_size <= max(512, data_file.stat().st_size)
+        assert len(load_data()["transactions"]) == 19
+
+
+class TestSnapshot:
+    """Tests for the checksummed snapshot fast path"""
+    
+    def saved_ledger(self):
+        data = default_data()
+        positions = transaction_positions(data["transactions"])
+        for amount in (10.0, 20.5):
+            append_transaction(data, positions, _sanitize_transaction(journal_tx(0, amount), 0))
+        data["monthly_budget"] = 300.0
+        save_data(data)
+        return data
+    
+    def test_own_snapshot_loads_without_sanitizing(self, data_files, monkeypatch):
+        data = self.saved_ledger()
+        monkeypatch.setattr("budget_app._sanitize_transaction", lambda *_args, **_kwargs: pytest.fail("sanitized"))
+        loaded = load_data()
+        assert loaded["transactions"] == data["transactions"]
+        assert (loaded["monthly_budget"], loaded["next_id"]) == (300.0, 3)
+        assert "checksum" not in loaded
+    
+    def test_edited_snapshot_is_validated(self, data_files):
+        data_file, _journal_file = data_files
+        self.saved_ledger()
+        data_file.write_bytes(data_file.read_bytes().replace(b'"amount":20.5', b'"amount":-1', 1))
+        assert [tx["amount"] for tx in load_data()["transactions"]] == [10.0]
+    
+    def test_unversioned_snapshot_is_validated(self, data_files):
+        data_file, _journal_file = data_files
+        data_file.write_text(json.dumps({"monthly_budget": 5, "transactions": [
+            {"id": 1, "type": "Expense", "category": "rent", "amount": 900, "createdAt": "2026-01-01"}
+        ]}), encoding="utf-8")
+        [tx] = load_data()["transactions"]
+        assert (tx["type"], tx["category"]) == ("expense", "Mortgage/Rent")
+    
+    def test_oversized_amount_is_dropped_on_load(self, data_files):
+        data_file, _journal_file = data_files
+        data_file.write_text(json.dumps({"monthly_budget": 1e20, "transactions": [
+            {"id": 1, "type": "expense", "category": "Dining", "amount": 1e20, "createdAt": "2026-01-01"},
+            {"id": 2, "type": "expense", "category": "Dining", "amount": 4, "createdAt": "2026-01-01"},
+        ]}), encoding="utf-8")
+        data = load_data()
+        assert [tx["id"] for tx in data["transactions"]] == [2]
+        assert data["monthly_budget"] == 0.0
+        assert len(TransactionIndex(data["transactions"]).search()) == 1
+
+
+class TestTransactionPositions:
+    """Tests for id-keyed append and swap-remove"""
+    
+    def test_swap_remove_keeps_positions_current(self):
+        data = default_data()
+        positions = transaction_positions(data["transactions"])
+        for amount in range(1, 6):
+            append_transaction(data, positions, journal_tx(0, float(amount)))
+        removed = remove_transactions(data, positions, [2, 5, 42])
+        assert [tx["id"] for tx in removed] == [2, 5]
+        assert sorted(tx["id"] for tx in data["transactions"]) == [1, 3, 4]
+        assert positions == transaction_positions(data["transactions"])
+    
+    def test_append_replaces_taken_ids(self):
+        data = default_data()
+        positions = transaction_positions(data["transactions"])
+        append_transaction(data, positions, journal_tx(7, 1.0))
+        append_transaction(data, positions, journal_tx(7, 2.0))
+        assert [tx["id"] for tx in data["transactions"]] == [7, 8]
+        assert data["next_id"] == 9
+
+
+class FakeRoot:
+    """Stand-in for tk.Tk that runs after() callbacks on demand"""
+    
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+    
+    def after(self, _delay_ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+    
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+    
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for callback in callbacks.values():
+            callback()
+
+
+class TestSaveScheduler:
+    """Tests for coalesced background saves"""
+    
+    def test_rapid_changes_share_one_write(self, data_files, monkeypatch):
+        writes = []
+        original = budget_app.write_journal_lines
+        monkeypatch.setattr("budget_app.write_journal_lines", lambda lines: (writes.append(len(lines)), original(lines)))
+        data = load_data()
+        statuses = []
+        saver = SaveScheduler(FakeRoot(), data, statuses.append)
+        for index in range(1, 4):
+            tx = journal_tx(index, float(index))
+            data["transactions"].append(tx)
+            saver.record({"op": "add", "tx": tx})
+        saver.root.run_pending()
+        saver.close()
+        assert writes == [3]
+        assert statuses[-1] == "All changes saved."
+        assert len(load_data()["transactions"]) == 3
+    
+    def test_close_flushes_pending_changes(self, data_files):
+        data = load_data()
+        saver = SaveScheduler(FakeRoot(), data, lambda _text: None)
+        data["monthly_budget"] = 250.0
+        saver.record({"op": "budget", "value": 250.0})
+        saver.close()
+        assert load_data()["monthly_budget"] == 250.0
+    
+    def test_failed_write_reports_and_snapshots_next_time(self, data_files, monkeypatch):
+        data = load_data()
+        statuses = []
+        saver = SaveScheduler(FakeRoot(), data, statuses.append)
+        
+        def failing(_lines):
+            raise OSError("disk full")
+        
+        with monkeypatch.context() as patched:
+            patched.setattr("budget_app.write_journal_lines", failing)
+            tx = journal_tx(1, 10.0)
+            data["transactions"].append(tx)
+            saver.record({"op": "add", "tx": tx})
+            saver.flush()
+            while saver._in_flight:
+                time.sleep(0.01)
+                saver._drain_results()
+        assert statuses[-1].startswith("Save failed: disk full")
+        tx = journal_tx(2, 20.0)
+        data["transactions"].append(tx)
+        saver.record({"op": "add", "tx": tx})
+        saver.close()
+        assert statuses[-1] == "All changes saved."
+        assert [t["amount"] for t in load_data()["transactions"]] == [10.0, 20.0]
+    
+    def test_close_retries_failed_final_write(self, data_files, monkeypatch):
+        data = load_data()
+        saver = SaveScheduler(FakeRoot(), data, lambda _text: None)
+        
+        def failing(_lines):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr("budget_app.write_journal_lines", failing)
+        tx = journal_tx(1, 10.0)
+        data["transactions"].append(tx)
+        saver.record({"op": "add", "tx": tx})
+        saver.close()
+        assert [t["amount"] for t in load_data()["transactions"]] == [10.0]
+    
+    def test_save_data_replaces_file_atomically(self, data_files):
+        data_file, _journal_file = data_files
+        save_data({"monthly_budget": 1.0, "transactions": [], "journal_seq": 0})
+        assert json.loads(data_file.read_text(encoding="utf-8"))["monthly_budget"] == 1.0
+        assert not data_file.with_name(data_file.name + ".tmp").exists()
+
+
+class FakeTree:
+    """Records the Treeview calls TransactionTable makes"""
+    
+    def __init__(self, height=1):
+        self.height = height
+        self.children = []
+        self.values = {}
+        self.calls = []
+    
+    def winfo_height(self):
+        return self.height
+    
+    def insert(self, _parent, index, iid, values):
+        self.calls.append("insert")
+        self.children.insert(index, iid)
+        self.values[iid] = values
+    
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+    
+    def item(self, iid, values):
+        self.calls.append("item")
+        self.values[iid] = values
+    
+    def move(self, iid, _parent, index):
+        self.calls.append("move")
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+    
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+def table_rows(count):
+    return [journal_tx(index, float(index)) for index in range(1, count + 1)]
+
+
+class TestTransactionTable:
+    """Tests for incremental, windowed Treeview updates"""
+    
+    def test_only_the_page_is_materialized(self):
+        tree = FakeTree(height=28 * 10)
+        table = TransactionTable(tree, FakeScrollbar())
+        table.set_rows(table_rows(100_000))
+        assert tree.children == [str(index) for index in range(1, 11)]
+        assert table.scrollbar.position == (0.0, 10 / 100_000)
+    
+    def test_unchanged_refresh_touches_nothing(self):
+        tree = FakeTree()
+        table = TransactionTable(tree, FakeScrollbar())
+        rows = table_rows(5)
+        table.set_rows(rows)
+        tree.calls.clear()
+        table.set_rows(list(rows))
+        assert tree.calls == []
+    
+    def test_filter_deletes_and_sort_moves(self):
+        tree = FakeTree()
+        table = TransactionTable(tree, FakeScrollbar())
+        rows = table_rows(5)
+        table.set_rows(rows)
+        tree.calls.clear()
+        table.set_rows([rows[4], rows[2], rows[0]])
+        assert tree.children == ["5", "3", "1"]
+        assert "insert" not in tree.calls
+        assert tree.calls.count("delete") == 1
+    
+    def test_changed_values_are_updated_in_place(self):
+        tree = FakeTree()
+        table = TransactionTable(tree, FakeScrollbar())
+        rows = table_rows(3)
+        table.set_rows(rows)
+        tree.calls.clear()
+        table.set_rows([rows[0], {**rows[1], "note": "edited"}, rows[2]])
+        assert tree.calls == ["item"]
+        assert tree.values["2"][5] == "edited"
+    
+    def test_scrolling_shifts_the_window(self):
+        tree = FakeTree(height=28 * 4)
+        table = TransactionTable(tree, FakeScrollbar())
+        table.set_rows(table_rows(20))
+        table.yview("scroll", 1, "units")
+        assert tree.children == ["2", "3", "4", "5"]
+        table.yview("moveto", "1.0")
+        assert tree.children == ["17", "18", "19", "20"]
+        table.yview("scroll", -1, "pages")
+        assert tree.children == ["14", "15", "16", "17"]
+
+
+def brute_force_filter(transactions, type_filter, category_filter, term):
+    return [
+        tx for tx in transactions
+        if (type_filter == "all" or tx["type"] == type_filter)
+        and (category_filter == "all" or tx["category"].lower() == category_filter)
+        and (not term or term in f"{tx['category']} {tx['note']}".lower())
+    ]
+
+
+def index_sample():
+    notes = ["weekly groceries", "Coffee with Sam", "coffee beans", "", "rent for March", "gas station"]
+    categories = ["Groceries", "Dining", "Gas", "Salary"]
+    return [
+        {"id": index, "type": "income" if index % 5 == 0 else "expense", "category": categories[index % 4],
+         "amount": float(index), "note": notes[index % 6], "createdAt": "2026-02-01"}
+        for index in range(1, 61)
+    ]
+
+
+class TestTransactionIndex:
+    """Tests for the in-memory filter and search index"""
+    
+    @pytest.mark.parametrize("type_filter", ["all", "income", "expense"])
+    @pytest.mark.parametrize("category_filter", ["all", "groceries", "gas", "missing"])
+    @pytest.mark.parametrize("term", ["", "c", "co", "coffee", "ffee b", "s g", "zzz"])
+    def test_matches_full_scan(self, type_filter, category_filter, term):
+        transactions = index_sample()
+        index = TransactionIndex(transactions)
+        assert index.search(type_filter, category_filter, term) == brute_force_filter(
+            transactions, type_filter, category_filter, term
+        )
+    
+    def test_extended_query_narrows_previous_results(self):
+        transactions = index_sample()
+        index = TransactionIndex(transactions)
+        index.search(term="co")
+        narrowed = index.search(term="coffee")
+        assert narrowed == brute_force_filter(transactions, "all", "all", "coffee")
+    
+    def test_add_and_remove_keep_postings_current(self):
+        transactions = index_sample()
+        index = TransactionIndex(transactions)
+        assert index.search(term="coffee")
+        for tx in [tx for tx in transactions if "coffee" in tx["note"].lower()]:
+            index.remove(tx)
+            transactions.remove(tx)
+        assert index.search(term="coffee") == []
+        new_tx = {"id": 99, "type": "expense", "category": "Dining", "amount": 4.0,
+                  "note": "Coffee again", "createdAt": "2026-02-02"}
+        transactions.append(new_tx)
+        index.add(new_tx)
+        assert index.search(term="coffee") == [new_tx]
+        assert index.search("expense", "dining") == brute_force_filter(transactions, "expense", "dining", "")
+        assert len(index) == len(transactions)
+
+
+def brute_force_sort(rows, column, reverse):
+    def key_fn(tx):
+        if column == "id":
+            return int(tx["id"])
+        if column == "amount":
+            return float(tx["amount"])
+        return str(tx["createdAt" if column == "date" else column]).lower()
+    return sorted(rows, key=key_fn, reverse=reverse)
+
+
+class TestTransactionIndexSorting:
+    """Tests for cached, precomputed-key sort orders"""
+    
+    def test_ties_follow_id_order_not_list_order(self):
+        transactions = index_sample()[::-1]
+        index = TransactionIndex(transactions)
+        assert index.search() == brute_force_sort(transactions, "id", False)
+        assert index.search(sort_column="date") == brute_force_sort(transactions, "id", False)
+    
+    @pytest.mark.parametrize("column", ["id", "date", "type", "category", "amount", "note"])
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_sorted_search_matches_full_sort(self, column, reverse):
+        transactions = index_sample()
+        for tx in transactions:
+            tx["createdAt"] = f"2026-02-{tx['id'] % 7 + 1:02d}"
+        index = TransactionIndex(transactions)
+        assert index.search(sort_column=column, reverse=reverse) == brute_force_sort(transactions, column, reverse)
+        for type_filter, term in [("expense", ""), ("all", "coffee"), ("income", "gas")]:
+            expected = brute_force_sort(brute_force_filter(transactions, type_filter, "all", term), column, reverse)
+            assert index.search(type_filter, "all", term, column, reverse) == expected
+    
+    def test_orders_are_cached_until_data_changes(self):
+        transactions = index_sample()
+        index = TransactionIndex(transactions)
+        first = index.search(sort_column="amount", reverse=True)
+        assert ("amount", True) in index._orders
+        assert index.search(sort_column="amount", reverse=True) == first
+        new_tx = {"id": 61, "type": "expense", "category": "Gas", "amount": 1000.0,
+                  "note": "", "createdAt": "2026-03-01"}
+        index.add(new_tx)
+        assert ("amount", True) not in index._orders
+        assert index.search(sort_column="amount", reverse=True)[0] is new_tx
+    
+    def test_compaction_keeps_results(self):
+        transactions = [
+            {"id": index, "type": "expense", "category": "Gas", "amount": float(index % 17),
+             "note": f"fill {index % 3}", "createdAt": "2026-02-01"}
+            for index in range(1, 3001)
+        ]
+        index = TransactionIndex(transactions)
+        survivors = transactions[2500:]
+        for tx in transactions[:2500]:
+            index.remove(tx)
+        assert len(index._amounts) < 3000
+        assert index.search(term="fill 1", sort_column="amount") == brute_force_sort(
+            brute_force_filter(survivors, "all", "all", "fill 1"), "amount", False
+        )
+
+
+class TestRunningSummary:
+    """Tests for incrementally maintained summary totals"""
+    
+    def test_matches_calculate_summary_through_changes(self):
+        data = {"monthly_budget": 300.0, "transactions": index_sample()}
+        summary = RunningSummary(data)
+        assert summary.summary() == pytest.approx(calculate_summary(data))
+        removed = data["transactions"][:25]
+        data["transactions"] = data["transactions"][25:]
+        for tx in removed:
+            summary.remove(tx)
+        new_tx = {"id": 99, "type": "income", "category": "Salary", "amount": 1000.0,
+                  "note": "", "createdAt": "2026-03-01"}
+        data["transactions"].append(new_tx)
+        summary.add(new_tx)
+        assert summary.summary() == pytest.approx(calculate_summary(data))
+        summary.check()
+    
+    def test_month_and_category_buckets(self):
+        rent = {"type": "expense", "category": "Mortgage/Rent", "amount": 900.0, "createdAt": "2026-01-01"}
+        food = {"type": "expense", "category": "Groceries", "amount": 55.5, "createdAt": "2026-02-03"}
+        summary = RunningSummary({"monthly_budget": 0.0, "transactions": [rent, food]})
+        assert summary.month_totals() == {"2026-01": 900.0, "2026-02": 55.5}
+        assert summary.categories("expense") == {"Mortgage/Rent", "Groceries"}
+        summary.remove(rent)
+        assert summary.month_totals() == {"2026-02": 55.5}
+        assert summary.category_totals() == {"Groceries": 55.5}
+        summary.remove(food)
+        assert summary.totals["expense"] == 0.0
+        assert summary.month_totals() == {}
+    
+    def test_totals_are_exact_cents(self):
+        transactions = [{"type": "expense", "category": "Dining", "amount": 0.1, "createdAt": "2026-02-01"}
+                        for _ in range(1000)]
+        data = {"monthly_budget": 100.3, "transactions": transactions}
+        summary = RunningSummary(data)
+        assert summary.totals["expense"] == 10000
+        assert calculate_summary(data)["expense"] == summary.summary()["expense"] == 100.0
+        assert summary.summary()["remaining"] == 0.3
+        for tx in transactions[:997]:
+            summary.remove(tx)
+        assert summary.month_totals() == {"2026-02": 0.3}
+    
+    def test_verify_mode_reports_drift(self):
+        tx = {"type": "expense", "category": "Gas", "amount": 40.0, "createdAt": "2026-02-01"}
+        data = {"monthly_budget": 0.0, "transactions": [tx]}
+        summary = RunningSummary(data, verify=True)
+        assert summary.summary()["expense"] == 40.0
+        tx["amount"] = 45.0
+        with pytest.raises(ValueError, match="expense total"):
+            summary.summary()
+
+
+class FakeCanvas:
+    """Records the canvas calls CanvasItemPool makes"""
+    
+    def __init__(self):
+        self.next_item = 0
+        self.calls = []
+    
+    def create_rectangle(self, *coords, **options):
+        self.next_item += 1
+        self.calls.append(("create", self.next_item))
+        return self.next_item
+    
+    create_text = create_rectangle
+    
+    def coords(self, item, *coords):
+        self.calls.append(("coords", item))
+    
+    def itemconfigure(self, item, **options):
+        self.calls.append(("itemconfigure", item))
+    
+    def delete(self, item):
+        self.calls.append(("delete", item))
+
+
+class TestCanvasItemPool:
+    """Tests for in-place chart item updates"""
+    
+    def draw_bars(self, pool, heights, label="Spend"):
+        pool.begin()
+        pool.draw("title", "text", (12, 14), text=label)
+        for index, height in enumerate(heights):
+            pool.draw(("bar", index), "rectangle", (index * 10, 100 - height, index * 10 + 8, 100), fill="blue")
+        pool.finish()
+    
+    def test_identical_redraw_makes_no_calls(self):
+        canvas = FakeCanvas()
+        pool = CanvasItemPool(canvas)
+        self.draw_bars(pool, [10, 20])
+        canvas.calls.clear()
+        self.draw_bars(pool, [10, 20])
+        assert canvas.calls == []
+    
+    def test_changed_items_are_updated_in_place(self):
+        canvas = FakeCanvas()
+        pool = CanvasItemPool(canvas)
+        self.draw_bars(pool, [10, 20, 30])
+        canvas.calls.clear()
+        self.draw_bars(pool, [10, 25], label="Spending")
+        assert canvas.calls == [("itemconfigure", 1), ("coords", 3), ("delete", 4)]
+    
+    def test_summary_version_tracks_changes(self):
+        tx = {"type": "expense", "category": "Gas", "amount": 40.0, "createdAt": "2026-02-01"}
+        summary = RunningSummary({"monthly_budget": 0.0, "transactions": []})
+        version = summary.version
+        summary.add(tx)
+        assert summary.version > version
+
+
+def write_csv(path, rows, header="id,type,category,amount,note,createdAt"):
+    path.write_text("\n".join([header, *rows]) + "\n", encoding="utf-8")
+    return path
+
+
+class TestCsvImport:
+    """Tests for the chunked, de-duplicating CSV importer"""
+    
+    def test_parse_row_keeps_dates_from_either_column(self):
+        assert parse_csv_row({"type": "expense", "category": "Gas", "amount": "$12.50",
+                              "createdAt": "2026-02-01T08:00:00"})["createdAt"] == "2026-02-01T08:00:00"
+        assert parse_csv_row({"type": "income", "category": "Salary", "amount": "10",
+                              "created_at": "2025-12-31"})["createdAt"] == "2025-12-31"
+        assert parse_csv_row({"type": "transfer", "category": "Gas", "amount": "1"}) is None
+        assert parse_csv_row({"type": "expense", "category": "Gas", "amount": "-1"}) is None
+    
+    def test_import_skips_existing_rows_and_counts_invalid(self, tmp_path):
+        path = write_csv(tmp_path / "bank.csv", [
+            "1,expense,Dining,4.5,Coffee,2026-02-01T08:00:00",
+            "2,expense,Dining,4.5,Coffee,2026-02-01T08:00:00",
+            "3,expense,Gas,40,,2026-02-02T09:00:00",
+            "4,expense,,40,,2026-02-02T09:00:00",
+            '5,income,Salary,"2,000",,2026-02-03',
+        ])
+        existing = [{"id": 1, "type": "expense", "category": "Dining", "amount": 4.5,
+                     "note": "Coffee", "createdAt": "2026-02-01T08:00:00"}]
+        job = CsvImport(path, existing, chunk_rows=2)
+        job.run()
+        assert job.error is None
+        assert job.duplicates == 1
+        assert job.invalid == 2
+        assert [(tx["category"], tx["createdAt"]) for tx in job.rows] == [
+            ("Dining", "2026-02-01T08:00:00"),
+            ("Gas", "2026-02-02T09:00:00"),
+        ]
+        assert job.progress() == 1.0
+    
+    def test_reimporting_an_export_adds_nothing(self, tmp_path):
+        rows = [f"{index},expense,Groceries,{index}.25,week {index},2026-01-{index:02d}" for index in range(1, 21)]
+        path = write_csv(tmp_path / "export.csv", rows)
+        first = CsvImport(path, [])
+        first.run()
+        second = CsvImport(path, first.rows)
+        second.run()
+        assert len(first.rows) == 20
+        assert second.rows == []
+        assert second.duplicates == 20
+    
+    def test_cancel_stops_after_current_chunk(self, tmp_path):
+        rows = [f"{index},expense,Gas,{index},,2026-01-01" for index in range(1, 101)]
+        job = CsvImport(write_csv(tmp_path / "big.csv", rows), [], chunk_rows=10)
+        job.cancel()
+        job.run()
+        assert job.cancelled
+        assert len(job.rows) == 10
+        assert job.finished.is_set()
+    
+    def test_missing_file_sets_error(self, tmp_path):
+        job = CsvImport(tmp_path / "missing.csv", [])
+        job.run()
+        assert isinstance(job.error, OSError)
+
+
+class TestCli:
+    """Tests for the headless summary/export/import/monthly-report commands"""
+    
+    def test_module_import_does_not_load_tk(self):
+        code = "import sys, budget_app; sys.exit('tkinter' in sys.modules)"
+        assert subprocess.run([sys.executable, "-c", code], cwd=Path(budget_app.__file__).parent).returncode == 0
+    
+    def test_import_then_report_as_json(self, data_files, tmp_path, capsys):
+        path = write_csv(tmp_path / "bank.csv", [
+            "1,expense,Groceries,12.5,milk,2026-01-03",
+            "2,income,Salary,1000,,2026-01-01",
+            "3,expense,Dining,7,,2026-02-02",
+        ])
+        assert budget_app.main(["import", str(path), "--json"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"imported": 3, "duplicates": 0, "invalid": 0}
+        assert budget_app.main(["import", str(path), "--json"]) == 0
+        assert json.loads(capsys.readouterr().out)["duplicates"] == 3
+        
+        assert budget_app.main(["summary", "--json"]) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert (summary["income"], summary["expense"], summary["count"]) == (1000.0, 19.5, 3)
+        assert budget_app.main(["summary", "--month", "2026-02", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out)["expense"] == 7.0
+        
+        assert budget_app.main(["monthly-report", "--json"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert [(row["month"], row["income"], row["expense"], row["count"]) for row in report] == [
+            ("2026-01", 1000.0, 12.5, 2),
+            ("2026-02", 0.0, 7.0, 1),
+        ]
+    
+    def test_export_writes_entries_in_id_order(self, data_files, tmp_path, capsys):
+        data = load_data()
+        change(data, {"op": "add", "tx": journal_tx(0, 10.0)})
+        change(data, {"op": "add", "tx": journal_tx(0, 20.0)})
+        out = tmp_path / "out.csv"
+        assert budget_app.main(["export", str(out)]) == 0
+        assert "Exported 2 entries" in capsys.readouterr().out
+        assert out.read_text(encoding="utf-8").splitlines()[1:] == [
+            "1,expense,Dining,10.0,,2026-02-01T12:00:00",
+            "2,expense,Dining,20.0,,2026-02-01T12:00:00",
+        ]
+    
+    def test_import_of_missing_file_fails(self, data_files, tmp_path, capsys):
+        assert budget_app.main(["import", str(tmp_path / "missing.csv")]) == 1
+        assert "Could not import CSV" in capsys.readouterr().err
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,91 @@
+"""
+Unit tests for budget_core.py
+Tests for the Transaction record and the shared sanitize path
+"""
+import json
+import sys
+import pytest
+from budget_core import (
+    MAX_AMOUNT_CENTS,
+    Transaction,
+    normalize_category_name,
+    normalize_entry_type,
+    parse_cents,
+    sanitize_transaction,
+    transaction_json,
+)
+
+
+def sample_transaction(**overrides):
+    fields = {"id": 7, "type": "expense", "category": "Dining", "amount": 4.5,
+              "note": "Coffee", "createdAt": "2026-02-01T08:00:00"}
+    return {**fields, **overrides}
+
+
+class TestTransaction:
+    """Tests for the slotted Transaction record"""
+    
+    def test_reads_and_writes_like_a_dict(self):
+        tx = sanitize_transaction(sample_transaction(), 7)
+        assert tx["createdAt"] == tx["created_at"] == tx.created_at == "2026-02-01T08:00:00"
+        assert tx.get("missing", "fallback") == "fallback"
+        assert tx.get("meta") is None
+        assert "meta" not in tx
+        tx["id"] = 9
+        assert tx.id == 9
+        with pytest.raises(KeyError):
+            tx["missing"]
+    
+    def test_serializes_to_stored_json_shape(self):
+        tx = sanitize_transaction(sample_transaction(meta={"recurring": True}), 7)
+        assert tx == sample_transaction(meta={"recurring": True})
+        assert json.loads(json.dumps([tx], default=transaction_json)) == [sample_transaction(meta={"recurring": True})]
+    
+    def test_smaller_than_a_dict(self):
+        tx = sanitize_transaction(sample_transaction(), 7)
+        assert not hasattr(tx, "__dict__")
+        assert sys.getsizeof(tx) < sys.getsizeof(sample_transaction())
+    
+    def test_from_cents_keeps_exact_cents(self):
+        cents = MAX_AMOUNT_CENTS
+        tx = Transaction.from_cents(1, "expense", "Dining", cents, created_at="2026-02-01T08:00:00")
+        assert tx.cents == cents
+        assert sanitize_transaction(sample_transaction(amount=str(cents)[:-2] + "." + str(cents)[-2:]), 1).cents == cents
+
+
+class TestSanitizeTransaction:
+    """Tests for the validation both front-ends share"""
+    
+    def test_normalizes_type_category_and_note(self):
+        tx = sanitize_transaction(sample_transaction(type=" Expense ", category="rent", note="  x  "), 1)
+        assert (tx.type, tx.category, tx.note) == ("expense", "Mortgage/Rent", "x")
+        assert normalize_category_name("income", "gift received") == "Gift"
+        assert normalize_category_name("income", "salary") == "Salary"
+    
+    @pytest.mark.parametrize("overrides", [
+        {"type": "transfer"},
+        {"category": "  "},
+        {"amount": "invalid"},
+        {"amount": -1},
+        {"amount": float("nan")},
+        {"amount": 1e20},
+        {"amount": "90071992547409.92"},
+    ])
+    def test_rejects_invalid_entries(self, overrides):
+        assert sanitize_transaction(sample_transaction(**overrides), 1) is None
+    
+    def test_amounts_are_held_as_cents(self):
+        assert parse_cents("1.005") == 101
+        assert parse_cents(0.29) == 29
+        tx = sanitize_transaction(sample_transaction(amount="12.345"), 1)
+        assert (tx.cents, tx["amount"]) == (1235, 12.35)
+        tx["amount"] = 0.1
+        assert tx.cents == 10
+    
+    def test_missing_date_uses_supplied_clock(self):
+        tx = sanitize_transaction(sample_transaction(createdAt=""), 1, now=lambda: "2026-03-01T00:00:00")
+        assert tx["createdAt"] == "2026-03-01T00:00:00"
+        assert normalize_entry_type(None) == ""
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
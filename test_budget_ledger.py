@@ -0,0 +1,205 @@
+"""
+Unit tests for budget_ledger.py
+Tests for the memory-mapped binary ledger and its lazy row list
+"""
+import pytest
+import budget_app
+from budget_app import (
+    RunningSummary,
+    TransactionIndex,
+    calculate_summary,
+    load_data,
+    remove_transactions,
+    append_transaction,
+    transaction_positions,
+    use_data_file,
+)
+from budget_core import Transaction
+from budget_ledger import Ledger, LedgerError, LedgerRows, open_ledger, write_ledger
+
+
+def ledger_sample():
+    notes = ["weekly groceries", "Coffee with Sam", "", "rent for März"]
+    categories = ["Groceries", "Dining", "Gas", "Salary"]
+    return {
+        "monthly_budget": 250.5,
+        "journal_seq": 3,
+        "next_id": 41,
+        "transactions": [
+            Transaction(index, "income" if index % 5 == 0 else "expense", categories[index % 4], index + 0.1,
+                        notes[index % 4], f"2026-{index % 3 + 1:02d}-01", {"recurring": True} if index == 7 else None)
+            for index in range(1, 41)
+        ],
+    }
+
+
+@pytest.fixture
+def ledger_path(tmp_path, monkeypatch):
+    monkeypatch.setattr("budget_app.DATA_FILE", budget_app.DATA_FILE)
+    monkeypatch.setattr("budget_app.JOURNAL_FILE", budget_app.JOURNAL_FILE)
+    path = tmp_path / "budget_data.ledger"
+    use_data_file(path)
+    return path
+
+
+class TestLedgerFile:
+    """Tests for writing and mapping ledger files"""
+    
+    def test_round_trip(self, tmp_path):
+        data = ledger_sample()
+        write_ledger(tmp_path / "l.ledger", data)
+        loaded = open_ledger(tmp_path / "l.ledger")
+        assert (loaded["monthly_budget"], loaded["journal_seq"], loaded["next_id"]) == (250.5, 3, 41)
+        assert list(loaded["transactions"]) == data["transactions"]
+        loaded["transactions"].materialize()
+    
+    def test_rows_decode_lazily(self, tmp_path):
+        write_ledger(tmp_path / "l.ledger", ledger_sample())
+        rows = open_ledger(tmp_path / "l.ledger")["transactions"]
+        assert rows[-1]["id"] == 40
+        assert rows.overlay_rows() == [rows[39]]
+        assert list(rows.ids()) == list(range(1, 41))
+        assert rows.overlay_rows() == [rows[39]]
+        rows.materialize()
+    
+    @pytest.mark.parametrize("damage", [lambda raw: raw[:40], lambda raw: b"NOTALEDG" + raw[8:], lambda raw: b""])
+    def test_damaged_file_is_rejected(self, tmp_path, damage):
+        path = tmp_path / "l.ledger"
+        write_ledger(path, ledger_sample())
+        path.write_bytes(damage(path.read_bytes()))
+        with pytest.raises(LedgerError):
+            Ledger(path)
+    
+    def test_unknown_type_is_refused(self, tmp_path):
+        data = ledger_sample()
+        data["transactions"][3]["type"] = "transfer"
+        with pytest.raises(LedgerError):
+            write_ledger(tmp_path / "l.ledger", data)
+
+
+class TestLedgerRows:
+    """Tests for edits and column aggregates over mapped rows"""
+    
+    def test_edits_keep_aggregates_matching_plain_rows(self, tmp_path):
+        data = ledger_sample()
+        write_ledger(tmp_path / "l.ledger", data)
+        mapped = open_ledger(tmp_path / "l.ledger")
+        plain = {**data, "transactions": list(data["transactions"])}
+        for ledger in (mapped, plain):
+            positions = transaction_positions(ledger["transactions"])
+            append_transaction(ledger, positions, Transaction(0, "expense", "Travel", 99.99, "", "2026-04-02"))
+            remove_transactions(ledger, positions, [3, 40, 12])
+            ledger["transactions"][0]["amount"] = 5.55
+            assert positions == transaction_positions(ledger["transactions"])
+        assert isinstance(mapped["transactions"], LedgerRows)
+        assert calculate_summary(mapped) == calculate_summary(plain)
+        summary = RunningSummary(mapped)
+        summary.check()
+        assert summary.month_totals() == RunningSummary(plain).month_totals()
+        assert summary.category_totals("income") == RunningSummary(plain).category_totals("income")
+        assert mapped["transactions"].materialize() == plain["transactions"]
+    
+    def test_middle_delete_and_insert_decode_only_touched_rows(self, tmp_path):
+        data = ledger_sample()
+        write_ledger(tmp_path / "l.ledger", data)
+        rows = open_ledger(tmp_path / "l.ledger")["transactions"]
+        plain = list(data["transactions"])
+        new_tx = Transaction(41, "expense", "Travel", 9.99, "", "2026-04-02")
+        for target in (rows, plain):
+            del target[5]
+            target.insert(2, new_tx)
+            del target[-1]
+        assert rows.overlay_rows() == [new_tx]
+        assert list(rows.ids()) == [tx["id"] for tx in plain]
+        assert calculate_summary({"transactions": rows}) == calculate_summary({"transactions": plain})
+        assert RunningSummary({"transactions": rows}).month_totals() == RunningSummary({"transactions": plain}).month_totals()
+        assert rows.materialize() == plain
+    
+    def test_snapshot_is_independent_of_later_edits(self, tmp_path):
+        write_ledger(tmp_path / "l.ledger", ledger_sample())
+        rows = open_ledger(tmp_path / "l.ledger")["transactions"]
+        del rows[3]
+        copy = rows.snapshot()
+        rows.append(Transaction(41, "expense", "Travel", 9.99, "", "2026-04-02"))
+        rows.materialize()
+        assert list(copy.ids()) == [tx_id for tx_id in range(1, 41) if tx_id != 4]
+        assert copy.ledger is not rows.ledger
+        copy.materialize()
+    
+    def test_month_groups_come_from_the_month_column(self, tmp_path):
+        write_ledger(tmp_path / "l.ledger", ledger_sample())
+        rows = open_ledger(tmp_path / "l.ledger")["transactions"]
+        groups = rows.column_groups()
+        assert {month for _type, _category, month in groups} == {"2026-01", "2026-02", "2026-03"}
+        assert sum(count for _cents, count in groups.values()) == 40
+        assert rows.overlay_rows() == []
+        rows.materialize()
+
+
+class TestLedgerIndex:
+    """Tests for a TransactionIndex built from the mapped columns"""
+    
+    def test_matches_index_over_decoded_rows_without_decoding(self, tmp_path):
+        data = ledger_sample()
+        write_ledger(tmp_path / "l.ledger", data)
+        rows = open_ledger(tmp_path / "l.ledger")["transactions"]
+        index = TransactionIndex(rows)
+        plain = TransactionIndex(data["transactions"])
+        assert rows.overlay_rows() == []
+        for query in [(), ("expense",), ("all", "dining"), ("all", "all", "coffee"), ("all", "all", "", "note", True),
+                      ("income", "all", "", "amount", True), ("all", "all", "", "date", False)]:
+            results = index.search(*query)
+            assert len(results) == len(plain.search(*query))
+            assert results[:3] == plain.search(*query)[:3]
+        assert len(rows.overlay_rows()) < 25
+        assert index.search(sort_column="date", reverse=True) == plain.search(sort_column="date", reverse=True)
+        rows.materialize()
+    
+    def test_follows_live_rows_through_edits_and_save(self, ledger_path):
+        write_ledger(ledger_path, ledger_sample())
+        data = load_data()
+        positions = transaction_positions(data["transactions"])
+        index = TransactionIndex(data["transactions"], lookup=lambda tx_id: data["transactions"][positions[tx_id]])
+        for tx in remove_transactions(data, positions, [1, 2, 3]):
+            index.remove(tx)
+        new_tx = Transaction(0, "expense", "Travel", 99.99, "train", "2026-04-02")
+        append_transaction(data, positions, new_tx)
+        index.add(new_tx)
+        budget_app.save_data(data)
+        assert not isinstance(data["transactions"], LedgerRows)
+        assert index.search(sort_column="amount", reverse=True)[0] is new_tx
+        assert sorted(index.search()[:], key=lambda tx: tx["id"]) == sorted(data["transactions"], key=lambda tx: tx["id"])
+
+
+class TestLedgerStorage:
+    """Tests for load_data/save_data with a .ledger data file"""
+    
+    def test_journal_replays_over_ledger(self, ledger_path):
+        write_ledger(ledger_path, ledger_sample())
+        data = load_data()
+        assert isinstance(data["transactions"], LedgerRows)
+        record = {"op": "delete", "ids": [1, 2]}
+        budget_app.apply_journal_record(data, record)
+        budget_app.record_change(data, record)
+        data["transactions"].materialize()
+        assert ledger_path.with_name("budget_data.ledger.journal").exists()
+        reloaded = load_data()
+        assert len(reloaded["transactions"]) == 38
+        budget_app.compact_journal(reloaded)
+        assert len(open_ledger(ledger_path)["transactions"]) == 38
+    
+    def test_convert_between_json_and_ledger(self, ledger_path, tmp_path, capsys):
+        json_path = tmp_path / "budget_data.json"
+        use_data_file(json_path)
+        budget_app.save_data(ledger_sample())
+        assert budget_app.main(["--data", str(json_path), "convert", str(ledger_path)]) == 0
+        assert "Wrote 40 entries" in capsys.readouterr().out
+        use_data_file(ledger_path)
+        assert load_data()["transactions"][:] == ledger_sample()["transactions"]
+        back = tmp_path / "back.json"
+        assert budget_app.main(["--data", str(ledger_path), "convert", str(back), "--json"]) == 0
+        use_data_file(back)
+        assert load_data()["transactions"] == ledger_sample()["transactions"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,8 +2,19 @@
 Unit tests for web_backend.py
 Tests for validation, sanitization, and utility functions
 """
+import asyncio
+import gzip
+import http.client
+import io
+import os
+import socket
+import json
+import sqlite3
+import threading
+import time
 import pytest
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from http import HTTPStatus
 from unittest.mock import patch
 from web_backend import (
     now_utc,
@@ -25,6 +36,51 @@ from web_backend import (
     ensure_category_exists,
     build_default_category_catalog,
     create_default_state,
+    connect_db,
+    create_user,
+    authenticate_user,
+    create_session,
+    get_session_user_id,
+    delete_session,
+    insert_entry,
+    delete_entry,
+    list_entries,
+    list_categories,
+    save_recurring_rule,
+    delete_recurring_rule,
+    save_settings,
+    load_user_state,
+    import_user_state,
+    ApiRequest,
+    AsyncBudgetServer,
+    make_threaded_server,
+    BudgetBackend,
+    PasswordHasher,
+    PasswordHasherBusy,
+    SessionCache,
+    BodyStream,
+    ingest_entries,
+    ApiError,
+    iter_request_body,
+    _aiter_request_body,
+    iter_json_array_records,
+    iter_ndjson_records,
+    collect_changes,
+    apply_changes,
+    delete_category,
+    negotiate_encoding,
+    StaticAssetCache,
+    budget_cycle_key,
+    summarize_rollups,
+    rebuild_rollups,
+    list_recurring_rules,
+    post_due_recurring_entries,
+    recurring_due_dates,
+    RecurringScheduler,
+    GroupCommitWriter,
+    _upsert_entry_rows,
+    BULK_READ_CHUNK_BYTES,
+    SESSION_COOKIE_NAME,
     RECURRING_FREQUENCIES,
     SORT_OPTIONS,
 )
@@ -350,5 +406,936 @@ class TestDefaultState:
         assert "categoryCatalog" in state
 
 
+@pytest.fixture
+def db():
+    conn = connect_db(":memory:")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def user_id(db):
+    return create_user(db, "owner@example.com", "correct horse")
+
+
+class TestEntryStore:
+    """Tests for the normalized SQLite entry store"""
+    
+    def test_schema_has_composite_indexes(self, db):
+        names = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_entries_user_created" in names
+        assert "idx_entries_user_category" in names
+    
+    def test_scoped_reads_use_index(self, db, user_id):
+        plan = db.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM entries WHERE user_id = ? AND created_at >= ?",
+            (user_id, "2026-01-01"),
+        ).fetchall()
+        assert any("idx_entries_user_created" in str(row) for row in plan)
+    
+    def test_create_user_seeds_defaults(self, db, user_id):
+        state = load_user_state(db, user_id)
+        assert state["entries"] == []
+        assert state["settings"] == create_default_state()["settings"]
+        assert len(state["categoryCatalog"]["expense"]) > 0
+    
+    def test_create_user_rejects_duplicates(self, db, user_id):
+        with pytest.raises(ValueError):
+            create_user(db, "OWNER@example.com", "another password")
+    
+    def test_authenticate_user(self, db, user_id):
+        assert authenticate_user(db, "owner@example.com", "correct horse") == user_id
+        assert authenticate_user(db, "owner@example.com", "wrong") is None
+        assert authenticate_user(db, "nobody@example.com", "correct horse") is None
+    
+    def test_session_round_trip(self, db, user_id):
+        token = create_session(db, user_id)
+        assert get_session_user_id(db, token) == user_id
+        delete_session(db, token)
+        assert get_session_user_id(db, token) is None
+    
+    def test_insert_entry_is_single_row_write(self, db, user_id):
+        entry = insert_entry(db, user_id, {"type": "expense", "category": "Coffee", "amount": 4.5,
+                                           "createdAt": "2026-02-10T08:00:00"})
+        assert entry is not None
+        assert list_entries(db, user_id) == [entry]
+        names = [item["name"] for item in list_categories(db, user_id)["expense"]]
+        assert "Coffee" in names
+    
+    def test_list_entries_range_and_category(self, db, user_id):
+        for day, category in [("01", "Dining"), ("15", "Groceries"), ("28", "Dining")]:
+            insert_entry(db, user_id, {"type": "expense", "category": category, "amount": 1,
+                                       "createdAt": f"2026-02-{day}T00:00:00"})
+        in_range = list_entries(db, user_id, start="2026-02-10", end="2026-03-01")
+        assert [entry["createdAt"][:10] for entry in in_range] == ["2026-02-28", "2026-02-15"]
+        assert len(list_entries(db, user_id, category="Dining")) == 2
+    
+    def test_insert_entry_rejects_oversized_amount(self, db, user_id):
+        assert insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": 1e20}) is None
+        assert list_entries(db, user_id) == []
+    
+    def test_delete_entry(self, db, user_id):
+        entry = insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        assert delete_entry(db, user_id, entry["id"]) is True
+        assert delete_entry(db, user_id, entry["id"]) is False
+        assert list_entries(db, user_id) == []
+    
+    def test_entries_are_scoped_per_user(self, db, user_id):
+        other = create_user(db, "other@example.com", "another password")
+        insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        assert list_entries(db, other) == []
+    
+    def test_settings_and_rules_round_trip(self, db, user_id):
+        save_settings(db, user_id, {"monthStartDay": 15, "dataScope": "all"}, budget=1200)
+        rule = save_recurring_rule(db, user_id, {"type": "expense", "category": "rent", "amount": 900,
+                                                 "frequency": "monthly", "nextDue": "2026-03-01"})
+        state = load_user_state(db, user_id)
+        assert state["budget"] == 1200.0
+        assert state["settings"]["monthStartDay"] == 15
+        assert state["recurringRules"] == [rule]
+        assert rule["category"] == "Mortgage/Rent"
+    
+    def test_import_user_state_replaces_rows(self, db, user_id):
+        insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        snapshot = create_default_state()
+        snapshot["budget"] = 500
+        snapshot["entries"] = [
+            {"id": "a", "type": "expense", "category": "Dining", "amount": 12, "createdAt": "2026-02-01"},
+            {"id": "b", "type": "expense", "category": "", "amount": 3},
+        ]
+        state = import_user_state(db, user_id, snapshot)
+        assert [entry["id"] for entry in state["entries"]] == ["a"]
+        assert state["budget"] == 500.0
+
+
+class TestDeltaSync:
+    """Tests for cursor-based delta sync"""
+    
+    def test_full_snapshot_without_cursor(self, db, user_id):
+        insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        changes = collect_changes(db, user_id)
+        assert changes["full"] is True
+        assert len(changes["entries"]) == 1
+        assert len(changes["categories"]) > 0
+        assert "settings" in changes
+    
+    def test_only_changes_since_cursor(self, db, user_id):
+        first = insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        cursor = int(collect_changes(db, user_id)["cursor"])
+        second = insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": 4})
+        changes = collect_changes(db, user_id, cursor)
+        assert [entry["id"] for entry in changes["entries"]] == [second["id"]]
+        assert "settings" not in changes
+        assert changes["deleted"]["entries"] == []
+        assert first["id"] not in [entry["id"] for entry in changes["entries"]]
+    
+    def test_deletes_produce_tombstones(self, db, user_id):
+        entry = insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        rule = save_recurring_rule(db, user_id, {"type": "expense", "category": "Gas", "amount": 30})
+        category_id = list_categories(db, user_id)["expense"][0]["id"]
+        cursor = int(collect_changes(db, user_id)["cursor"])
+        delete_entry(db, user_id, entry["id"])
+        delete_category(db, user_id, category_id)
+        changes = collect_changes(db, user_id, cursor)
+        assert changes["deleted"]["entries"] == [entry["id"]]
+        assert changes["deleted"]["categories"] == [category_id]
+        assert changes["deleted"]["recurringRules"] == []
+        assert rule is not None
+    
+    def test_unchanged_cursor_is_empty(self, db, user_id):
+        insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        cursor = int(collect_changes(db, user_id)["cursor"])
+        changes = collect_changes(db, user_id, cursor)
+        assert changes["entries"] == [] and changes["categories"] == [] and changes["recurringRules"] == []
+    
+    def test_apply_changes_upload(self, db, user_id):
+        doomed = insert_entry(db, user_id, {"type": "income", "category": "Salary", "amount": 10})
+        result = apply_changes(db, user_id, {
+            "entries": [{"id": "e1", "type": "expense", "category": "Dining", "amount": 9}, {"amount": -1}],
+            "deleted": {"entries": [doomed["id"]]},
+            "budget": 750,
+        })
+        assert result["rejectedCount"] == 1
+        state = load_user_state(db, user_id)
+        assert [entry["id"] for entry in state["entries"]] == ["e1"]
+        assert state["budget"] == 750.0
+        changes = collect_changes(db, user_id, int(result["cursor"]))
+        assert changes["entries"] == []
+    
+    @pytest.mark.parametrize("payload", [
+        {"entries": {"id": "e1"}},
+        {"categories": "Dining"},
+        {"recurringRules": 5},
+        {"deleted": {"entries": "e1"}},
+        {"deleted": ["e1"]},
+    ])
+    def test_sync_upload_requires_arrays(self, backend, payload):
+        token = signup(backend)
+        status, _headers, body = call(backend, "POST", "/api/sync", payload, token)
+        assert status == HTTPStatus.BAD_REQUEST
+        assert "must be" in body["error"]
+    
+    def test_sync_routes(self, backend):
+        token = signup(backend)
+        _status, _headers, snapshot = call(backend, "GET", "/api/sync", token=token)
+        call(backend, "POST", "/api/entries", {"type": "expense", "category": "Dining", "amount": 2}, token)
+        status, _headers, delta = call(backend, "GET", f"/api/sync?since={snapshot['cursor']}", token=token)
+        assert status == HTTPStatus.OK
+        assert len(delta["entries"]) == 1
+        status, _headers, _body = call(backend, "GET", "/api/sync?since=abc", token=token)
+        assert status == HTTPStatus.BAD_REQUEST
+
+
+def rollup_rows(db, user_id):
+    return db.execute(
+        "SELECT cycle, type, category, total_cents / 100.0, entry_count FROM entry_rollups "
+        "WHERE user_id = ? ORDER BY cycle, type, category",
+        (user_id,),
+    ).fetchall()
+
+
+class TestRollups:
+    """Tests for incrementally maintained summary rollups"""
+    
+    def test_budget_cycle_key(self):
+        assert budget_cycle_key("2026-02-10T12:00:00") == "2026-02"
+        assert budget_cycle_key("2026-02-10", 15) == "2026-01"
+        assert budget_cycle_key("2026-01-03", 15) == "2025-12"
+        assert budget_cycle_key("2026-01-15", 15) == "2026-01"
+        assert budget_cycle_key("garbage") == "unknown"
+    
+    def test_rollups_follow_inserts_updates_and_deletes(self, db, user_id):
+        entry = insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": 10,
+                                           "createdAt": "2026-02-03T00:00:00"})
+        insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": 5,
+                                   "createdAt": "2026-02-04T00:00:00"})
+        insert_entry(db, user_id, {**entry, "category": "Travel", "amount": 7})
+        assert rollup_rows(db, user_id) == [
+            ("2026-02", "expense", "Dining", 5.0, 1),
+            ("2026-02", "expense", "Travel", 7.0, 1),
+        ]
+        delete_entry(db, user_id, entry["id"])
+        assert rollup_rows(db, user_id) == [("2026-02", "expense", "Dining", 5.0, 1)]
+    
+    def test_rollups_match_full_rebuild(self, db, user_id):
+        records = [({"type": "expense" if index % 3 else "income", "category": f"C{index % 4}",
+                     "amount": index + 0.25, "createdAt": f"2026-{index % 12 + 1:02d}-{index % 27 + 1:02d}"}, None)
+                   for index in range(200)]
+        ingest_entries(db, user_id, records, batch_size=37)
+        incremental = rollup_rows(db, user_id)
+        with db:
+            rebuild_rollups(db, user_id)
+        assert rollup_rows(db, user_id) == incremental
+    
+    def test_month_start_change_rebuilds(self, db, user_id):
+        insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": 10,
+                                   "createdAt": "2026-02-03T00:00:00"})
+        save_settings(db, user_id, {"monthStartDay": 10})
+        assert rollup_rows(db, user_id) == [("2026-01", "expense", "Dining", 10.0, 1)]
+    
+    def test_summarize_rollups(self, db, user_id):
+        save_settings(db, user_id, {}, budget=100)
+        for category, amount, entry_type in [("Dining", 30, "expense"), ("Travel", 90, "expense"),
+                                             ("Salary", 500, "income")]:
+            insert_entry(db, user_id, {"type": entry_type, "category": category, "amount": amount,
+                                       "createdAt": "2026-02-10T00:00:00"})
+        insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": 1,
+                                   "createdAt": "2026-01-10T00:00:00"})
+        summary = summarize_rollups(db, user_id, "2026-02")
+        assert summary["income"] == 500.0
+        assert summary["expense"] == 120.0
+        assert summary["remaining"] == -20.0
+        assert summary["categories"][0]["category"] == "Salary"
+        assert [month["cycle"] for month in summary["months"]] == ["2026-01", "2026-02"]
+        assert summarize_rollups(db, user_id, "all")["expense"] == 121.0
+    
+    def test_rollup_totals_are_exact_cents(self, db, user_id):
+        for amount in (0.1, 0.2, 19.99, 0.01):
+            insert_entry(db, user_id, {"type": "expense", "category": "Dining", "amount": amount,
+                                       "createdAt": "2026-02-10T00:00:00"})
+        assert db.execute("SELECT total_cents FROM entry_rollups WHERE user_id = ?", (user_id,)).fetchone() == (2030,)
+        assert summarize_rollups(db, user_id, "2026-02")["expense"] == 20.3
+    
+    def test_summary_route_validates_cycle(self, backend):
+        token = signup(backend)
+        status, _headers, body = call(backend, "GET", "/api/summary?cycle=all", token=token)
+        assert status == HTTPStatus.OK
+        assert body["expense"] == 0.0
+        status, _headers, _body = call(backend, "GET", "/api/summary?cycle=2026-13", token=token)
+        assert status == HTTPStatus.BAD_REQUEST
+
+
+class TestRecurringEngine:
+    """Tests for closed-form recurring date enumeration and server-side posting"""
+    
+    def test_weekly_and_biweekly_dates(self):
+        dates, following = recurring_due_dates("weekly", date(2026, 1, 1), date(2026, 1, 22))
+        assert dates == [date(2026, 1, 1), date(2026, 1, 8), date(2026, 1, 15), date(2026, 1, 22)]
+        assert following == date(2026, 1, 29)
+        dates, following = recurring_due_dates("bi-weekly", date(2026, 1, 1), date(2026, 1, 28))
+        assert dates == [date(2026, 1, 1), date(2026, 1, 15)]
+        assert following == date(2026, 1, 29)
+    
+    def test_semi_monthly_dates(self):
+        dates, following = recurring_due_dates("semi-monthly", date(2026, 1, 20), date(2026, 3, 1))
+        assert dates == [date(2026, 1, 20), date(2026, 2, 1), date(2026, 2, 15), date(2026, 3, 1)]
+        assert following == date(2026, 3, 15)
+    
+    def test_monthly_dates_clamp_to_month_end(self):
+        dates, following = recurring_due_dates("monthly", date(2026, 1, 31), date(2026, 4, 29))
+        assert dates == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)]
+        assert following == date(2026, 4, 30)
+    
+    def test_monthly_anchor_survives_short_month(self, db, user_id):
+        save_recurring_rule(db, user_id, {"type": "expense", "category": "Rent", "amount": 900,
+                                          "frequency": "monthly", "nextDue": "2026-01-31"})
+        post_due_recurring_entries(db, today=date(2026, 2, 10))
+        assert list_recurring_rules(db, user_id)[0]["nextDue"] == "2026-02-28"
+        post_due_recurring_entries(db, today=date(2026, 3, 1))
+        assert list_recurring_rules(db, user_id)[0]["nextDue"] == "2026-03-31"
+        assert recurring_due_dates("monthly", date(2026, 2, 28), date(2026, 4, 1), anchor_day=31) == (
+            [date(2026, 2, 28), date(2026, 3, 31)], date(2026, 4, 30)
+        )
+    
+    def test_scheduler_keeps_running_after_unexpected_error(self, tmp_path, monkeypatch):
+        calls = []
+        
+        def flaky(_conn):
+            calls.append(1)
+            if len(calls) == 1:
+                raise KeyError("bad rule")
+            return 0
+        
+        monkeypatch.setattr("web_backend.post_due_recurring_entries", flaky)
+        scheduler = RecurringScheduler(tmp_path / "api.sqlite3", interval=0.01)
+        scheduler.start()
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        scheduler.stop()
+        assert len(calls) >= 2
+    
+    def test_future_rule_has_no_dates(self):
+        assert recurring_due_dates("monthly", date(2026, 5, 1), date(2026, 4, 1)) == ([], date(2026, 5, 1))
+    
+    def test_matches_stepwise_enumeration(self):
+        for frequency in ("weekly", "bi-weekly", "semi-monthly", "monthly"):
+            start, until = date(2020, 1, 10), date(2026, 6, 30)
+            dates, following = recurring_due_dates(frequency, start, until)
+            stepped, current = [], start
+            while current <= until:
+                stepped.append(current)
+                current = recurring_due_dates(frequency, current, current)[1]
+            assert dates == stepped
+            assert following == current
+    
+    def test_post_catches_up_overdue_rule_once(self, db, user_id):
+        rule = save_recurring_rule(db, user_id, {"type": "expense", "category": "Rent", "amount": 900,
+                                                 "frequency": "monthly", "nextDue": "2023-03-01"})
+        assert post_due_recurring_entries(db, today=date(2026, 2, 15)) == 36
+        entries = list_entries(db, user_id)
+        assert len(entries) == 36
+        assert entries[0]["meta"] == {"recurring": True, "recurringRuleId": rule["id"]}
+        assert entries[0]["note"] == "Recurring entry"
+        assert list_recurring_rules(db, user_id)[0]["nextDue"] == "2026-03-01"
+        assert post_due_recurring_entries(db, today=date(2026, 2, 15)) == 0
+        assert summarize_rollups(db, user_id, "2026-02")["expense"] == 900
+    
+    def test_post_skips_inactive_rules(self, db, user_id):
+        save_recurring_rule(db, user_id, {"type": "expense", "category": "Gym", "amount": 30,
+                                          "nextDue": "2026-01-01", "active": False})
+        assert post_due_recurring_entries(db, today=date(2026, 2, 15)) == 0
+        assert list_entries(db, user_id) == []
+    
+    def test_rule_deleted_mid_run_is_not_restored(self, db, user_id):
+        rule = save_recurring_rule(db, user_id, {"type": "expense", "category": "Gym", "amount": 30,
+                                                 "frequency": "monthly", "nextDue": "2026-01-01"})
+        due_dates = recurring_due_dates
+    
+        def delete_then_compute(*args, **kwargs):
+            delete_recurring_rule(db, user_id, rule["id"])
+            return due_dates(*args, **kwargs)
+    
+        with patch("web_backend.recurring_due_dates", side_effect=delete_then_compute):
+            assert post_due_recurring_entries(db, today=date(2026, 2, 15)) == 0
+        assert list_recurring_rules(db, user_id) == []
+        assert list_entries(db, user_id) == []
+    
+    def test_scheduler_run_once(self, tmp_path):
+        db_path = tmp_path / "budget.sqlite3"
+        conn = connect_db(db_path)
+        owner = create_user(conn, "owner@example.com", "correct horse", hasher=PasswordHasher(workers=0))
+        save_recurring_rule(conn, owner, {"type": "income", "category": "Salary", "amount": 2000,
+                                          "frequency": "weekly", "nextDue": "2000-01-01"})
+        conn.close()
+        assert RecurringScheduler(db_path, interval=0).run_once() > 0
+    
+    def test_scheduler_logs_failures(self, tmp_path, caplog, capsys):
+        scheduler = RecurringScheduler(tmp_path / "budget.sqlite3", interval=60)
+    
+        def fail_once():
+            scheduler._stop.set()
+            raise sqlite3.OperationalError("database is locked")
+    
+        scheduler.run_once = fail_once
+        scheduler._run()
+        assert "Recurring posting failed" in caplog.text
+        assert capsys.readouterr().out == ""
+    
+    
+@pytest.fixture
+def backend(tmp_path):
+    web_root = tmp_path / "webapp"
+    web_root.mkdir()
+    (web_root / "index.html").write_text("<h1>BudgetBeacon</h1>", encoding="utf-8")
+    instance = BudgetBackend(tmp_path / "api.sqlite3", web_root)
+    yield instance
+    instance.close()
+
+
+def call(backend, method, path, payload=None, token=""):
+    headers = {"Cookie": f"{SESSION_COOKIE_NAME}={token}"} if token else {}
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    status, response_headers, response_body = backend.handle(ApiRequest(method, path, headers, body))
+    return status, dict(response_headers), json.loads(response_body) if response_body[:1] in (b"{", b"[") else response_body
+
+
+def signup(backend, email="owner@example.com"):
+    _status, headers, _body = call(backend, "POST", "/api/signup", {"email": email, "password": "correct horse"})
+    return headers["Set-Cookie"].split(";")[0].split("=", 1)[1]
+
+
+class TestApiRoutes:
+    """Tests for the transport-independent API router"""
+    
+    def test_signup_and_me(self, backend):
+        token = signup(backend)
+        status, _headers, body = call(backend, "GET", "/api/me", token=token)
+        assert status == HTTPStatus.OK
+        assert body["email"] == "owner@example.com"
+    
+    def test_requires_session(self, backend):
+        status, _headers, body = call(backend, "GET", "/api/state")
+        assert status == HTTPStatus.UNAUTHORIZED
+        assert "error" in body
+    
+    def test_entry_crud(self, backend):
+        token = signup(backend)
+        status, _headers, entry = call(backend, "POST", "/api/entries",
+                                       {"type": "expense", "category": "Dining", "amount": 12}, token)
+        assert status == HTTPStatus.CREATED
+        status, _headers, updated = call(backend, "PUT", f"/api/entries/{entry['id']}",
+                                         {"type": "expense", "category": "Dining", "amount": 15}, token)
+        assert updated["amount"] == 15.0
+        _status, _headers, listed = call(backend, "GET", "/api/entries?category=Dining", token=token)
+        assert [item["id"] for item in listed["entries"]] == [entry["id"]]
+        status, _headers, _body = call(backend, "DELETE", f"/api/entries/{entry['id']}", token=token)
+        assert status == HTTPStatus.OK
+        status, _headers, _body = call(backend, "POST", "/api/entries",
+                                       {"type": "expense", "category": "Dining", "amount": 1e20}, token)
+        assert status == HTTPStatus.BAD_REQUEST
+    
+    def test_unexpected_error_returns_500(self, backend, caplog):
+        token = signup(backend)
+        with patch("web_backend.list_entries", side_effect=sqlite3.OperationalError("database is locked")):
+            status, _headers, body = call(backend, "GET", "/api/entries", token=token)
+        assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert "error" in body
+        assert "database is locked" in caplog.text
+    
+    def test_invalid_json(self, backend):
+        token = signup(backend)
+        status, _headers, response_body = backend.handle(
+            ApiRequest("POST", "/api/entries", {"Cookie": f"{SESSION_COOKIE_NAME}={token}"}, b"{oops")
+        )
+        assert status == HTTPStatus.BAD_REQUEST
+    
+    def test_static_and_traversal(self, backend):
+        status, headers, body = call(backend, "GET", "/")
+        assert status == HTTPStatus.OK
+        assert headers["Content-Type"].startswith("text/html")
+        status, _headers, _body = call(backend, "GET", "/../api.sqlite3")
+        assert status == HTTPStatus.NOT_FOUND
+
+
+class TestPasswordHasher:
+    """Tests for process-pool password hashing with admission control"""
+    
+    def test_pool_round_trip(self):
+        hasher = PasswordHasher(workers=1)
+        try:
+            salt_b64, digest_b64 = hasher.create_password_record("correct horse")
+            assert hasher.verify_password("correct horse", salt_b64, digest_b64) is True
+            assert hasher.verify_password("wrong", salt_b64, digest_b64) is False
+        finally:
+            hasher.close()
+    
+    def test_pool_avoids_fork(self):
+        hasher = PasswordHasher(workers=1)
+        try:
+            hasher.start()
+            assert hasher._executor._mp_context.get_start_method() in {"forkserver", "spawn"}
+        finally:
+            hasher.close()
+    
+    def test_rejects_when_saturated(self):
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        try:
+            hasher._slots.acquire()
+            with pytest.raises(PasswordHasherBusy):
+                hasher.create_password_record("another")
+            assert hasher.rejected == 1
+            hasher._slots.release()
+            assert hasher.create_password_record("another")
+        finally:
+            hasher.close()
+    
+    def test_busy_maps_to_503(self, tmp_path):
+        hasher = PasswordHasher(workers=0, max_pending=1)
+        instance = BudgetBackend(tmp_path / "api.sqlite3", tmp_path, password_hasher=hasher)
+        hasher._slots.acquire()
+        try:
+            status, headers, _body = call(instance, "POST", "/api/login",
+                                          {"email": "a@example.com", "password": "x"})
+            assert status == HTTPStatus.SERVICE_UNAVAILABLE
+            assert headers["Retry-After"] == "1"
+        finally:
+            instance.close()
+
+
+class TestSessionCache:
+    """Tests for the in-memory LRU session cache"""
+    
+    def test_hit_and_miss_counters(self):
+        cache = SessionCache()
+        assert cache.get("token") is None
+        cache.put("token", 7, now_utc() + timedelta(days=1))
+        assert cache.get("token") == 7
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "hitRate": 0.5}
+    
+    def test_expired_sessions_are_dropped(self):
+        cache = SessionCache()
+        cache.put("token", 7, now_utc() - timedelta(seconds=1))
+        assert cache.get("token") is None
+        assert cache.stats()["size"] == 0
+    
+    def test_lru_eviction(self):
+        cache = SessionCache(max_entries=2)
+        expires = now_utc() + timedelta(days=1)
+        cache.put("a", 1, expires)
+        cache.put("b", 2, expires)
+        cache.get("a")
+        cache.put("c", 3, expires)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+    
+    def test_invalidate_user(self):
+        cache = SessionCache()
+        expires = now_utc() + timedelta(days=1)
+        cache.put("a", 1, expires)
+        cache.put("b", 1, expires)
+        cache.put("c", 2, expires)
+        cache.invalidate_user(1)
+        assert cache.get("a") is None and cache.get("b") is None
+        assert cache.get("c") == 2
+    
+    def test_backend_serves_repeat_lookups_from_cache(self, backend):
+        token = signup(backend)
+        for _ in range(3):
+            call(backend, "GET", "/api/me", token=token)
+        assert backend.session_cache.stats()["hits"] == 2
+    
+    def test_logout_invalidates(self, backend):
+        token = signup(backend)
+        call(backend, "GET", "/api/me", token=token)
+        call(backend, "POST", "/api/logout", token=token)
+        status, _headers, _body = call(backend, "GET", "/api/me", token=token)
+        assert status == HTTPStatus.UNAUTHORIZED
+    
+    def test_password_change_invalidates_old_sessions(self, backend):
+        token = signup(backend)
+        call(backend, "GET", "/api/me", token=token)
+        status, headers, _body = call(backend, "POST", "/api/password",
+                                      {"currentPassword": "correct horse", "newPassword": "battery staple"}, token)
+        assert status == HTTPStatus.OK
+        status, _headers, _body = call(backend, "GET", "/api/me", token=token)
+        assert status == HTTPStatus.UNAUTHORIZED
+        new_token = headers["Set-Cookie"].split(";")[0].split("=", 1)[1]
+        status, _headers, _body = call(backend, "GET", "/api/me", token=new_token)
+        assert status == HTTPStatus.OK
+
+
+class TestGroupCommitWriter:
+    """Tests for the opt-in group-commit write queue"""
+    
+    @pytest.fixture
+    def writer_db(self, tmp_path):
+        db_path = tmp_path / "group.sqlite3"
+        conn = connect_db(db_path)
+        owner = create_user(conn, "owner@example.com", "correct horse", hasher=PasswordHasher(workers=0))
+        yield db_path, conn, owner
+        conn.close()
+    
+    def test_burst_commits_together(self, writer_db):
+        db_path, conn, owner = writer_db
+        writer = GroupCommitWriter(db_path, interval=0.05)
+        futures = [
+            writer.submit(owner, lambda c, index=index: insert_entry_rows(c, owner, index))
+            for index in range(20)
+        ]
+        for future in futures:
+            future.result(timeout=5)
+        writer.close()
+        assert writer.writes == 20
+        assert writer.commits < 20
+        assert len(list_entries(conn, owner)) == 20
+    
+    def test_batch_size_is_capped(self, writer_db):
+        db_path, conn, owner = writer_db
+        writer = GroupCommitWriter(db_path, interval=0.05, max_batch=2)
+        futures = [writer.submit(owner, lambda c, index=index: insert_entry_rows(c, owner, index)) for index in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+        writer.close()
+        assert writer.commits >= 3
+    
+    def test_submit_after_close_raises(self, writer_db):
+        db_path, _conn, owner = writer_db
+        writer = GroupCommitWriter(db_path, interval=0.01)
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(owner, lambda c: None)
+    
+    def test_dead_writer_fails_pending_writes(self, writer_db, monkeypatch):
+        db_path, _conn, owner = writer_db
+        
+        def crash(_self, _conn, _batch):
+            raise MemoryError("writer crashed")
+        
+        monkeypatch.setattr(GroupCommitWriter, "_commit", crash)
+        writer = GroupCommitWriter(db_path, interval=0.05)
+        futures = [writer.submit(owner, lambda c: None) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(MemoryError):
+                future.result(timeout=5)
+        with pytest.raises(RuntimeError):
+            writer.write(owner, lambda c: None)
+        writer.close()
+    
+    def test_failed_write_does_not_roll_back_batch(self, writer_db):
+        db_path, conn, owner = writer_db
+        writer = GroupCommitWriter(db_path, interval=0.05)
+        
+        def failing(c):
+            insert_entry_rows(c, owner, 99)
+            raise ValueError("boom")
+        
+        bad = writer.submit(owner, failing)
+        good = writer.submit(owner, lambda c: insert_entry_rows(c, owner, 1))
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        good.result(timeout=5)
+        writer.close()
+        assert [entry["id"] for entry in list_entries(conn, owner)] == ["burst_1"]
+    
+    def test_backend_routes_entry_writes_through_writer(self, tmp_path):
+        web_root = tmp_path / "webapp"
+        web_root.mkdir()
+        db_path = tmp_path / "api.sqlite3"
+        backend = BudgetBackend(db_path, web_root, group_writer=GroupCommitWriter(db_path, interval=0.001))
+        try:
+            token = signup(backend)
+            status, _headers, entry = call(backend, "POST", "/api/entries",
+                                           {"type": "expense", "category": "Dining", "amount": 12}, token)
+            assert status == HTTPStatus.CREATED
+            status, _headers, body = call(backend, "GET", "/api/entries", token=token)
+            assert [item["id"] for item in body["entries"]] == [entry["id"]]
+            status, _headers, _body = call(backend, "DELETE", f"/api/entries/{entry['id']}", token=token)
+            assert status == HTTPStatus.OK
+            assert backend.group_writer.writes == 2
+        finally:
+            backend.close()
+
+
+def insert_entry_rows(conn, user_id, index):
+    entry = sanitize_entry({"id": f"burst_{index}", "type": "expense", "category": "Dining", "amount": index})
+    _upsert_entry_rows(conn, user_id, [entry])
+
+
+def chunked(data, size):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+class TestBulkIngest:
+    """Tests for streaming bulk entry ingest"""
+    
+    def test_ndjson_across_chunk_boundaries(self):
+        data = b'{"a": 1}\n{"b": 2}\nnot json\n\n{"c": 3}'
+        records = list(iter_ndjson_records(chunked(data, 3)))
+        assert records[0] == ({"a": 1}, None)
+        assert records[1] == ({"b": 2}, None)
+        assert records[2][1] is not None
+        assert records[3] == ({"c": 3}, None)
+    
+    def test_json_array_across_chunk_boundaries(self):
+        data = json.dumps([{"n": index, "note": "caf\u00e9"} for index in range(50)], ensure_ascii=False).encode("utf-8")
+        records = list(iter_json_array_records(chunked(data, 7)))
+        assert [record["n"] for record, _error in records] == list(range(50))
+        assert records[0][0]["note"] == "caf\u00e9"
+    
+    def test_json_array_rejects_non_array(self):
+        with pytest.raises(Exception):
+            list(iter_json_array_records([b'{"a": 1}']))
+    
+    def test_ingest_batches_and_reports_rejects(self, db, user_id):
+        records = [({"type": "expense", "category": "Dining", "amount": index}, None) for index in range(25)]
+        records.insert(3, ({"type": "expense", "category": "", "amount": 1}, None))
+        records.insert(5, (None, "Line is not valid JSON."))
+        result = ingest_entries(db, user_id, records, batch_size=10)
+        assert result["inserted"] == 25
+        assert result["rejectedCount"] == 2
+        assert [reject["index"] for reject in result["rejected"]] == [3, 5]
+        assert len(list_entries(db, user_id)) == 25
+    
+    def test_repeated_ids_are_stored_and_rolled_up_once(self, db, user_id):
+        entry = {"id": "dup", "type": "expense", "category": "Dining", "amount": 4, "createdAt": "2026-02-03"}
+        records = [(entry, None), ({**entry, "amount": 5}, None), ({**entry, "amount": 5}, None)]
+        assert ingest_entries(db, user_id, records, batch_size=2)["inserted"] == 1
+        assert rollup_rows(db, user_id) == [("2026-02", "expense", "Dining", 5.0, 1)]
+        income = {"id": "gift", "type": "income", "category": "Gift", "amount": 10, "createdAt": "2026-02-04"}
+        import_user_state(db, user_id, {"entries": [income, income, income]})
+        assert [entry["id"] for entry in list_entries(db, user_id)] == ["gift"]
+        assert rollup_rows(db, user_id) == [("2026-02", "income", "Gift", 10.0, 1)]
+        delete_entry(db, user_id, "gift")
+        assert rollup_rows(db, user_id) == []
+    
+    def test_failed_body_reports_committed_entries(self, backend):
+        token = signup(backend)
+        body = json.dumps([{"type": "expense", "category": "Dining", "amount": 1}] * 1500).encode("utf-8")
+        request = ApiRequest(
+            "POST",
+            "/api/entries/bulk",
+            {"Cookie": f"{SESSION_COOKIE_NAME}={token}", "Content-Type": "application/json"},
+            stream=BodyStream(iter(chunked(body[:-1] + b', {"oops"]', 65536))),
+        )
+        status, _headers, response_body = backend.handle(request)
+        assert status == HTTPStatus.BAD_REQUEST
+        assert json.loads(response_body)["inserted"] == 1000
+        assert len(list_entries(backend.connection(), 1)) == 1000
+    
+    def test_chunked_body_is_read_in_bounded_pieces(self):
+        data = b"x" * (BULK_READ_CHUNK_BYTES * 2 + 5)
+        rfile = io.BytesIO(b"%x\r\n" % len(data) + data + b"\r\n0\r\n\r\n")
+        pieces = list(iter_request_body(rfile, {"transfer-encoding": "chunked"}))
+        assert b"".join(pieces) == data
+        assert max(map(len, pieces)) == BULK_READ_CHUNK_BYTES
+    
+    @pytest.mark.parametrize("headers, raw", [
+        ({"transfer-encoding": "chunked"}, b"10\r\nshort"),
+        ({"transfer-encoding": "chunked"}, b"5\r\nshort\r\n"),
+        ({"content-length": "10"}, b"short"),
+    ])
+    def test_truncated_body_is_rejected(self, headers, raw):
+        with pytest.raises(ApiError) as excinfo:
+            list(iter_request_body(io.BytesIO(raw), headers))
+        assert excinfo.value.status == HTTPStatus.BAD_REQUEST
+    
+    def test_truncated_async_body_is_rejected(self):
+        async def read_all():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"10\r\nshort")
+            reader.feed_eof()
+            return [chunk async for chunk in _aiter_request_body(reader, {"transfer-encoding": "chunked"})]
+        with pytest.raises(ApiError) as excinfo:
+            asyncio.run(read_all())
+        assert excinfo.value.status == HTTPStatus.BAD_REQUEST
+    
+    def test_bulk_route_streams_beyond_json_cap(self, backend):
+        token = signup(backend)
+        lines = b"\n".join(
+            json.dumps({"type": "expense", "category": "Dining", "amount": 1, "note": "x" * 200}).encode("utf-8")
+            for _ in range(12000)
+        )
+        assert len(lines) > 2 * 1024 * 1024
+        request = ApiRequest(
+            "POST",
+            "/api/entries/bulk",
+            {"Cookie": f"{SESSION_COOKIE_NAME}={token}", "Content-Type": "application/x-ndjson"},
+            stream=BodyStream(iter(chunked(lines, 65536))),
+        )
+        status, _headers, body = backend.handle(request)
+        assert status == HTTPStatus.OK
+        assert json.loads(body)["inserted"] == 12000
+
+
+class TestStaticAssetCache:
+    """Tests for the precompressed, ETag-aware static asset cache"""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        (tmp_path / "app.js").write_text("console.log('budget');\n" * 200, encoding="utf-8")
+        (tmp_path / "index.html").write_text("<p>hi</p>", encoding="utf-8")
+        instance = StaticAssetCache(tmp_path)
+        assert instance.warm() == 2
+        return instance
+    
+    def test_negotiate_encoding(self):
+        assert negotiate_encoding("gzip, deflate", {"identity", "gzip"}) == "gzip"
+        assert negotiate_encoding("gzip;q=0", {"identity", "gzip"}) == "identity"
+        assert negotiate_encoding("", {"identity", "gzip"}) == "identity"
+        assert negotiate_encoding("br, gzip", {"identity", "gzip", "br"}) == "br"
+        assert negotiate_encoding("br;q=0.5, gzip;q=0.8", {"identity", "gzip", "br"}) == "gzip"
+        assert negotiate_encoding("gzip, br", {"identity", "gzip", "br"}) == "br"
+        assert negotiate_encoding("gzip;q=0.2, identity", {"identity", "gzip"}) == "identity"
+        assert negotiate_encoding("identity;q=0, *;q=0.1", {"identity", "gzip"}) == "gzip"
+        assert negotiate_encoding("br;level=5;q=0.9, gzip;q=0.4", {"identity", "gzip", "br"}) == "br"
+    
+    def test_serves_gzip_variant(self, cache):
+        status, headers, body = cache.lookup("/app.js", "gzip")
+        headers = dict(headers)
+        assert status == HTTPStatus.OK
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(body).startswith(b"console.log")
+    
+    def test_small_files_stay_uncompressed(self, cache):
+        _status, headers, body = cache.lookup("/", "gzip")
+        assert "Content-Encoding" not in dict(headers)
+        assert body == b"<p>hi</p>"
+    
+    def test_if_none_match_returns_304(self, cache):
+        _status, headers, _body = cache.lookup("/app.js", "gzip")
+        etag = dict(headers)["ETag"]
+        status, headers, body = cache.lookup("/app.js", "gzip", etag)
+        assert status == HTTPStatus.NOT_MODIFIED
+        assert body == b""
+        assert dict(headers)["ETag"] == etag
+    
+    def test_etag_differs_per_encoding(self, cache):
+        _status, plain, _body = cache.lookup("/app.js", "")
+        _status, zipped, _body = cache.lookup("/app.js", "gzip")
+        assert dict(plain)["ETag"] != dict(zipped)["ETag"]
+    
+    def test_rebuilds_when_mtime_changes(self, cache, tmp_path):
+        _status, headers, _body = cache.lookup("/index.html")
+        old_etag = dict(headers)["ETag"]
+        target = tmp_path / "index.html"
+        target.write_text("<p>changed</p>", encoding="utf-8")
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        status, headers, body = cache.lookup("/index.html", "", old_etag)
+        assert status == HTTPStatus.OK
+        assert body == b"<p>changed</p>"
+    
+    def test_missing_and_traversal(self, cache):
+        with pytest.raises(Exception):
+            cache.lookup("/missing.css")
+        with pytest.raises(Exception):
+            cache.lookup("/../secret")
+
+
+class TestAsyncServer:
+    """Tests for the asyncio serving mode"""
+    
+    @pytest.fixture
+    def server(self, backend):
+        loop = asyncio.new_event_loop()
+        instance = AsyncBudgetServer(backend, "127.0.0.1", 0, max_connections=2, max_inflight=2, workers=2)
+        loop.run_until_complete(instance.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        yield instance
+        asyncio.run_coroutine_threadsafe(instance.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+    
+    def test_keep_alive_reuses_connection(self, server):
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        for _ in range(3):
+            conn.request("GET", "/api/health")
+            response = conn.getresponse()
+            assert response.status == 200
+            assert response.getheader("Connection") == "keep-alive"
+            assert json.loads(response.read())["ok"] is True
+        assert server.open_connections == 1
+        conn.close()
+    
+    def test_connection_limit_rejects_with_503(self, server):
+        held = [http.client.HTTPConnection("127.0.0.1", server.port, timeout=5) for _ in range(2)]
+        for conn in held:
+            conn.request("GET", "/api/health")
+            conn.getresponse().read()
+        extra = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        extra.request("GET", "/api/health")
+        assert extra.getresponse().status == 503
+        for conn in [*held, extra]:
+            conn.close()
+    
+    def test_chunked_bulk_upload(self, server, backend):
+        token = signup(backend)
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        rows = (json.dumps({"type": "income", "category": "Salary", "amount": 5}).encode("utf-8") + b"\n"
+                for _ in range(30))
+        conn.request("POST", "/api/entries/bulk", body=rows, encode_chunked=True,
+                     headers={"Cookie": f"{SESSION_COOKIE_NAME}={token}", "Content-Type": "application/x-ndjson",
+                              "Transfer-Encoding": "chunked"})
+        response = conn.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())["inserted"] == 30
+        conn.request("GET", "/api/health")
+        assert conn.getresponse().status == 200
+        conn.close()
+    
+    def test_post_body_round_trip(self, server):
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        conn.request("POST", "/api/signup", body=json.dumps({"email": "a@example.com", "password": "correct horse"}),
+                     headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        assert response.status == 201
+        assert SESSION_COOKIE_NAME in response.getheader("Set-Cookie")
+        response.read()
+        conn.close()
+    
+    def test_chunked_body_on_plain_route_is_refused(self, server):
+        assert raw_exchange(server.port, CHUNKED_SIGNUP).startswith(b"HTTP/1.1 411")
+    
+    def test_stalled_bulk_body_times_out(self, server, backend):
+        token = signup(backend)
+        server.keep_alive_timeout = 0.2
+        request = (f"POST /api/entries/bulk HTTP/1.1\r\nCookie: {SESSION_COOKIE_NAME}={token}\r\n"
+                   "Content-Type: application/x-ndjson\r\nContent-Length: 100\r\n\r\n{").encode("latin-1")
+        assert raw_exchange(server.port, request).startswith(b"HTTP/1.1 408")
+
+
+CHUNKED_SIGNUP = (b"POST /api/signup HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+                  b"2\r\n{}\r\n0\r\n\r\nGET /api/health HTTP/1.1\r\n\r\n")
+
+
+def raw_exchange(port, request):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(request)
+        response = b""
+        while chunk := sock.recv(65536):
+            response += chunk
+    return response
+
+
+class TestThreadedServer:
+    """Tests for the ThreadingHTTPServer serving mode"""
+    
+    def test_chunked_body_on_plain_route_is_refused(self, backend):
+        server = make_threaded_server(backend, "127.0.0.1", 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            response = raw_exchange(server.server_address[1], CHUNKED_SIGNUP)
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert response.startswith(b"HTTP/1.0 411") or response.startswith(b"HTTP/1.1 411")
+        assert b"/api/health" not in response and response.count(b"HTTP/1.") == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,21 +1,50 @@
 ﻿
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import base64
+import calendar
+import codecs
+import gzip
 import hashlib
 import json
+import logging
 import mimetypes
+import multiprocessing
+import os
+import queue
 import secrets
 import sqlite3
 import threading
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta, timezone
 from http import HTTPStatus
 from http.cookies import SimpleCookie
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Optional
-from urllib.parse import urlparse
+from typing import AsyncIterator, Awaitable, Iterable, Iterator, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+from budget_core import (
+    EXPENSE_CATEGORIES,
+    INCOME_CATEGORIES,
+    from_cents,
+    normalize_category_name,
+    normalize_entry_type,
+    sanitize_transaction,
+    to_cents,
+)
+
+try:
+    import brotli
+except ImportError:  # optional: brotli variants are skipped when the package is missing
+    brotli = None
+
+LOGGER = logging.getLogger("budgetbeacon")
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_WEB_ROOT = BASE_DIR / "webapp"
@@ -25,43 +54,21 @@ SESSION_COOKIE_NAME = "budgetbeacon_session"
 SESSION_TTL_DAYS = 7
 PASSWORD_PBKDF2_ROUNDS = 210_000
 MAX_BODY_BYTES = 2 * 1024 * 1024
+PASSWORD_HASH_WORKERS = os.cpu_count() or 1
+PASSWORD_HASH_QUEUE_PER_WORKER = 4
+SESSION_CACHE_SIZE = 10_000
+BULK_MAX_BODY_BYTES = 512 * 1024 * 1024
+BULK_MAX_RECORD_BYTES = 64 * 1024
+BULK_BATCH_SIZE = 1000
+BULK_MAX_REPORTED_REJECTS = 1000
+BULK_READ_CHUNK_BYTES = 64 * 1024
+STATIC_COMPRESS_MIN_BYTES = 256
+GROUP_COMMIT_INTERVAL_SECONDS = 0.005
+GROUP_COMMIT_MAX_BATCH = 256
+STATIC_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
 
-DEFAULT_EXPENSE_CATEGORIES = [
-    "Groceries",
-    "Mortgage/Rent",
-    "Water",
-    "Gas",
-    "Electric",
-    "Transportation",
-    "Dining",
-    "Entertainment",
-    "Healthcare",
-    "Car Insurance",
-    "Credit Cards",
-    "Loans",
-    "Student Loans",
-    "Childcare",
-    "Education",
-    "Internet",
-    "Cellphone",
-    "Shopping",
-    "Personal Care",
-    "Travel",
-    "Gifts",
-    "Taxes",
-    "Other",
-]
-DEFAULT_INCOME_CATEGORIES = [
-    "Salary",
-    "Freelance",
-    "Business",
-    "Interest",
-    "Dividends",
-    "Rental Income",
-    "Refund",
-    "Gift",
-    "Other Income",
-]
+DEFAULT_EXPENSE_CATEGORIES = EXPENSE_CATEGORIES
+DEFAULT_INCOME_CATEGORIES = INCOME_CATEGORIES
 EXPENSE_CATEGORY_COLORS = [
     "#246aaf",
     "#ad4e3b",
@@ -82,13 +89,6 @@ INCOME_CATEGORY_COLORS = [
 ]
 SORT_OPTIONS = {"date_desc", "date_asc", "amount_desc", "amount_asc"}
 RECURRING_FREQUENCIES = {"weekly", "bi-weekly", "semi-monthly", "monthly"}
-LEGACY_EXPENSE_CATEGORY_RENAMES = {
-    "rent": "Mortgage/Rent",
-    "utilities": "Electric",
-    "insurance": "Car Insurance",
-    "debt payment": "Loans",
-    "phone/internet": "Internet",
-}
 
 
 def now_utc() -> datetime:
@@ -140,6 +140,65 @@ def verify_password(password: str, salt_b64: str, digest_b64: str) -> bool:
     return secrets.compare_digest(actual, expected)
 
 
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None) -> None:
+        self.workers = PASSWORD_HASH_WORKERS if workers is None else max(0, int(workers))
+        if max_pending is None:
+            max_pending = max(1, self.workers) * PASSWORD_HASH_QUEUE_PER_WORKER
+        self.max_pending = max(1, int(max_pending))
+        self.rejected = 0
+        self._rejected_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def create_password_record(self, password: str) -> tuple[str, str]:
+        return self._run(create_password_record, password)
+
+    def verify_password(self, password: str, salt_b64: str, digest_b64: str) -> bool:
+        return self._run(verify_password, password, salt_b64, digest_b64)
+
+    def start(self) -> None:
+        """Start the worker processes now; call before other threads exist."""
+        if self.workers:
+            self._pool().submit(int).result()
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._rejected_lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full.")
+        try:
+            if self.workers == 0:
+                return fn(*args)
+            return self._pool().submit(fn, *args).result()
+        except BrokenProcessPool:
+            self.close()
+            raise PasswordHasherBusy("Password hashing pool restarted.") from None
+        finally:
+            self._slots.release()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # Forking a process that already runs server threads can copy a held lock into the child.
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(method)
+                )
+            return self._executor
+
+
 def normalize_color(value: object) -> str:
     text = str(value or "").strip().lower()
     if len(text) == 7 and text.startswith("#") and all(ch in "0123456789abcdef" for ch in text[1:]):
@@ -214,10 +273,7 @@ def normalize_recurring_frequency(value: object) -> str:
 
 
 def normalize_expense_category(value: object) -> str:
-    category = str(value or "").strip()
-    if not category:
-        return ""
-    return LEGACY_EXPENSE_CATEGORY_RENAMES.get(category.lower(), category)
+    return normalize_category_name("expense", value)
 
 
 def sanitize_settings(raw: object) -> dict:
@@ -236,37 +292,17 @@ def sanitize_settings(raw: object) -> dict:
 def sanitize_entry(raw: object) -> Optional[dict]:
     if not isinstance(raw, dict):
         return None
-    entry_type = "income" if raw.get("type") == "income" else "expense"
-    category = str(raw.get("category", "")).strip()
-    if entry_type == "expense":
-        category = normalize_expense_category(category)
-    amount = as_non_negative_number(raw.get("amount"), -1.0)
-    if not category or amount < 0:
-        return None
-    created_at = str(raw.get("createdAt") or now_iso()).strip() or now_iso()
-    entry = {
-        "id": str(raw.get("id") or f"id_{uuid.uuid4().hex}"),
-        "type": entry_type,
-        "category": category,
-        "amount": amount,
-        "note": str(raw.get("note") or ""),
-        "createdAt": created_at,
-    }
-    meta = raw.get("meta")
-    if isinstance(meta, dict):
-        entry["meta"] = meta
-    return entry
+    entry = sanitize_transaction(raw, str(raw.get("id") or f"id_{uuid.uuid4().hex}"), now_iso)
+    return None if entry is None else entry.to_dict()
 
 
 def sanitize_recurring_rule(raw: object) -> Optional[dict]:
     if not isinstance(raw, dict):
         return None
-    rule_type = "income" if raw.get("type") == "income" else "expense"
-    category = str(raw.get("category", "")).strip()
-    if rule_type == "expense":
-        category = normalize_expense_category(category)
+    rule_type = normalize_entry_type(raw.get("type"))
+    category = normalize_category_name(rule_type, raw.get("category", ""))
     amount = as_non_negative_number(raw.get("amount"), -1.0)
-    if not category or amount < 0:
+    if not rule_type or not category or amount < 0:
         return None
     return {
         "id": str(raw.get("id") or f"rule_{uuid.uuid4().hex}"),
@@ -298,3 +334,2218 @@ def ensure_category_exists(catalog: dict, entry_type: str, name: str, preferred_
     )
     candidates.sort(key=lambda item: str(item.get("name", "")).lower())
     catalog[normalized_type] = candidates
+
+
+def _create_entry_rollups(conn: sqlite3.Connection) -> None:
+    # Totals are integer cents: REAL totals drifted as deltas piled up on the same row.
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS entry_rollups;
+        CREATE TABLE entry_rollups (
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            cycle TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            total_cents INTEGER NOT NULL DEFAULT 0,
+            entry_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, cycle, type, category)
+        ) WITHOUT ROWID;
+        """
+    )
+    for (user_id,) in conn.execute("SELECT id FROM users").fetchall():
+        rebuild_rollups(conn, user_id)
+
+
+SCHEMA_MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        password_salt TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sessions (
+        token TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        created_at TEXT NOT NULL,
+        expires_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id);
+    CREATE TABLE IF NOT EXISTS entries (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        amount REAL NOT NULL,
+        note TEXT NOT NULL DEFAULT '',
+        created_at TEXT NOT NULL,
+        meta TEXT,
+        PRIMARY KEY (user_id, id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_entries_user_created ON entries(user_id, created_at);
+    CREATE INDEX IF NOT EXISTS idx_entries_user_category ON entries(user_id, category);
+    CREATE TABLE IF NOT EXISTS recurring_rules (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        amount REAL NOT NULL,
+        note TEXT NOT NULL DEFAULT '',
+        frequency TEXT NOT NULL,
+        next_due TEXT NOT NULL,
+        active INTEGER NOT NULL DEFAULT 1,
+        PRIMARY KEY (user_id, id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS categories (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        name TEXT NOT NULL,
+        color TEXT NOT NULL,
+        PRIMARY KEY (user_id, id)
+    ) WITHOUT ROWID;
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_categories_user_name
+        ON categories(user_id, type, name COLLATE NOCASE);
+    CREATE TABLE IF NOT EXISTS settings (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        budget REAL NOT NULL DEFAULT 0,
+        default_type TEXT NOT NULL DEFAULT 'expense',
+        data_scope TEXT NOT NULL DEFAULT 'month',
+        month_start_day INTEGER NOT NULL DEFAULT 1,
+        sort_order TEXT NOT NULL DEFAULT 'date_desc'
+    );
+    """,
+    """
+    ALTER TABLE entries ADD COLUMN seq INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE recurring_rules ADD COLUMN seq INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE categories ADD COLUMN seq INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE settings ADD COLUMN seq INTEGER NOT NULL DEFAULT 0;
+    CREATE INDEX IF NOT EXISTS idx_entries_user_seq ON entries(user_id, seq);
+    CREATE INDEX IF NOT EXISTS idx_recurring_rules_user_seq ON recurring_rules(user_id, seq);
+    CREATE INDEX IF NOT EXISTS idx_categories_user_seq ON categories(user_id, seq);
+    CREATE TABLE IF NOT EXISTS sync_state (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS tombstones (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        kind TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        PRIMARY KEY (user_id, kind, item_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_tombstones_user_seq ON tombstones(user_id, seq);
+    """,
+    _create_entry_rollups,
+    """
+    CREATE INDEX IF NOT EXISTS idx_recurring_rules_due ON recurring_rules(active, next_due);
+    """,
+    _create_entry_rollups,
+    # The day of month a monthly rule was scheduled for, so clamping to Feb 28 does not stick for later months.
+    """
+    ALTER TABLE recurring_rules ADD COLUMN anchor_day INTEGER NOT NULL DEFAULT 0;
+    UPDATE recurring_rules SET anchor_day = CAST(substr(next_due, 9, 2) AS INTEGER);
+    """,
+]
+SYNC_KINDS = ("entries", "recurringRules", "categories")
+MIN_PASSWORD_LENGTH = 8
+SQLITE_MAX_PARAMS = 900
+SUMMARY_CHART_CYCLES = 6
+RECURRING_MAX_CATCH_UP = 5000
+RECURRING_INTERVAL_SECONDS = 3600.0
+UNKNOWN_USER_SALT = base64.b64encode(bytes(16)).decode("ascii")
+UNKNOWN_USER_DIGEST = base64.b64encode(bytes(32)).decode("ascii")
+
+
+def connect_db(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    path = Path(db_path)
+    if str(path) != ":memory:":
+        path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")
+    if str(path) != ":memory:":
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = FULL")
+    init_db(conn)
+    return conn
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, migration in enumerate(SCHEMA_MIGRATIONS, start=1):
+        if version >= target:
+            continue
+        if callable(migration):
+            migration(conn)
+        else:
+            conn.executescript(migration)
+        conn.execute(f"PRAGMA user_version = {target}")
+    conn.commit()
+
+
+def _entry_from_row(row: tuple) -> dict:
+    entry_id, entry_type, category, amount, note, created_at, meta = row
+    entry = {
+        "id": entry_id,
+        "type": entry_type,
+        "category": category,
+        "amount": amount,
+        "note": note,
+        "createdAt": created_at,
+    }
+    if meta:
+        try:
+            entry["meta"] = json.loads(meta)
+        except json.JSONDecodeError:
+            pass
+    return entry
+
+
+def _entry_to_row(user_id: int, entry: dict) -> tuple:
+    meta = entry.get("meta")
+    return (
+        user_id,
+        entry["id"],
+        entry["type"],
+        entry["category"],
+        entry["amount"],
+        entry["note"],
+        entry["createdAt"],
+        json.dumps(meta, separators=(",", ":")) if isinstance(meta, dict) else None,
+    )
+
+
+def _rule_from_row(row: tuple) -> dict:
+    rule_id, rule_type, category, amount, note, frequency, next_due, active = row
+    return {
+        "id": rule_id,
+        "type": rule_type,
+        "category": category,
+        "amount": amount,
+        "note": note,
+        "frequency": frequency,
+        "nextDue": next_due,
+        "active": bool(active),
+    }
+
+
+def _next_change_seq(conn: sqlite3.Connection, user_id: int) -> int:
+    conn.execute(
+        """
+        INSERT INTO sync_state (user_id, seq, updated_at) VALUES (?, 1, ?)
+        ON CONFLICT (user_id) DO UPDATE SET seq = seq + 1, updated_at = excluded.updated_at
+        """,
+        (user_id, now_iso()),
+    )
+    return int(conn.execute("SELECT seq FROM sync_state WHERE user_id = ?", (user_id,)).fetchone()[0])
+
+
+def current_change_seq(conn: sqlite3.Connection, user_id: int) -> int:
+    row = conn.execute("SELECT seq FROM sync_state WHERE user_id = ?", (user_id,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _record_tombstones(conn: sqlite3.Connection, user_id: int, kind: str, item_ids: list[str], seq: int) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO tombstones (user_id, kind, item_id, seq) VALUES (?, ?, ?, ?)",
+        [(user_id, kind, item_id, seq) for item_id in item_ids],
+    )
+
+
+def _ensure_category_rows(conn: sqlite3.Connection, user_id: int, pairs: set[tuple[str, str]], seq: int) -> None:
+    rows = []
+    for entry_type, name in pairs:
+        rows.append(
+            (
+                user_id,
+                f"{entry_type}_{uuid.uuid4().hex[:10]}",
+                entry_type,
+                name,
+                normalize_color(category_fallback_color(entry_type, name)),
+                seq,
+            )
+        )
+    conn.executemany(
+        "INSERT OR IGNORE INTO categories (user_id, id, type, name, color, seq) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def budget_cycle_key(created_at: object, month_start_day: int = 1) -> str:
+    try:
+        day = date.fromisoformat(str(created_at or "")[:10])
+    except ValueError:
+        return "unknown"
+    if day.day >= month_start_day:
+        return f"{day.year:04d}-{day.month:02d}"
+    if day.month == 1:
+        return f"{day.year - 1:04d}-12"
+    return f"{day.year:04d}-{day.month - 1:02d}"
+
+
+def _month_start_day(conn: sqlite3.Connection, user_id: int) -> int:
+    row = conn.execute("SELECT month_start_day FROM settings WHERE user_id = ?", (user_id,)).fetchone()
+    return clamp_month_start_day(row[0]) if row else 1
+
+
+def _existing_entry_facts(conn: sqlite3.Connection, user_id: int, entry_ids: list[str]) -> list[tuple]:
+    facts = []
+    for start in range(0, len(entry_ids), SQLITE_MAX_PARAMS):
+        chunk = entry_ids[start:start + SQLITE_MAX_PARAMS]
+        facts.extend(
+            conn.execute(
+                f"SELECT type, category, amount, created_at FROM entries "
+                f"WHERE user_id = ? AND id IN ({', '.join('?' * len(chunk))})",
+                (user_id, *chunk),
+            ).fetchall()
+        )
+    return facts
+
+
+def _apply_rollup_deltas(
+    conn: sqlite3.Connection, user_id: int, removed: list[tuple], added: list[tuple]
+) -> None:
+    start_day = _month_start_day(conn, user_id)
+    deltas: dict[tuple[str, str, str], list] = {}
+    for facts, sign in ((removed, -1), (added, 1)):
+        for entry_type, category, amount, created_at in facts:
+            key = (budget_cycle_key(created_at, start_day), entry_type, category)
+            delta = deltas.setdefault(key, [0, 0])
+            delta[0] += sign * to_cents(amount)
+            delta[1] += sign
+    changed = [(user_id, *key, total, count) for key, (total, count) in deltas.items() if count or total]
+    if not changed:
+        return
+    conn.executemany(
+        """
+        INSERT INTO entry_rollups (user_id, cycle, type, category, total_cents, entry_count) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, cycle, type, category) DO UPDATE SET
+            total_cents = total_cents + excluded.total_cents,
+            entry_count = entry_count + excluded.entry_count
+        """,
+        changed,
+    )
+    conn.executemany(
+        "DELETE FROM entry_rollups WHERE user_id = ? AND cycle = ? AND type = ? AND category = ? AND entry_count <= 0",
+        [row[:4] for row in changed],
+    )
+
+
+def rebuild_rollups(conn: sqlite3.Connection, user_id: int) -> None:
+    conn.execute("DELETE FROM entry_rollups WHERE user_id = ?", (user_id,))
+    facts = conn.execute(
+        "SELECT type, category, amount, created_at FROM entries WHERE user_id = ?", (user_id,)
+    ).fetchall()
+    _apply_rollup_deltas(conn, user_id, [], facts)
+
+
+def _upsert_entry_rows(conn: sqlite3.Connection, user_id: int, entries: list[dict]) -> int:
+    # One row per id, last copy wins; a repeated id must not add its rollup delta twice.
+    entries = list({entry["id"]: entry for entry in entries}.values())
+    if not entries:
+        return 0
+    seq = _next_change_seq(conn, user_id)
+    removed = _existing_entry_facts(conn, user_id, [entry["id"] for entry in entries])
+    conn.executemany(
+        """
+        INSERT INTO entries (user_id, id, type, category, amount, note, created_at, meta, seq)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, id) DO UPDATE SET
+            type = excluded.type,
+            category = excluded.category,
+            amount = excluded.amount,
+            note = excluded.note,
+            created_at = excluded.created_at,
+            meta = excluded.meta,
+            seq = excluded.seq
+        """,
+        [(*_entry_to_row(user_id, entry), seq) for entry in entries],
+    )
+    _apply_rollup_deltas(
+        conn,
+        user_id,
+        removed,
+        [(entry["type"], entry["category"], entry["amount"], entry["createdAt"]) for entry in entries],
+    )
+    _ensure_category_rows(conn, user_id, {(entry["type"], entry["category"]) for entry in entries}, seq)
+    return len(entries)
+
+
+def _delete_entry_rows(conn: sqlite3.Connection, user_id: int, entry_ids: list[str]) -> int:
+    removed = _existing_entry_facts(conn, user_id, entry_ids)
+    if not removed:
+        return 0
+    _apply_rollup_deltas(conn, user_id, removed, [])
+    cursor = conn.executemany(
+        "DELETE FROM entries WHERE user_id = ? AND id = ?",
+        [(user_id, entry_id) for entry_id in entry_ids],
+    )
+    if cursor.rowcount > 0:
+        _record_tombstones(conn, user_id, "entries", entry_ids, _next_change_seq(conn, user_id))
+    return cursor.rowcount
+
+
+def create_user(
+    conn: sqlite3.Connection, email: object, password: str, hasher: Optional[PasswordHasher] = None
+) -> int:
+    normalized = normalize_email(email)
+    if not is_valid_email(normalized):
+        raise ValueError("Enter a valid email address.")
+    if len(password or "") < MIN_PASSWORD_LENGTH:
+        raise ValueError(f"Password must be at least {MIN_PASSWORD_LENGTH} characters.")
+    salt_b64, digest_b64 = (hasher.create_password_record if hasher else create_password_record)(password)
+    try:
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO users (email, password_salt, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                (normalized, salt_b64, digest_b64, now_iso()),
+            )
+            user_id = int(cursor.lastrowid)
+            conn.execute("INSERT INTO settings (user_id) VALUES (?)", (user_id,))
+            catalog = build_default_category_catalog()
+            conn.executemany(
+                "INSERT INTO categories (user_id, id, type, name, color) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (user_id, category["id"], entry_type, category["name"], category["color"])
+                    for entry_type in ("expense", "income")
+                    for category in catalog[entry_type]
+                ],
+            )
+    except sqlite3.IntegrityError:
+        raise ValueError("An account with that email already exists.") from None
+    return user_id
+
+
+def authenticate_user(
+    conn: sqlite3.Connection, email: object, password: str, hasher: Optional[PasswordHasher] = None
+) -> Optional[int]:
+    row = conn.execute(
+        "SELECT id, password_salt, password_hash FROM users WHERE email = ?",
+        (normalize_email(email),),
+    ).fetchone()
+    # Unknown emails still pay for one hash so response timing does not reveal which accounts exist.
+    user_id, salt_b64, digest_b64 = row if row is not None else (None, UNKNOWN_USER_SALT, UNKNOWN_USER_DIGEST)
+    verify = hasher.verify_password if hasher else verify_password
+    matched = verify(password or "", salt_b64, digest_b64)
+    return int(user_id) if matched and user_id is not None else None
+
+
+def create_session(conn: sqlite3.Connection, user_id: int) -> str:
+    token = secrets.token_urlsafe(32)
+    created = now_utc()
+    with conn:
+        conn.execute(
+            "INSERT INTO sessions (token, user_id, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (token, user_id, created.isoformat(), (created + timedelta(days=SESSION_TTL_DAYS)).isoformat()),
+        )
+    return token
+
+
+def get_session(conn: sqlite3.Connection, token: object) -> Optional[tuple[int, datetime]]:
+    if not token:
+        return None
+    row = conn.execute("SELECT user_id, expires_at FROM sessions WHERE token = ?", (str(token),)).fetchone()
+    if row is None:
+        return None
+    expires_at = parse_iso(row[1])
+    if expires_at is None or expires_at <= now_utc():
+        delete_session(conn, token)
+        return None
+    return int(row[0]), expires_at
+
+
+def get_session_user_id(conn: sqlite3.Connection, token: object) -> Optional[int]:
+    session = get_session(conn, token)
+    return session[0] if session is not None else None
+
+
+def delete_session(conn: sqlite3.Connection, token: object) -> None:
+    with conn:
+        conn.execute("DELETE FROM sessions WHERE token = ?", (str(token),))
+
+
+def delete_user_sessions(conn: sqlite3.Connection, user_id: int) -> None:
+    with conn:
+        conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+
+
+def change_password(
+    conn: sqlite3.Connection,
+    user_id: int,
+    current_password: str,
+    new_password: str,
+    hasher: Optional[PasswordHasher] = None,
+) -> bool:
+    if len(new_password or "") < MIN_PASSWORD_LENGTH:
+        raise ValueError(f"Password must be at least {MIN_PASSWORD_LENGTH} characters.")
+    row = conn.execute("SELECT password_salt, password_hash FROM users WHERE id = ?", (user_id,)).fetchone()
+    if row is None:
+        return False
+    verify = hasher.verify_password if hasher else verify_password
+    if not verify(current_password or "", row[0], row[1]):
+        return False
+    salt_b64, digest_b64 = (hasher.create_password_record if hasher else create_password_record)(new_password)
+    with conn:
+        conn.execute(
+            "UPDATE users SET password_salt = ?, password_hash = ? WHERE id = ?",
+            (salt_b64, digest_b64, user_id),
+        )
+        conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+    return True
+
+
+def insert_entry(conn: sqlite3.Connection, user_id: int, raw: object) -> Optional[dict]:
+    entry = sanitize_entry(raw)
+    if entry is None:
+        return None
+    with conn:
+        _upsert_entry_rows(conn, user_id, [entry])
+    return entry
+
+
+def delete_entry(conn: sqlite3.Connection, user_id: int, entry_id: str) -> bool:
+    with conn:
+        return _delete_entry_rows(conn, user_id, [entry_id]) > 0
+
+
+def list_entries(
+    conn: sqlite3.Connection,
+    user_id: int,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    category: Optional[str] = None,
+) -> list[dict]:
+    clauses = ["user_id = ?"]
+    params: list = [user_id]
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    if start:
+        clauses.append("created_at >= ?")
+        params.append(start)
+    if end:
+        clauses.append("created_at < ?")
+        params.append(end)
+    rows = conn.execute(
+        f"SELECT id, type, category, amount, note, created_at, meta FROM entries "
+        f"WHERE {' AND '.join(clauses)} ORDER BY created_at DESC",
+        params,
+    ).fetchall()
+    return [_entry_from_row(row) for row in rows]
+
+
+def _upsert_rule_rows(conn: sqlite3.Connection, user_id: int, rules: list[dict]) -> None:
+    if not rules:
+        return
+    seq = _next_change_seq(conn, user_id)
+    conn.executemany(
+        """
+        INSERT INTO recurring_rules
+            (user_id, id, type, category, amount, note, frequency, next_due, active, seq, anchor_day)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(substr(?, 9, 2) AS INTEGER))
+        ON CONFLICT (user_id, id) DO UPDATE SET
+            type = excluded.type,
+            category = excluded.category,
+            amount = excluded.amount,
+            note = excluded.note,
+            frequency = excluded.frequency,
+            anchor_day = CASE
+                WHEN excluded.next_due = recurring_rules.next_due THEN recurring_rules.anchor_day
+                ELSE excluded.anchor_day
+            END,
+            next_due = excluded.next_due,
+            active = excluded.active,
+            seq = excluded.seq
+        """,
+        [
+            (
+                user_id,
+                rule["id"],
+                rule["type"],
+                rule["category"],
+                rule["amount"],
+                rule["note"],
+                rule["frequency"],
+                rule["nextDue"],
+                int(rule["active"]),
+                seq,
+                rule["nextDue"],
+            )
+            for rule in rules
+        ],
+    )
+
+
+def _delete_rule_rows(conn: sqlite3.Connection, user_id: int, rule_ids: list[str]) -> int:
+    cursor = conn.executemany(
+        "DELETE FROM recurring_rules WHERE user_id = ? AND id = ?",
+        [(user_id, rule_id) for rule_id in rule_ids],
+    )
+    if cursor.rowcount > 0:
+        _record_tombstones(conn, user_id, "recurringRules", rule_ids, _next_change_seq(conn, user_id))
+    return cursor.rowcount
+
+
+def _upsert_category_rows(conn: sqlite3.Connection, user_id: int, rows: list[tuple[str, str, str, str]]) -> None:
+    if not rows:
+        return
+    seq = _next_change_seq(conn, user_id)
+    conn.executemany(
+        """
+        INSERT INTO categories (user_id, id, type, name, color, seq) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, id) DO UPDATE SET name = excluded.name, color = excluded.color, seq = excluded.seq
+        """,
+        [(user_id, category_id, entry_type, name, color, seq) for category_id, entry_type, name, color in rows],
+    )
+
+
+def _delete_category_rows(conn: sqlite3.Connection, user_id: int, category_ids: list[str]) -> int:
+    cursor = conn.executemany(
+        "DELETE FROM categories WHERE user_id = ? AND id = ?",
+        [(user_id, category_id) for category_id in category_ids],
+    )
+    if cursor.rowcount > 0:
+        _record_tombstones(conn, user_id, "categories", category_ids, _next_change_seq(conn, user_id))
+    return cursor.rowcount
+
+
+def save_recurring_rule(conn: sqlite3.Connection, user_id: int, raw: object) -> Optional[dict]:
+    rule = sanitize_recurring_rule(raw)
+    if rule is None:
+        return None
+    with conn:
+        _upsert_rule_rows(conn, user_id, [rule])
+    return rule
+
+
+def delete_recurring_rule(conn: sqlite3.Connection, user_id: int, rule_id: str) -> bool:
+    with conn:
+        return _delete_rule_rows(conn, user_id, [rule_id]) > 0
+
+
+def list_recurring_rules(conn: sqlite3.Connection, user_id: int) -> list[dict]:
+    rows = conn.execute(
+        "SELECT id, type, category, amount, note, frequency, next_due, active "
+        "FROM recurring_rules WHERE user_id = ? ORDER BY next_due",
+        (user_id,),
+    ).fetchall()
+    return [_rule_from_row(row) for row in rows]
+
+
+def save_category(
+    conn: sqlite3.Connection, user_id: int, entry_type: str, name: str, color: str = "", category_id: str = ""
+) -> Optional[dict]:
+    normalized_type = "income" if entry_type == "income" else "expense"
+    value = str(name or "").strip()
+    if not value:
+        return None
+    category = {
+        "id": str(category_id or f"{normalized_type}_{uuid.uuid4().hex[:10]}"),
+        "name": value,
+        "color": normalize_color(color or category_fallback_color(normalized_type, value)),
+    }
+    try:
+        with conn:
+            _upsert_category_rows(
+                conn, user_id, [(category["id"], normalized_type, category["name"], category["color"])]
+            )
+    except sqlite3.IntegrityError:
+        return None
+    return category
+
+
+def delete_category(conn: sqlite3.Connection, user_id: int, category_id: str) -> bool:
+    with conn:
+        return _delete_category_rows(conn, user_id, [category_id]) > 0
+
+
+def list_categories(conn: sqlite3.Connection, user_id: int) -> dict:
+    catalog = {"expense": [], "income": []}
+    rows = conn.execute(
+        "SELECT id, type, name, color FROM categories WHERE user_id = ? ORDER BY name COLLATE NOCASE",
+        (user_id,),
+    ).fetchall()
+    for category_id, entry_type, name, color in rows:
+        catalog["income" if entry_type == "income" else "expense"].append(
+            {"id": category_id, "name": name, "color": color}
+        )
+    return catalog
+
+
+def get_settings(conn: sqlite3.Connection, user_id: int) -> tuple[float, dict]:
+    row = conn.execute(
+        "SELECT budget, default_type, data_scope, month_start_day, sort_order FROM settings WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
+    if row is None:
+        return 0.0, sanitize_settings(None)
+    budget, default_type, data_scope, month_start_day, sort_order = row
+    settings = sanitize_settings(
+        {
+            "defaultType": default_type,
+            "dataScope": data_scope,
+            "monthStartDay": month_start_day,
+            "sortOrder": sort_order,
+        }
+    )
+    return as_non_negative_number(budget), settings
+
+
+def _write_settings_row(conn: sqlite3.Connection, user_id: int, settings: dict, budget: float) -> None:
+    previous_start_day = _month_start_day(conn, user_id)
+    conn.execute(
+        """
+        INSERT INTO settings (user_id, budget, default_type, data_scope, month_start_day, sort_order, seq)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id) DO UPDATE SET
+            budget = excluded.budget,
+            default_type = excluded.default_type,
+            data_scope = excluded.data_scope,
+            month_start_day = excluded.month_start_day,
+            sort_order = excluded.sort_order,
+            seq = excluded.seq
+        """,
+        (
+            user_id,
+            budget,
+            settings["defaultType"],
+            settings["dataScope"],
+            settings["monthStartDay"],
+            settings["sortOrder"],
+            _next_change_seq(conn, user_id),
+        ),
+    )
+    if settings["monthStartDay"] != previous_start_day:
+        rebuild_rollups(conn, user_id)
+
+
+def save_settings(conn: sqlite3.Connection, user_id: int, raw: object, budget: object = None) -> dict:
+    settings = sanitize_settings(raw)
+    current_budget, _ = get_settings(conn, user_id)
+    value = current_budget if budget is None else as_non_negative_number(budget)
+    with conn:
+        _write_settings_row(conn, user_id, settings, value)
+    return settings
+
+
+def load_user_state(conn: sqlite3.Connection, user_id: int) -> dict:
+    budget, settings = get_settings(conn, user_id)
+    return {
+        "budget": budget,
+        "entries": list_entries(conn, user_id),
+        "recurringRules": list_recurring_rules(conn, user_id),
+        "settings": settings,
+        "categoryCatalog": list_categories(conn, user_id),
+    }
+
+
+def current_budget_cycle(month_start_day: int, today: Optional[date] = None) -> str:
+    return budget_cycle_key((today or now_utc().date()).isoformat(), month_start_day)
+
+
+def summarize_rollups(conn: sqlite3.Connection, user_id: int, cycle: Optional[str] = None) -> dict:
+    budget, settings = get_settings(conn, user_id)
+    cycle = cycle or current_budget_cycle(settings["monthStartDay"])
+    if cycle == "all":
+        rows = conn.execute(
+            "SELECT type, category, SUM(total_cents), SUM(entry_count) FROM entry_rollups "
+            "WHERE user_id = ? GROUP BY type, category",
+            (user_id,),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT type, category, total_cents, entry_count FROM entry_rollups WHERE user_id = ? AND cycle = ?",
+            (user_id, cycle),
+        ).fetchall()
+    totals = {"income": 0, "expense": 0}
+    categories = []
+    for entry_type, category, cents, count in rows:
+        totals[entry_type] = totals.get(entry_type, 0) + cents
+        categories.append({"type": entry_type, "category": category, "total": from_cents(cents), "count": count})
+    categories.sort(key=lambda item: item["total"], reverse=True)
+    months = {}
+    for month, entry_type, cents in conn.execute(
+        "SELECT cycle, type, SUM(total_cents) FROM entry_rollups WHERE user_id = ? AND cycle != 'unknown' "
+        "GROUP BY cycle, type ORDER BY cycle",
+        (user_id,),
+    ):
+        months.setdefault(month, {"cycle": month, "income": 0.0, "expense": 0.0})[entry_type] = from_cents(cents)
+    budget_cents = to_cents(budget)
+    return {
+        "cycle": cycle,
+        "income": from_cents(totals["income"]),
+        "expense": from_cents(totals["expense"]),
+        "balance": from_cents(totals["income"] - totals["expense"]),
+        "budget": budget,
+        "remaining": from_cents(budget_cents - totals["expense"]),
+        "categories": categories,
+        "months": list(months.values())[-SUMMARY_CHART_CYCLES:],
+    }
+
+
+def import_user_state(conn: sqlite3.Connection, user_id: int, raw: object) -> dict:
+    source = raw if isinstance(raw, dict) else {}
+    entries = [entry for entry in map(sanitize_entry, source.get("entries") or []) if entry is not None]
+    rules = [rule for rule in map(sanitize_recurring_rule, source.get("recurringRules") or []) if rule is not None]
+    catalog = source.get("categoryCatalog") if isinstance(source.get("categoryCatalog"), dict) else None
+    if catalog is None:
+        catalog = build_default_category_catalog()
+    with conn:
+        for table, delete_rows in (
+            ("entries", _delete_entry_rows),
+            ("recurring_rules", _delete_rule_rows),
+            ("categories", _delete_category_rows),
+        ):
+            existing = [row[0] for row in conn.execute(f"SELECT id FROM {table} WHERE user_id = ?", (user_id,))]
+            delete_rows(conn, user_id, existing)
+        seq = _next_change_seq(conn, user_id)
+        conn.executemany(
+            "INSERT OR IGNORE INTO categories (user_id, id, type, name, color, seq) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    user_id,
+                    str(category.get("id") or f"{entry_type}_{uuid.uuid4().hex[:10]}"),
+                    entry_type,
+                    str(category.get("name", "")).strip(),
+                    normalize_color(category.get("color")),
+                    seq,
+                )
+                for entry_type in ("expense", "income")
+                for category in catalog.get(entry_type) or []
+                if isinstance(category, dict) and str(category.get("name", "")).strip()
+            ],
+        )
+        _upsert_entry_rows(conn, user_id, entries)
+        _upsert_rule_rows(conn, user_id, rules)
+        _write_settings_row(
+            conn,
+            user_id,
+            sanitize_settings(source.get("settings")),
+            as_non_negative_number(source.get("budget", 0.0)),
+        )
+    return load_user_state(conn, user_id)
+
+
+def parse_sync_cursor(value: object) -> int:
+    if value in (None, ""):
+        return -1
+    try:
+        cursor = int(str(value))
+    except ValueError:
+        raise ValueError("Sync cursor is invalid.") from None
+    if cursor < 0:
+        raise ValueError("Sync cursor is invalid.")
+    return cursor
+
+
+def collect_changes(conn: sqlite3.Connection, user_id: int, since: int = -1) -> dict:
+    # since=-1 is a full snapshot; otherwise clients apply "deleted" before the upserted rows.
+    conn.execute("BEGIN")
+    try:
+        cursor = current_change_seq(conn, user_id)
+        entries = [
+            _entry_from_row(row)
+            for row in conn.execute(
+                "SELECT id, type, category, amount, note, created_at, meta FROM entries "
+                "WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, since),
+            )
+        ]
+        rules = [
+            _rule_from_row(row)
+            for row in conn.execute(
+                "SELECT id, type, category, amount, note, frequency, next_due, active FROM recurring_rules "
+                "WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, since),
+            )
+        ]
+        categories = [
+            {"id": category_id, "type": entry_type, "name": name, "color": color}
+            for category_id, entry_type, name, color in conn.execute(
+                "SELECT id, type, name, color FROM categories WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, since),
+            )
+        ]
+        settings_row = conn.execute(
+            "SELECT 1 FROM settings WHERE user_id = ? AND seq > ?", (user_id, since)
+        ).fetchone()
+        deleted = {kind: [] for kind in SYNC_KINDS}
+        if since >= 0:
+            for kind, item_id in conn.execute(
+                "SELECT kind, item_id FROM tombstones WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, since),
+            ):
+                deleted.setdefault(kind, []).append(item_id)
+        changes = {
+            "cursor": str(cursor),
+            "full": since < 0,
+            "entries": entries,
+            "recurringRules": rules,
+            "categories": categories,
+            "deleted": deleted,
+        }
+        if settings_row is not None:
+            budget, settings = get_settings(conn, user_id)
+            changes["budget"] = budget
+            changes["settings"] = settings
+    finally:
+        conn.execute("COMMIT")
+    return changes
+
+
+def _change_list(source: dict, key: str, where: str = "") -> list:
+    value = source.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{where}{key} must be an array.")
+    return value
+
+
+def apply_changes(conn: sqlite3.Connection, user_id: int, raw: object) -> dict:
+    source = raw if isinstance(raw, dict) else {}
+    deleted = source.get("deleted") or {}
+    if not isinstance(deleted, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "deleted must be an object.")
+    deleted_entries = _change_list(deleted, "entries", "deleted.")
+    deleted_rules = _change_list(deleted, "recurringRules", "deleted.")
+    deleted_categories = _change_list(deleted, "categories", "deleted.")
+    rejected = 0
+    entries = []
+    for raw_entry in _change_list(source, "entries"):
+        entry = sanitize_entry(raw_entry)
+        if entry is None:
+            rejected += 1
+        else:
+            entries.append(entry)
+    rules = []
+    for raw_rule in _change_list(source, "recurringRules"):
+        rule = sanitize_recurring_rule(raw_rule)
+        if rule is None:
+            rejected += 1
+        else:
+            rules.append(rule)
+    categories = []
+    for raw_category in _change_list(source, "categories"):
+        name = str(raw_category.get("name", "")).strip() if isinstance(raw_category, dict) else ""
+        if not name:
+            rejected += 1
+            continue
+        entry_type = "income" if raw_category.get("type") == "income" else "expense"
+        categories.append(
+            (
+                str(raw_category.get("id") or f"{entry_type}_{uuid.uuid4().hex[:10]}"),
+                entry_type,
+                name,
+                normalize_color(raw_category.get("color") or category_fallback_color(entry_type, name)),
+            )
+        )
+    with conn:
+        _delete_entry_rows(conn, user_id, [str(item) for item in deleted_entries])
+        _delete_rule_rows(conn, user_id, [str(item) for item in deleted_rules])
+        _delete_category_rows(conn, user_id, [str(item) for item in deleted_categories])
+        for category in categories:
+            try:
+                _upsert_category_rows(conn, user_id, [category])
+            except sqlite3.IntegrityError:
+                rejected += 1
+        _upsert_entry_rows(conn, user_id, entries)
+        _upsert_rule_rows(conn, user_id, rules)
+        if "settings" in source or "budget" in source:
+            current_budget, current_settings = get_settings(conn, user_id)
+            budget = source.get("budget")
+            _write_settings_row(
+                conn,
+                user_id,
+                sanitize_settings(source.get("settings", current_settings)),
+                current_budget if budget is None else as_non_negative_number(budget),
+            )
+    return {"cursor": str(current_change_seq(conn, user_id)), "rejectedCount": rejected}
+
+
+def _add_months(day: date, months: int, anchor_day: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(anchor_day, calendar.monthrange(year, month + 1)[1]))
+
+
+def recurring_due_dates(
+    frequency: str, next_due: date, until: date, limit: int = RECURRING_MAX_CATCH_UP, anchor_day: int = 0
+) -> tuple[list[date], date]:
+    """Return every occurrence from ``next_due`` through ``until`` (capped at ``limit``) and the following due date.
+
+    Monthly rules land on ``anchor_day`` (clamped to the month's length), defaulting to ``next_due.day``.
+    """
+    frequency = normalize_recurring_frequency(frequency)
+    if next_due > until:
+        return [], next_due
+    if frequency in {"weekly", "bi-weekly"}:
+        step = 7 if frequency == "weekly" else 14
+        count = min(limit, (until - next_due).days // step + 1)
+        dates = [next_due + timedelta(days=step * index) for index in range(count)]
+        return dates, next_due + timedelta(days=step * count)
+    if frequency == "semi-monthly":
+        # Occurrences after the first land on the 1st and 15th; slot 2n is the 1st of month n, 2n+1 the 15th.
+        def slot_date(slot: int) -> date:
+            year, month = divmod(slot // 2, 12)
+            return date(year, month + 1, 15 if slot % 2 else 1)
+
+        month_index = next_due.year * 12 + next_due.month - 1
+        first_slot = month_index * 2 + (1 if next_due.day < 15 else 2)
+        last_slot = (until.year * 12 + until.month - 1) * 2 + (1 if until.day >= 15 else 0)
+        count = min(limit - 1, max(0, last_slot - first_slot + 1))
+        dates = [next_due, *(slot_date(first_slot + index) for index in range(count))]
+        return dates, slot_date(first_slot + count)
+    day = anchor_day if 1 <= anchor_day <= 31 else next_due.day
+    months = (until.year - next_due.year) * 12 + until.month - next_due.month
+    if _add_months(next_due, months, day) > until:
+        months -= 1
+    count = min(limit, months + 1)
+    dates = [next_due, *(_add_months(next_due, index, day) for index in range(1, count))]
+    return dates, _add_months(next_due, count, day)
+
+
+def post_due_recurring_entries(conn: sqlite3.Connection, today: Optional[date] = None) -> int:
+    today = today or now_utc().date()
+    rows = conn.execute(
+        "SELECT user_id, id, type, category, amount, note, frequency, next_due, active, anchor_day "
+        "FROM recurring_rules WHERE active = 1 AND next_due <= ? ORDER BY user_id",
+        (today.isoformat(),),
+    ).fetchall()
+    rules_by_user: dict[int, list[tuple[dict, int]]] = {}
+    for row in rows:
+        rules_by_user.setdefault(row[0], []).append((_rule_from_row(row[1:-1]), row[-1]))
+    posted = 0
+    for user_id, rules in rules_by_user.items():
+        advances = []
+        for rule, anchor_day in rules:
+            try:
+                next_due = date.fromisoformat(rule["nextDue"][:10])
+            except ValueError:
+                next_due = today
+            due_dates, rule_next_due = recurring_due_dates(
+                rule["frequency"], next_due, today, anchor_day=anchor_day
+            )
+            entries = [
+                {
+                    "id": f"rec_{rule['id']}_{due.isoformat()}",
+                    "type": rule["type"],
+                    "category": rule["category"],
+                    "amount": rule["amount"],
+                    "note": rule["note"] or "Recurring entry",
+                    "createdAt": f"{due.isoformat()}T00:00:00",
+                    "meta": {"recurring": True, "recurringRuleId": rule["id"]},
+                }
+                for due in due_dates
+            ]
+            advances.append((rule, rule_next_due.isoformat(), entries))
+        with conn:
+            seq = _next_change_seq(conn, user_id)
+            entries = []
+            for rule, rule_next_due, rule_entries in advances:
+                # Only advance the rule as it was read: a delete, pause or reschedule since then wins.
+                cursor = conn.execute(
+                    "UPDATE recurring_rules SET next_due = ?, seq = ? "
+                    "WHERE user_id = ? AND id = ? AND next_due = ? AND active = 1",
+                    (rule_next_due, seq, user_id, rule["id"], rule["nextDue"]),
+                )
+                if cursor.rowcount == 1:
+                    entries.extend(rule_entries)
+            _upsert_entry_rows(conn, user_id, entries)
+        posted += len(entries)
+    return posted
+
+
+class RecurringScheduler:
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, interval: float = RECURRING_INTERVAL_SECONDS) -> None:
+        self.db_path = db_path
+        self.interval = interval
+        self.last_posted = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="recurring-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_once(self) -> int:
+        conn = connect_db(self.db_path)
+        try:
+            self.last_posted = post_due_recurring_entries(conn)
+        finally:
+            conn.close()
+        return self.last_posted
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # One bad rule or a transient error must not stop posting for good; try again next interval.
+                LOGGER.exception("Recurring posting failed")
+            self._stop.wait(self.interval)
+
+
+class GroupCommitWriter:
+    """Single writer thread that commits queued writes from many requests in one transaction."""
+
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        interval: float = GROUP_COMMIT_INTERVAL_SECONDS,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+    ) -> None:
+        self.db_path = db_path
+        self.interval = max(0.0, float(interval))
+        self.max_batch = max(1, int(max_batch))
+        self.commits = 0
+        self.writes = 0
+        self._conn = connect_db(db_path)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Guards _closed so nothing is queued after the writer thread has drained the queue for the last time.
+        self._state_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, user_id: int, operation) -> Future:
+        future: Future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("Group commit writer is closed.")
+            self._queue.put((user_id, operation, future))
+        return future
+
+    def write(self, user_id: int, operation):
+        # Returns once the batch holding this write has committed (synchronous=FULL makes that durable).
+        return self.submit(user_id, operation).result()
+
+    def close(self) -> None:
+        with self._state_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = self._conn
+        batch: list[tuple] = []
+        error: BaseException = RuntimeError("Group commit writer is closed.")
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.interval
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit(conn, batch)
+        except BaseException as exc:
+            error = exc
+            LOGGER.exception("Group commit writer stopped")
+        finally:
+            conn.close()
+            with self._state_lock:
+                self._closed = True
+            # Nothing can be queued now; fail whatever is left so no caller waits on a write that will never run.
+            pending = [item for item in batch if item is not None]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    pending.append(item)
+            for _user_id, _operation, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _commit(self, conn: sqlite3.Connection, batch: list[tuple]) -> None:
+        # Keep each user's writes adjacent so their change sequence is bumped in arrival order.
+        batch.sort(key=lambda item: item[0])
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for _user_id, operation, future in batch:
+                conn.execute("SAVEPOINT group_write")
+                try:
+                    outcomes.append((future, operation(conn), None))
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO group_write")
+                    outcomes.append((future, None, exc))
+                conn.execute("RELEASE group_write")
+            conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            for _user_id, _operation, future in batch:
+                future.set_exception(exc)
+            return
+        self.commits += 1
+        self.writes += len(batch)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+def iter_ndjson_records(chunks: Iterable[bytes]) -> Iterator[tuple[object, Optional[str]]]:
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        if len(pending) > BULK_MAX_RECORD_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "A bulk record exceeds the per-record size limit.")
+        for line in lines:
+            yield from _parse_ndjson_line(line)
+    yield from _parse_ndjson_line(pending)
+
+
+def _parse_ndjson_line(line: bytes) -> Iterator[tuple[object, Optional[str]]]:
+    if not line.strip():
+        return
+    try:
+        yield json.loads(line.decode("utf-8")), None
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        yield None, "Line is not valid JSON."
+
+
+def iter_json_array_records(chunks: Iterable[bytes]) -> Iterator[tuple[object, Optional[str]]]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    state = "start"
+    chunk_iter = iter(chunks)
+    final = False
+    while state != "done":
+        try:
+            buffer += text_decoder.decode(next(chunk_iter))
+        except StopIteration:
+            buffer += text_decoder.decode(b"", final=True)
+            final = True
+        except UnicodeDecodeError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Bulk body must be UTF-8 encoded JSON.") from None
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if state == "start":
+                if buffer[pos] != "[":
+                    raise ApiError(HTTPStatus.BAD_REQUEST, "Bulk JSON body must be an array of entries.")
+                pos += 1
+                state = "item"
+                continue
+            if buffer[pos] == "]" and state in {"item", "separator"}:
+                pos += 1
+                state = "done"
+                break
+            if state == "separator":
+                if buffer[pos] != ",":
+                    raise ApiError(HTTPStatus.BAD_REQUEST, "Bulk JSON array is malformed.")
+                pos += 1
+                state = "item"
+                continue
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ApiError(HTTPStatus.BAD_REQUEST, "Bulk JSON array is malformed.") from None
+                break
+            if end >= len(buffer) and not final:
+                break
+            yield record, None
+            pos = end
+            state = "separator"
+        buffer = buffer[pos:]
+        if len(buffer) > BULK_MAX_RECORD_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "A bulk record exceeds the per-record size limit.")
+        if final and state != "done":
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Bulk JSON array ended early.")
+
+
+def ingest_entries(
+    conn: sqlite3.Connection,
+    user_id: int,
+    records: Iterable[tuple[object, Optional[str]]],
+    batch_size: int = BULK_BATCH_SIZE,
+) -> dict:
+    inserted = 0
+    rejected = []
+    rejected_count = 0
+    batch = []
+    seen: set[str] = set()
+
+    def flush() -> int:
+        if not batch:
+            return 0
+        with conn:
+            _upsert_entry_rows(conn, user_id, batch)
+        # An id already written by an earlier batch of this request was updated in place, not stored again.
+        count = len({entry["id"] for entry in batch} - seen)
+        seen.update(entry["id"] for entry in batch)
+        batch.clear()
+        return count
+
+    try:
+        for index, (raw, error) in enumerate(records):
+            entry = sanitize_entry(raw) if error is None else None
+            if entry is None:
+                rejected_count += 1
+                if len(rejected) < BULK_MAX_REPORTED_REJECTS:
+                    rejected.append(
+                        {"index": index, "error": error or "Entry needs a category and a non-negative amount."}
+                    )
+                continue
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                inserted += flush()
+    except ApiError as exc:
+        # Earlier batches are already committed; say how many so the client can resume instead of resending.
+        raise ApiError(
+            exc.status,
+            f"{exc.message} {inserted} entries before the error were saved.",
+            exc.headers,
+            {"inserted": inserted},
+        ) from exc
+    inserted += flush()
+    return {"inserted": inserted, "rejectedCount": rejected_count, "rejected": rejected}
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_CONNECTIONS = 4096
+DEFAULT_MAX_INFLIGHT = 64
+DEFAULT_WORKER_THREADS = min(32, (os.cpu_count() or 1) + 4)
+KEEP_ALIVE_TIMEOUT_SECONDS = 15.0
+MAX_HEADER_LINES = 100
+JSON_HEADERS = [("Content-Type", "application/json; charset=utf-8"), ("Cache-Control", "no-store")]
+
+Response = tuple[HTTPStatus, list[tuple[str, str]], bytes]
+
+
+class ApiError(Exception):
+    def __init__(
+        self, status: HTTPStatus, message: str, headers: Optional[list] = None, details: Optional[dict] = None
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or []
+        self.details = details or {}
+
+
+class BodyStream:
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self.exhausted = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._chunks
+        self.exhausted = True
+
+
+def iter_request_body(rfile, headers: dict, limit: int = BULK_MAX_BODY_BYTES) -> Iterator[bytes]:
+    total = 0
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = rfile.readline(1024)
+            if not size_line:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Request body ended early.")
+            try:
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            except ValueError:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed chunked body.") from None
+            if size == 0:
+                while rfile.readline(1024) not in {b"\r\n", b"\n", b""}:
+                    pass
+                return
+            total += size
+            if total > limit:
+                raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large.")
+            while size > 0:
+                chunk = rfile.read(min(BULK_READ_CHUNK_BYTES, size))
+                if not chunk:
+                    raise ApiError(HTTPStatus.BAD_REQUEST, "Request body ended early.")
+                size -= len(chunk)
+                yield chunk
+            rfile.readline(1024)
+    try:
+        remaining = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.") from None
+    if remaining > limit:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large.")
+    while remaining > 0:
+        chunk = rfile.read(min(BULK_READ_CHUNK_BYTES, remaining))
+        if not chunk:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request body ended early.")
+        remaining -= len(chunk)
+        yield chunk
+
+
+class ApiRequest:
+    def __init__(
+        self, method: str, target: str, headers: dict, body: bytes = b"", stream: Optional[BodyStream] = None
+    ) -> None:
+        parsed = urlparse(target)
+        self.method = method.upper()
+        self.path = unquote(parsed.path) or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        self.headers = {str(key).lower(): str(value) for key, value in headers.items()}
+        self.body = body
+        if stream is None:
+            stream = BodyStream(iter([body] if body else []))
+            stream.exhausted = True
+        self.stream = stream
+
+    def cookie(self, name: str) -> str:
+        cookies = SimpleCookie()
+        try:
+            cookies.load(self.headers.get("cookie", ""))
+        except Exception:
+            return ""
+        morsel = cookies.get(name)
+        return morsel.value if morsel is not None else ""
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request body must be valid JSON.") from None
+        if not isinstance(payload, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object.")
+        return payload
+
+
+def json_response(status: HTTPStatus, payload: object, headers: Optional[list] = None) -> Response:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return status, [*JSON_HEADERS, *(headers or [])], body
+
+
+def session_cookie_header(token: str, max_age: int) -> tuple[str, str]:
+    return (
+        "Set-Cookie",
+        f"{SESSION_COOKIE_NAME}={token}; Path=/; HttpOnly; SameSite=Lax; Max-Age={max_age}",
+    )
+
+
+class StaticAsset:
+    def __init__(self, path: Path, mtime_ns: int, size: int, content_type: str, data: bytes) -> None:
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.content_type = content_type
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        self.variants = {"identity": data}
+        self.etags = {"identity": f'"{digest}"'}
+        if len(data) >= STATIC_COMPRESS_MIN_BYTES and content_type.startswith(STATIC_COMPRESSIBLE_TYPES):
+            compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(data, quality=11)
+            for encoding, payload in compressed.items():
+                if len(payload) < len(data):
+                    self.variants[encoding] = payload
+                    self.etags[encoding] = f'"{digest}-{encoding}"'
+
+
+def negotiate_encoding(accept_encoding: str, available) -> str:
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = min(1.0, max(0.0, float(value)))
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+    # identity stays acceptable unless excluded outright, but an unlisted identity loses to any listed coding.
+    fallback = weights.get("*", 0.0)
+    options = [(weights.get("identity", fallback if "*" in weights else 0.001), 0, "identity")]
+    for rank, encoding in ((2, "br"), (1, "gzip")):
+        if encoding in available:
+            options.append((weights.get(encoding, fallback), rank, encoding))
+    # Highest q wins and ties go to br, then gzip. With everything refused, identity is sent rather than a 406.
+    quality, _rank, best = max(options)
+    return best if quality > 0 else "identity"
+
+
+class StaticAssetCache:
+    def __init__(self, web_root: Path) -> None:
+        self.web_root = Path(web_root).resolve()
+        self._assets: dict[Path, StaticAsset] = {}
+        self._lock = threading.Lock()
+
+    def warm(self) -> int:
+        if not self.web_root.is_dir():
+            return 0
+        for path in self.web_root.rglob("*"):
+            if path.is_file():
+                self._get(path.resolve())
+        return len(self._assets)
+
+    def lookup(self, path: str, accept_encoding: str = "", if_none_match: str = "") -> Response:
+        relative = path.lstrip("/") or "index.html"
+        target = (self.web_root / relative).resolve()
+        if self.web_root not in target.parents:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Not found.")
+        asset = self._get(target)
+        if asset is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Not found.")
+        encoding = negotiate_encoding(accept_encoding, asset.variants)
+        headers = [
+            ("ETag", asset.etags[encoding]),
+            ("Cache-Control", "no-cache"),
+            ("Vary", "Accept-Encoding"),
+        ]
+        requested = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",") if tag.strip()}
+        if "*" in requested or requested & set(asset.etags.values()):
+            return HTTPStatus.NOT_MODIFIED, headers, b""
+        headers.insert(0, ("Content-Type", asset.content_type))
+        if encoding != "identity":
+            headers.append(("Content-Encoding", encoding))
+        return HTTPStatus.OK, headers, asset.variants[encoding]
+
+    def _get(self, target: Path) -> Optional[StaticAsset]:
+        try:
+            stat = target.stat()
+        except OSError:
+            return None
+        if not target.is_file():
+            return None
+        asset = self._assets.get(target)
+        if asset is not None and asset.mtime_ns == stat.st_mtime_ns and asset.size == stat.st_size:
+            return asset
+        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type = f"{content_type}; charset=utf-8"
+        try:
+            asset = StaticAsset(target, stat.st_mtime_ns, stat.st_size, content_type, target.read_bytes())
+        except OSError:
+            return None
+        with self._lock:
+            self._assets[target] = asset
+        return asset
+
+
+class SessionCache:
+    def __init__(self, max_entries: int = SESSION_CACHE_SIZE) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[int, datetime]] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[int]:
+        with self._lock:
+            cached = self._entries.get(token)
+            if cached is not None and cached[1] > now_utc():
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return cached[0]
+            if cached is not None:
+                self._discard(token)
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user_id: int, expires_at: datetime) -> None:
+        with self._lock:
+            self._discard(token)
+            self._entries[token] = (user_id, expires_at)
+            self._tokens_by_user.setdefault(user_id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            self._discard(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._discard(token)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _discard(self, token: str) -> None:
+        cached = self._entries.pop(token, None)
+        if cached is None:
+            return
+        tokens = self._tokens_by_user.get(cached[0])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[cached[0]]
+
+
+class BudgetBackend:
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        web_root: Path = DEFAULT_WEB_ROOT,
+        password_hasher: Optional[PasswordHasher] = None,
+        session_cache: Optional[SessionCache] = None,
+        group_writer: Optional[GroupCommitWriter] = None,
+    ) -> None:
+        self.db_path = db_path
+        self.web_root = Path(web_root).resolve()
+        self.static_cache = StaticAssetCache(self.web_root)
+        self.static_cache.warm()
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.session_cache = session_cache or SessionCache()
+        self.group_writer = group_writer
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._routes = {
+            ("GET", "health", False): self._health,
+            ("POST", "signup", False): self._signup,
+            ("POST", "login", False): self._login,
+            ("POST", "logout", False): self._logout,
+            ("GET", "me", False): self._me,
+            ("POST", "password", False): self._change_password,
+            ("GET", "state", False): self._get_state,
+            ("PUT", "state", False): self._put_state,
+            ("GET", "entries", False): self._list_entries,
+            ("POST", "entries", False): self._create_entry,
+            ("PUT", "entries", True): self._update_entry,
+            ("DELETE", "entries", True): self._delete_entry,
+            ("POST", "recurring-rules", False): self._save_rule,
+            ("PUT", "recurring-rules", True): self._save_rule,
+            ("DELETE", "recurring-rules", True): self._delete_rule,
+            ("POST", "categories", False): self._save_category,
+            ("PUT", "categories", True): self._save_category,
+            ("DELETE", "categories", True): self._delete_category,
+            ("PUT", "settings", False): self._put_settings,
+            ("GET", "summary", False): self._summary,
+            ("GET", "sync", False): self._get_changes,
+            ("POST", "sync", False): self._post_changes,
+        }
+        self._streaming_routes = {
+            ("POST", "/api/entries/bulk"): self._bulk_ingest,
+        }
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect_db(self.db_path)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        if self.group_writer is not None:
+            self.group_writer.close()
+        self.password_hasher.close()
+
+    def is_streaming(self, method: str, target: str) -> bool:
+        return (method.upper(), unquote(urlparse(target).path)) in self._streaming_routes
+
+    def handle(self, request: ApiRequest) -> Response:
+        try:
+            return self._route(request)
+        except PasswordHasherBusy:
+            return json_response(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Too many sign-in attempts right now. Try again shortly."},
+                [("Retry-After", "1")],
+            )
+        except ApiError as exc:
+            return json_response(exc.status, {"error": exc.message, **exc.details}, exc.headers)
+        except Exception:
+            LOGGER.exception("Unhandled error for %s %s", request.method, request.path)
+            return json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Something went wrong. Try again."})
+
+    def _route(self, request: ApiRequest) -> Response:
+        streaming = self._streaming_routes.get((request.method, request.path))
+        if streaming is not None:
+            return streaming(request, "")
+        if not request.path.startswith("/api/"):
+            if request.method not in {"GET", "HEAD"}:
+                raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed.")
+            return self.static_cache.lookup(
+                request.path,
+                request.headers.get("accept-encoding", ""),
+                request.headers.get("if-none-match", ""),
+            )
+        parts = [part for part in request.path[len("/api/"):].split("/") if part]
+        if not parts or len(parts) > 2:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Unknown API route.")
+        handler = self._routes.get((request.method, parts[0], len(parts) == 2))
+        if handler is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Unknown API route.")
+        return handler(request, parts[1] if len(parts) == 2 else "")
+
+    def _require_user(self, request: ApiRequest) -> int:
+        token = request.cookie(SESSION_COOKIE_NAME)
+        if not token:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Sign in to continue.")
+        user_id = self.session_cache.get(token)
+        if user_id is not None:
+            return user_id
+        session = get_session(self.connection(), token)
+        if session is None:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Sign in to continue.")
+        self.session_cache.put(token, *session)
+        return session[0]
+
+    def _health(self, request: ApiRequest, _item_id: str) -> Response:
+        return json_response(
+            HTTPStatus.OK,
+            {"ok": True, "time": now_iso(), "sessionCache": self.session_cache.stats()},
+        )
+
+    def _signup(self, request: ApiRequest, _item_id: str) -> Response:
+        payload = request.json()
+        conn = self.connection()
+        try:
+            user_id = create_user(
+                conn, payload.get("email"), str(payload.get("password") or ""), self.password_hasher
+            )
+        except ValueError as exc:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(exc)) from None
+        token = create_session(conn, user_id)
+        return json_response(
+            HTTPStatus.CREATED,
+            {"email": normalize_email(payload.get("email"))},
+            [session_cookie_header(token, SESSION_TTL_DAYS * 86400)],
+        )
+
+    def _login(self, request: ApiRequest, _item_id: str) -> Response:
+        payload = request.json()
+        conn = self.connection()
+        user_id = authenticate_user(
+            conn, payload.get("email"), str(payload.get("password") or ""), self.password_hasher
+        )
+        if user_id is None:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Email or password is incorrect.")
+        token = create_session(conn, user_id)
+        return json_response(
+            HTTPStatus.OK,
+            {"email": normalize_email(payload.get("email"))},
+            [session_cookie_header(token, SESSION_TTL_DAYS * 86400)],
+        )
+
+    def _logout(self, request: ApiRequest, _item_id: str) -> Response:
+        token = request.cookie(SESSION_COOKIE_NAME)
+        if token:
+            self.session_cache.invalidate(token)
+            delete_session(self.connection(), token)
+        return json_response(HTTPStatus.OK, {"ok": True}, [session_cookie_header("", 0)])
+
+    def _change_password(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        payload = request.json()
+        conn = self.connection()
+        try:
+            changed = change_password(
+                conn,
+                user_id,
+                str(payload.get("currentPassword") or ""),
+                str(payload.get("newPassword") or ""),
+                self.password_hasher,
+            )
+        except ValueError as exc:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(exc)) from None
+        if not changed:
+            raise ApiError(HTTPStatus.FORBIDDEN, "Current password is incorrect.")
+        self.session_cache.invalidate_user(user_id)
+        token = create_session(conn, user_id)
+        return json_response(HTTPStatus.OK, {"ok": True}, [session_cookie_header(token, SESSION_TTL_DAYS * 86400)])
+
+    def _me(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        row = self.connection().execute("SELECT email FROM users WHERE id = ?", (user_id,)).fetchone()
+        return json_response(HTTPStatus.OK, {"email": row[0] if row else ""})
+
+    def _get_state(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        return json_response(HTTPStatus.OK, load_user_state(self.connection(), user_id))
+
+    def _put_state(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        return json_response(HTTPStatus.OK, import_user_state(self.connection(), user_id, request.json()))
+
+    def _list_entries(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        entries = list_entries(
+            self.connection(),
+            user_id,
+            start=request.query.get("from") or None,
+            end=request.query.get("to") or None,
+            category=request.query.get("category") or None,
+        )
+        return json_response(HTTPStatus.OK, {"entries": entries})
+
+    def _write(self, user_id: int, operation):
+        if self.group_writer is not None:
+            return self.group_writer.write(user_id, operation)
+        conn = self.connection()
+        with conn:
+            return operation(conn)
+
+    def _create_entry(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        entry = sanitize_entry(request.json())
+        if entry is None:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Entry needs a category and a non-negative amount.")
+        self._write(user_id, lambda conn: _upsert_entry_rows(conn, user_id, [entry]))
+        return json_response(HTTPStatus.CREATED, entry)
+
+    def _update_entry(self, request: ApiRequest, item_id: str) -> Response:
+        user_id = self._require_user(request)
+        entry = sanitize_entry({**request.json(), "id": item_id})
+        if entry is None:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Entry needs a category and a non-negative amount.")
+        self._write(user_id, lambda conn: _upsert_entry_rows(conn, user_id, [entry]))
+        return json_response(HTTPStatus.OK, entry)
+
+    def _delete_entry(self, request: ApiRequest, item_id: str) -> Response:
+        user_id = self._require_user(request)
+        if not self._write(user_id, lambda conn: _delete_entry_rows(conn, user_id, [item_id])):
+            raise ApiError(HTTPStatus.NOT_FOUND, "Entry not found.")
+        return json_response(HTTPStatus.OK, {"deleted": item_id})
+
+    def _save_rule(self, request: ApiRequest, item_id: str) -> Response:
+        user_id = self._require_user(request)
+        payload = request.json()
+        if item_id:
+            payload["id"] = item_id
+        rule = save_recurring_rule(self.connection(), user_id, payload)
+        if rule is None:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Rule needs a category and a non-negative amount.")
+        return json_response(HTTPStatus.OK if item_id else HTTPStatus.CREATED, rule)
+
+    def _delete_rule(self, request: ApiRequest, item_id: str) -> Response:
+        user_id = self._require_user(request)
+        if not delete_recurring_rule(self.connection(), user_id, item_id):
+            raise ApiError(HTTPStatus.NOT_FOUND, "Recurring rule not found.")
+        return json_response(HTTPStatus.OK, {"deleted": item_id})
+
+    def _save_category(self, request: ApiRequest, item_id: str) -> Response:
+        user_id = self._require_user(request)
+        payload = request.json()
+        category = save_category(
+            self.connection(),
+            user_id,
+            str(payload.get("type") or ""),
+            str(payload.get("name") or ""),
+            str(payload.get("color") or ""),
+            item_id,
+        )
+        if category is None:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Category names must be non-empty and unique.")
+        return json_response(HTTPStatus.OK if item_id else HTTPStatus.CREATED, category)
+
+    def _delete_category(self, request: ApiRequest, item_id: str) -> Response:
+        user_id = self._require_user(request)
+        if not delete_category(self.connection(), user_id, item_id):
+            raise ApiError(HTTPStatus.NOT_FOUND, "Category not found.")
+        return json_response(HTTPStatus.OK, {"deleted": item_id})
+
+    def _bulk_ingest(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type in {"application/x-ndjson", "application/jsonl", "application/json-seq"}:
+            records = iter_ndjson_records(request.stream)
+        else:
+            records = iter_json_array_records(request.stream)
+        return json_response(HTTPStatus.OK, ingest_entries(self.connection(), user_id, records))
+
+    def _summary(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        cycle = request.query.get("cycle") or None
+        if cycle not in (None, "all", "unknown") and budget_cycle_key(f"{cycle}-28") != cycle:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Cycle must look like YYYY-MM or 'all'.")
+        return json_response(HTTPStatus.OK, summarize_rollups(self.connection(), user_id, cycle))
+
+    def _get_changes(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        try:
+            since = parse_sync_cursor(request.query.get("since"))
+        except ValueError as exc:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(exc)) from None
+        return json_response(HTTPStatus.OK, collect_changes(self.connection(), user_id, since))
+
+    def _post_changes(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        return json_response(HTTPStatus.OK, apply_changes(self.connection(), user_id, request.json()))
+
+    def _put_settings(self, request: ApiRequest, _item_id: str) -> Response:
+        user_id = self._require_user(request)
+        payload = request.json()
+        settings = save_settings(self.connection(), user_id, payload.get("settings"), payload.get("budget"))
+        budget, _ = get_settings(self.connection(), user_id)
+        return json_response(HTTPStatus.OK, {"budget": budget, "settings": settings})
+
+
+class BudgetRequestHandler(BaseHTTPRequestHandler):
+    backend: BudgetBackend
+    server_version = "BudgetBeacon/1.0"
+
+    def do_GET(self) -> None:
+        self._dispatch()
+
+    def do_HEAD(self) -> None:
+        self._dispatch()
+
+    def do_POST(self) -> None:
+        self._dispatch()
+
+    def do_PUT(self) -> None:
+        self._dispatch()
+
+    def do_DELETE(self) -> None:
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        if self.backend.is_streaming(self.command, self.path):
+            stream = BodyStream(iter_request_body(self.rfile, headers))
+            self._send(*self.backend.handle(ApiRequest(self.command, self.path, headers, stream=stream)))
+            self.close_connection = True
+            return
+        if "transfer-encoding" in headers:
+            # Only streaming routes read a chunked body; leaving it unread would desync the keep-alive socket.
+            self._send(*json_response(HTTPStatus.LENGTH_REQUIRED, {"error": "Send this request with a Content-Length."}))
+            self.close_connection = True
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self._send(*json_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body is too large."}))
+            self.close_connection = True
+            return
+        body = self.rfile.read(length) if length else b""
+        self._send(*self.backend.handle(ApiRequest(self.command, self.path, headers, body)))
+
+    def _send(self, status: HTTPStatus, headers: list[tuple[str, str]], body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def make_threaded_server(backend: BudgetBackend, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    handler = type("BoundBudgetRequestHandler", (BudgetRequestHandler,), {"backend": backend})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def encode_response(status: HTTPStatus, headers: list[tuple[str, str]], body: bytes, keep_alive: bool, head: bool = False) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    head_bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head_bytes if head else head_bytes + body
+
+
+async def _read_body_part(read: Awaitable[bytes], timeout: Optional[float]) -> bytes:
+    # A stalled upload would otherwise hold a worker thread and an in-flight slot indefinitely.
+    try:
+        return await asyncio.wait_for(read, timeout)
+    except asyncio.TimeoutError:
+        raise ApiError(HTTPStatus.REQUEST_TIMEOUT, "Request body timed out.") from None
+    except asyncio.IncompleteReadError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Request body ended early.") from None
+
+
+async def _aiter_request_body(
+    reader: asyncio.StreamReader,
+    headers: dict,
+    limit: int = BULK_MAX_BODY_BYTES,
+    timeout: Optional[float] = KEEP_ALIVE_TIMEOUT_SECONDS,
+) -> AsyncIterator[bytes]:
+    total = 0
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await _read_body_part(reader.readline(), timeout)
+            if not size_line:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Request body ended early.")
+            try:
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            except ValueError:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed chunked body.") from None
+            if size == 0:
+                while await _read_body_part(reader.readline(), timeout) not in {b"\r\n", b"\n", b""}:
+                    pass
+                return
+            total += size
+            if total > limit:
+                raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large.")
+            while size > 0:
+                chunk = await _read_body_part(reader.readexactly(min(BULK_READ_CHUNK_BYTES, size)), timeout)
+                size -= len(chunk)
+                yield chunk
+            await _read_body_part(reader.readline(), timeout)
+    try:
+        remaining = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.") from None
+    if remaining > limit:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large.")
+    while remaining > 0:
+        chunk = await _read_body_part(reader.read(min(BULK_READ_CHUNK_BYTES, remaining)), timeout)
+        if not chunk:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request body ended early.")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _bridge_async_iterator(source: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop) -> Iterator[bytes]:
+    # Lets an executor thread pull request-body chunks from the event loop one at a time.
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(source.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+class AsyncBudgetServer:
+    def __init__(
+        self,
+        backend: BudgetBackend,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        workers: int = DEFAULT_WORKER_THREADS,
+        keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.backend = backend
+        self.host = host
+        self.port = port
+        self.max_connections = max(1, int(max_connections))
+        self.max_inflight = max(1, int(max_inflight))
+        self.workers = max(1, int(workers))
+        self.keep_alive_timeout = keep_alive_timeout
+        self.open_connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._connection_tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="budget-worker")
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connection_tasks):
+                task.cancel()
+            await asyncio.gather(*self._connection_tasks, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.open_connections >= self.max_connections:
+            writer.write(
+                encode_response(
+                    *json_response(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Server is busy."}, [("Retry-After", "1")]),
+                    keep_alive=False,
+                )
+            )
+            await self._close_writer(writer)
+            return
+        self.open_connections += 1
+        task = asyncio.current_task()
+        self._connection_tasks.add(task)
+        try:
+            while True:
+                try:
+                    parsed = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except ApiError as exc:
+                    writer.write(encode_response(*json_response(exc.status, {"error": exc.message}), keep_alive=False))
+                    break
+                if parsed is None:
+                    break
+                request, keep_alive = parsed
+                async with self._inflight:
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self.backend.handle, request
+                    )
+                keep_alive = keep_alive and request.stream.exhausted
+                writer.write(encode_response(*response, keep_alive=keep_alive, head=request.method == "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.open_connections -= 1
+            self._connection_tasks.discard(task)
+            await self._close_writer(writer)
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[tuple[ApiRequest, bool]]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed request line.") from None
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in {b"\r\n", b"\n", b""}:
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many request headers.")
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+        if self.backend.is_streaming(method, target):
+            loop = asyncio.get_running_loop()
+            body = _aiter_request_body(reader, headers, timeout=self.keep_alive_timeout)
+            stream = BodyStream(_bridge_async_iterator(body, loop))
+            return ApiRequest(method, target, headers, stream=stream), keep_alive
+        if "transfer-encoding" in headers:
+            raise ApiError(HTTPStatus.LENGTH_REQUIRED, "Send this request with a Content-Length.")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.") from None
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body is too large.")
+        body = await reader.readexactly(length) if length else b""
+        return ApiRequest(method, target, headers, body), keep_alive
+
+    @staticmethod
+    async def _close_writer(writer: asyncio.StreamWriter) -> None:
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except (ConnectionError, RuntimeError):
+            pass
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="BudgetBeacon API and web server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--web-root", type=Path, default=DEFAULT_WEB_ROOT)
+    parser.add_argument("--mode", choices=["threaded", "asyncio"], default="threaded")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS)
+    parser.add_argument("--max-inflight", type=int, default=DEFAULT_MAX_INFLIGHT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKER_THREADS)
+    parser.add_argument("--keep-alive-timeout", type=float, default=KEEP_ALIVE_TIMEOUT_SECONDS)
+    parser.add_argument("--hash-workers", type=int, default=PASSWORD_HASH_WORKERS)
+    parser.add_argument("--hash-queue", type=int, default=None, help="max pending password hashes (default 4 per worker)")
+    parser.add_argument("--session-cache-size", type=int, default=SESSION_CACHE_SIZE)
+    parser.add_argument(
+        "--recurring-interval",
+        type=float,
+        default=RECURRING_INTERVAL_SECONDS,
+        help="seconds between recurring-rule posting runs (0 disables)",
+    )
+    parser.add_argument(
+        "--group-commit-ms",
+        type=float,
+        default=0.0,
+        help="batch entry writes for this many milliseconds per transaction (0 disables)",
+    )
+    parser.add_argument("--group-commit-batch", type=int, default=GROUP_COMMIT_MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    hasher = PasswordHasher(args.hash_workers, args.hash_queue)
+    hasher.start()
+    group_writer = None
+    if args.group_commit_ms > 0:
+        group_writer = GroupCommitWriter(args.db, args.group_commit_ms / 1000, args.group_commit_batch)
+    backend = BudgetBackend(
+        args.db,
+        args.web_root,
+        hasher,
+        SessionCache(args.session_cache_size),
+        group_writer,
+    )
+    scheduler = RecurringScheduler(args.db, args.recurring_interval)
+    scheduler.start()
+    print(f"BudgetBeacon serving on http://{args.host}:{args.port} ({args.mode} mode)")
+    try:
+        if args.mode == "asyncio":
+            server = AsyncBudgetServer(
+                backend,
+                args.host,
+                args.port,
+                max_connections=args.max_connections,
+                max_inflight=args.max_inflight,
+                workers=args.workers,
+                keep_alive_timeout=args.keep_alive_timeout,
+            )
+            asyncio.run(server.serve_forever())
+        else:
+            make_threaded_server(backend, args.host, args.port).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()